@@ -0,0 +1,103 @@
+"""문제 은행 파일 비교
+
+넓은 범위(기본: 단계 2, 분자·분모 최대 30)의 문제 공간을 매번 새로 만드는 시간과,
+미리 써 둔 문제 은행 파일을 메모리 맵으로 여는 시간(CRC 확인 포함)을 비교합니다.
+프로세스 --processes개가 같은 파일을 동시에 열고 모든 레코드를 읽었을 때, 파일 매핑의
+RSS와 PSS(공유 페이지를 프로세스 수로 나눈 몫)를 /proc/self/smaps에서 읽어 페이지를 함께 쓰는지 확인합니다.
+
+    python benchmarks/bench_bank.py [--stage 2] [--num-max 30] [--den-max 30] [--processes 4]
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath.bank import open_bank, write_bank  # noqa: E402
+from elemath.problems import iter_problem_space  # noqa: E402
+
+
+def mapping_usage(path):
+    """이 프로세스에서 path 매핑의 (RSS KB, PSS KB)"""
+    usage, inside = {}, False
+    with open('/proc/self/smaps') as f:
+        for line in f:
+            fields = line.split()
+            if '-' in fields[0] and len(fields) >= 5:  # 매핑 머리줄
+                inside = line.rstrip().endswith(str(path))
+            elif inside and fields[0] in ('Rss:', 'Pss:'):
+                usage[fields[0]] = usage.get(fields[0], 0) + int(fields[1])
+    return usage.get('Rss:', 0), usage.get('Pss:', 0)
+
+
+def worker(path, barrier, results):
+    bank = open_bank(path)
+    for i in range(len(bank)):
+        bank[i]
+    barrier.wait()  # 모든 프로세스가 파일을 연 상태에서 잼
+    results.put(mapping_usage(path))
+    barrier.wait()
+    bank.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stage', type=int, choices=(1, 2), default=2)
+    parser.add_argument('--num-max', type=int, default=30)
+    parser.add_argument('--den-max', type=int, default=30)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    args = parser.parse_args()
+    ranges = ((1, args.num_max), (2, args.den_max))
+
+    started = time.perf_counter()
+    problems = list(iter_problem_space(args.stage, *ranges))
+    build_seconds = time.perf_counter() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / f'stage{args.stage}.bank'
+        started = time.perf_counter()
+        header = write_bank(path, args.stage, *ranges)
+        write_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        bank = open_bank(path)
+        open_seconds = time.perf_counter() - started
+
+        rng = random.Random(0)
+        started = time.perf_counter()
+        for _ in range(args.lookups):
+            bank.choice(rng)
+        choice_us = (time.perf_counter() - started) / args.lookups * 1e6
+        keys = [(p.result_num, p.result_den) for p in rng.sample(problems, min(1000, len(problems)))]
+        started = time.perf_counter()
+        for key in keys:
+            bank.result_span(*key)
+        span_us = (time.perf_counter() - started) / len(keys) * 1e6
+        bank.close()
+
+        print(f"단계 {args.stage}, 분자 {ranges[0]}, 분모 {ranges[1]}: 문제 {header.count:,}개, "
+              f"파일 {path.stat().st_size / 1024:.0f} KB")
+        print(f"  새로 만들기 {build_seconds * 1000:.0f} ms  파일 쓰기 {write_seconds * 1000:.0f} ms  "
+              f"열기(CRC 확인) {open_seconds * 1000:.2f} ms")
+        print(f"  무작위 문제 {choice_us:.2f} µs  결과값으로 찾기 {span_us:.2f} µs")
+
+        context = multiprocessing.get_context('fork')
+        barrier, results = context.Barrier(args.processes), context.Queue()
+        processes = [context.Process(target=worker, args=(path, barrier, results)) for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        usage = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        print(f"  프로세스 {args.processes}개가 동시에 열었을 때 매핑 RSS "
+              f"{sum(rss for rss, _ in usage)} KB (프로세스마다 {usage[0][0]} KB), "
+              f"PSS 합 {sum(pss for _, pss in usage)} KB")
+
+
+if __name__ == '__main__':
+    main()
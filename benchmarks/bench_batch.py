@@ -0,0 +1,75 @@
+"""NumPy 일괄 생성기와 문제별 생성기 비교
+
+단계별로 generate_batch로 문제 10^6개를 만드는 시간과, generate_problem을 반복해서 부르는
+시간(--scalar-count개를 재서 10^6개로 환산)을 비교합니다.
+기본 범위에서는 두 생성기로 각각 --sample개를 만들어 문제별 빈도를 카이제곱 동질성 검정과
+총변동거리(TV)로 비교하고, 일괄 생성한 문제가 모두 미리 만든 문제 목록에 들어 있는지 확인합니다.
+
+    python benchmarks/bench_batch.py [--count 1000000] [--scalar-count 100000] [--sample 200000]
+"""
+import argparse
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath import build_divisible_index, build_non_divisible_bank, generate_problem  # noqa: E402
+from elemath.batch import generate_batch  # noqa: E402
+from elemath.problems import (  # noqa: E402
+    STAGE1_DENOMINATOR_RANGE,
+    STAGE1_NUMERATOR_RANGE,
+    STAGE2_DENOMINATOR_RANGE,
+    STAGE2_NUMERATOR_RANGE,
+)
+
+RANGES = {
+    1: (STAGE1_NUMERATOR_RANGE, STAGE1_DENOMINATOR_RANGE),
+    2: (STAGE2_NUMERATOR_RANGE, STAGE2_DENOMINATOR_RANGE),
+}
+
+
+def compare(stage, sample, seed):
+    """(카이제곱 통계량, 자유도, TV 거리)"""
+    numerator_range, denominator_range = RANGES[stage]
+    rng = random.Random(seed)
+    scalar = Counter(generate_problem(stage, numerator_range, denominator_range, rng=rng) for _ in range(sample))
+    batch = Counter(generate_batch(stage, sample, rng=seed + 1).to_problems())
+    keys = scalar.keys() | batch.keys()
+    chi2 = sum((scalar[k] - batch[k]) ** 2 / (scalar[k] + batch[k]) for k in keys)
+    tv = sum(abs(scalar[k] - batch[k]) for k in keys) / (2 * sample)
+    return chi2, len(keys) - 1, tv
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=10 ** 6)
+    parser.add_argument('--scalar-count', type=int, default=100_000)
+    parser.add_argument('--sample', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    banks = {1: build_divisible_index()['problems'], 2: build_non_divisible_bank()['problems']}
+    for stage in (1, 2):
+        numerator_range, denominator_range = RANGES[stage]
+        started = time.perf_counter()
+        batch = generate_batch(stage, args.count, rng=args.seed)
+        batch_seconds = time.perf_counter() - started
+
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        for _ in range(args.scalar_count):
+            generate_problem(stage, numerator_range, denominator_range, rng=rng)
+        scalar_seconds = (time.perf_counter() - started) * args.count / args.scalar_count
+
+        valid = set(batch.to_problems()) <= set(banks[stage])
+        chi2, df, tv = compare(stage, args.sample, args.seed)
+        print(f"단계 {stage}: {args.count:,}개  일괄 {batch_seconds:.2f}s  하나씩(환산) {scalar_seconds:.2f}s  "
+              f"{scalar_seconds / batch_seconds:.0f}배")
+        print(f"  문제 목록 안의 문제만 나옴: {valid}  카이제곱 {chi2:.0f} (자유도 {df})  TV {tv:.4f}")
+
+
+if __name__ == '__main__':
+    main()
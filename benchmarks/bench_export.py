@@ -0,0 +1,49 @@
+"""학습지 내보내기 시간과 메모리
+
+문제 5만 개(학습지 1000장 × 50문제)를 CSV와 LaTeX로 내보내면서 걸린 시간과
+주 프로세스의 최대 메모리 사용량(tracemalloc)을 잽니다. 장 수를 바꿔도 메모리가 그대로인지 보려면
+--sheets를 바꿔 가며 실행합니다.
+
+    python benchmarks/bench_export.py [--sheets 1000] [--size 50] [--workers 4]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath.export import export_worksheets  # noqa: E402
+from elemath.problems import STAGE2_DENOMINATOR_RANGE, STAGE2_NUMERATOR_RANGE, STAGE2_RESULT_RANGE  # noqa: E402
+
+RANGES = (STAGE2_NUMERATOR_RANGE, STAGE2_DENOMINATOR_RANGE, STAGE2_RESULT_RANGE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sheets', type=int, default=1000)
+    parser.add_argument('--size', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"학습지 {args.sheets}장 × {args.size}문제 = {args.sheets * args.size:,}문제 (단계 2)")
+    for fmt in ('csv', 'latex'):
+        for workers in (0, args.workers):
+            with tempfile.TemporaryDirectory() as out_dir:
+                started = time.perf_counter()
+                paths = export_worksheets(out_dir, 2, args.sheets, args.size, RANGES, fmt=fmt, workers=workers)
+                seconds = time.perf_counter() - started
+                size = sum(path.stat().st_size for path in paths)
+                # tracemalloc은 실행을 느리게 하므로 메모리는 한 번 더 내보내면서 따로 잼
+                tracemalloc.start()
+                export_worksheets(out_dir, 2, args.sheets, args.size, RANGES, fmt=fmt, workers=workers)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            label = f"프로세스 {workers}개" if workers > 1 else '한 프로세스'
+            print(f"  {fmt:<6}{label:<10}{seconds:7.2f}s  최대 메모리 {peak / 1024:8.0f} KiB  파일 {size / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""일괄 채점 속도 비교
+
+학습지 제출 결과 --rows줄(정답, 약분 안 함, 분자·분모 바뀜, 역수 안 씀, 오답이 섞인 답)을 만들고
+예전처럼 줄마다 Fraction 두 개를 만들어 비교하는 방법과 grade_batch를 비교합니다.
+두 방법의 정답 판정이 모든 줄에서 같은지도 확인합니다.
+
+    python benchmarks/bench_grading.py [--rows 500000]
+"""
+import argparse
+import sys
+import time
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath import GRADE_LABELS, grade_batch  # noqa: E402
+from elemath.batch import generate_batch  # noqa: E402
+
+
+def make_submissions(rows, seed):
+    """문제 묶음과 학생 답 (분자 배열, 분모 배열)"""
+    rng = np.random.default_rng(seed)
+    batch = generate_batch(2, rows, rng=rng)
+    user_num, user_den = batch.result_num.copy(), batch.result_den.copy()
+    kind = rng.integers(0, 5, size=rows)
+    scale = rng.integers(2, 5, size=rows)
+    user_num = np.select([kind == 1, kind == 2, kind == 3, kind == 4],
+                         [user_num * scale, batch.result_den, batch.numerator1 * batch.numerator2, user_num + 1],
+                         user_num)
+    user_den = np.select([kind == 1, kind == 2, kind == 3],
+                         [user_den * scale, batch.result_num, batch.denominator1 * batch.denominator2],
+                         user_den)
+    return batch, user_num, user_den
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    batch, user_num, user_den = make_submissions(args.rows, args.seed)
+
+    started = time.perf_counter()
+    legacy = [Fraction(n, d) == Fraction(cn, cd) for n, d, cn, cd in
+              zip(user_num.tolist(), user_den.tolist(), batch.result_num.tolist(), batch.result_den.tolist())]
+    legacy_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = grade_batch(user_num, user_den, batch.result_num, batch.result_den, batch)
+    batch_seconds = time.perf_counter() - started
+
+    assert result.correct.tolist() == legacy, '정답 판정이 다릅니다'
+    print(f"{args.rows:,}줄  Fraction {legacy_seconds:.2f}s  grade_batch {batch_seconds:.3f}s  "
+          f"{legacy_seconds / batch_seconds:.0f}배")
+    counts = np.bincount(result.code, minlength=len(GRADE_LABELS))
+    print('  '.join(f"{label} {counts[code]:,}" for code, label in GRADE_LABELS.items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""elemath 패키지의 콜드 임포트 시간 측정
+
+새 파이썬 프로세스에서 `import elemath`에 걸리는 시간을 여러 번 재고,
+중앙값이 예산을 넘거나 Streamlit이 함께 임포트되면 종료 코드 1로 끝납니다.
+
+    python benchmarks/bench_import.py [--runs 20] [--budget-ms 30]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import elemath
+elapsed = time.perf_counter() - start
+print(elapsed, 'streamlit' in sys.modules)
+"""
+
+
+def measure_once():
+    out = subprocess.run([sys.executable, '-c', PROBE], cwd=ROOT_DIR, check=True,
+                         capture_output=True, text=True).stdout.split()
+    return float(out[0]) * 1000, out[1] == 'True'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    samples = []
+    for _ in range(args.runs):
+        elapsed_ms, loaded_streamlit = measure_once()
+        if loaded_streamlit:
+            print('FAIL: import elemath가 streamlit을 임포트합니다')
+            return 1
+        samples.append(elapsed_ms)
+    median = statistics.median(samples)
+    print(f'import elemath: 중앙값 {median:.1f} ms, 최대 {max(samples):.1f} ms (예산 {args.budget_ms:.0f} ms)')
+    if median > args.budget_ms:
+        print('FAIL: 임포트 시간 예산 초과')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
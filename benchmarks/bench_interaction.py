@@ -0,0 +1,113 @@
+"""상호작용별 재실행 시간 측정
+
+streamlit 서버를 띄우고 live_session으로 학생 한 명이 단계 1과 단계 2를 끝까지 푸는 흐름을
+여러 번 재현합니다. 숫자 입력, 오답 제출, 정답 제출마다 요청을 보낸 뒤 실행 완료 메시지를
+받을 때까지의 시간(왕복), 서버가 스크립트를 실행한 시간, 받은 바이트 수를 모아 보여줍니다.
+문제 하나를 맞힐 때까지 서버가 스크립트(또는 fragment)를 실행한 횟수의 평균도 보여줍니다
+(fragment 실행이 전체 실행으로 바뀌면 두 번으로 셈, 페이지의 runs_per_solve와 같은 기준).
+
+    python benchmarks/bench_interaction.py [--sessions 5] [--json]
+"""
+import argparse
+import asyncio
+import json
+import re
+from collections import defaultdict
+from fractions import Fraction
+
+from live_session import LiveSession, streamlit_server
+
+DIVISION = re.compile(r'\\frac\{(\d+)\}\{(\d+)\} \\div \\frac\{(\d+)\}\{(\d+)\}')
+
+
+def current_answer(session):
+    """화면에 나온 문제의 정답"""
+    body = next(b for b in session.markdown.values() if b.startswith('### 문제'))
+    n1, d1, n2, d2 = map(int, DIVISION.search(body).groups())
+    return Fraction(n1, d1) / Fraction(n2, d2)
+
+
+async def solve(session, stage, timings):
+    """현재 문제를 한 번 틀린 뒤 맞힙니다."""
+    index = next(key for key in session.widgets if key.startswith(f'stage{stage}_num_')).rsplit('_', 1)[1]
+    answer = current_answer(session)
+    for kind, key, value in (
+        ('입력', f'stage{stage}_den_{index}', answer.denominator),
+        ('입력', f'stage{stage}_num_{index}', answer.numerator + 1),
+        ('오답 제출', None, None),
+        ('입력', f'stage{stage}_num_{index}', answer.numerator),
+        ('정답 제출', None, None),
+    ):
+        if key is None:
+            run = await session.click(f'stage{stage}_submit')
+        else:
+            run = await session.type_value(key, value)
+        timings[kind].append(run)
+
+
+async def one_session(url, timings):
+    session = LiveSession(url, page_name='초등수학')
+    await session.connect()
+    try:
+        for _ in range(3):
+            await solve(session, 1, timings)
+        timings['단계 이동'].append(await session.click('다음 단계로'))
+        timings['단계 이동'].append(await session.click('stage2_understand'))
+        for _ in range(3):
+            await solve(session, 2, timings)
+    finally:
+        await session.close()
+
+
+# 문제를 푸는 동안 보내는 요청 (모두 답 입력 영역 fragment의 위젯)
+SOLVE_KINDS = ('입력', '오답 제출', '정답 제출')
+
+
+def runs_per_solve(timings):
+    """문제 하나를 맞힐 때까지의 평균 실행 횟수"""
+    runs = sum(1 + (not run.fragment) for kind in SOLVE_KINDS for run in timings[kind])
+    return round(runs / len(timings['정답 제출']), 2)
+
+
+def summarize(timings):
+    def percentile(values, q):
+        values = sorted(values)
+        return round(values[min(len(values) - 1, int(len(values) * q))] * 1000, 2)
+
+    rows = {}
+    for kind, runs in timings.items():
+        rows[kind] = {
+            'count': len(runs),
+            'p50_ms': percentile([run.seconds for run in runs], 0.5),
+            'p90_ms': percentile([run.seconds for run in runs], 0.9),
+            'server_p50_ms': percentile([run.server_seconds for run in runs], 0.5),
+            'server_p90_ms': percentile([run.server_seconds for run in runs], 0.9),
+            'bytes': round(sum(run.received_bytes for run in runs) / len(runs)),
+            'fragment_runs': sum(run.fragment for run in runs),
+        }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=5)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    timings = defaultdict(list)
+    with streamlit_server() as server:
+        for _ in range(args.sessions):
+            asyncio.run(one_session(server.url, timings))
+    rows = summarize(timings)
+    if args.json:
+        print(json.dumps({**rows, 'runs_per_solve': runs_per_solve(timings)}, ensure_ascii=False, indent=2))
+        return
+    print(f"{'상호작용':<8}{'횟수':>5}{'왕복 p50':>10}{'p90':>8}{'서버 p50':>10}{'p90':>8}{'바이트':>8}{'부분 실행':>7}")
+    for kind, row in rows.items():
+        print(f"{kind:<10}{row['count']:>5}{row['p50_ms']:>10}{row['p90_ms']:>8}"
+              f"{row['server_p50_ms']:>10}{row['server_p90_ms']:>8}{row['bytes']:>8,}{row['fragment_runs']:>7}")
+    print(f"문제 하나를 맞힐 때까지 실행 {runs_per_solve(timings)}번")
+
+
+if __name__ == '__main__':
+    main()
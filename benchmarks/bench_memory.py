@@ -0,0 +1,90 @@
+"""세션당 문제 저장 메모리 비교
+
+세션 하나가 들고 있는 문제(단계 1 세 문제, 단계 2 예시·연습 세 문제, 맞힌 문제 기록)를
+예전 7개 키 딕셔너리(+Fraction)와 Problem 레코드로 각각 만들어 tracemalloc으로 잽니다.
+
+    python benchmarks/bench_memory.py [--sessions 1000]
+"""
+import argparse
+import random
+import sys
+import tracemalloc
+from fractions import Fraction
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath import generate_divisible_problem, generate_non_divisible_problem, make_problem  # noqa: E402
+
+
+def legacy_problem(numerator1, denominator1, numerator2, denominator2):
+    """예전 페이지가 만들던 문제 딕셔너리"""
+    result = Fraction(numerator1, denominator1) / Fraction(numerator2, denominator2)
+    return {
+        'numerator1': numerator1,
+        'denominator1': denominator1,
+        'numerator2': numerator2,
+        'denominator2': denominator2,
+        'result': result,
+        'result_num': result.numerator,
+        'result_den': result.denominator
+    }
+
+
+def session_operands(rng):
+    """세션 하나가 만드는 문제들의 피연산자"""
+    stage1 = [generate_divisible_problem(rng=rng).operands for _ in range(3)]
+    stage2 = [generate_non_divisible_problem(rng=rng).operands for _ in range(4)]
+    return stage1, stage2
+
+
+def build_session(factory, stage1, stage2):
+    """세션 상태처럼 문제와 기록을 담은 딕셔너리"""
+    stage1_problems = [factory(*ops) for ops in stage1]
+    stage2_problems = [factory(*ops) for ops in stage2[1:]]
+    history = [{'stage': 1, 'problem': p, 'correct': True} for p in stage1_problems]
+    history += [{'stage': 2, 'problem': p, 'correct': True} for p in stage2_problems]
+    return {
+        'stage1_problems': stage1_problems,
+        'stage2_example': factory(*stage2[0]),
+        'stage2_problems': stage2_problems,
+        'problem_history': history,
+    }
+
+
+def build_records(factory, stage1, stage2):
+    """세션이 들고 있는 문제 레코드만 (기록·리스트 제외)"""
+    return [factory(*ops) for ops in stage1 + stage2]
+
+
+def measure(build, factory, operands):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = [build(factory, *ops) for ops in operands]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(sessions) == len(operands)
+    return after - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    operands = [session_operands(rng) for _ in range(args.sessions)]
+    print(f'세션 {args.sessions}개')
+    for label, build in (('문제 레코드만', build_records), ('세션 상태 전체', build_session)):
+        legacy = measure(build, legacy_problem, operands)
+        compact = measure(build, make_problem, operands)
+        print(f'[{label}]')
+        print(f'  딕셔너리+Fraction: {legacy / 1024:8.1f} KiB ({legacy / args.sessions:6.0f} B/세션)')
+        print(f'  Problem 레코드:    {compact / 1024:8.1f} KiB ({compact / args.sessions:6.0f} B/세션)')
+        print(f'  비율: {compact / legacy:.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
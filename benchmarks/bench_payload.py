@@ -0,0 +1,96 @@
+"""페이지 상태별 전송 크기 측정
+
+Streamlit의 AppTest로 페이지를 헤드리스로 실행하며 주요 상태마다
+브라우저로 보내는 요소(proto)들의 직렬화 크기를 더해 재실행 한 번의 전송량을 잽니다.
+
+    python benchmarks/bench_payload.py [--seed 0] [--json]
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+PAGE = str(Path(__file__).resolve().parent.parent / 'pages' / '초등수학.py')
+
+
+def payload_bytes(at):
+    """현재 화면을 이루는 요소들의 직렬화 크기 합 (접힌 expander 내용 포함)"""
+    total = 0
+    stack = [at._tree]
+    while stack:
+        node = stack.pop()
+        proto = getattr(node, 'proto', None)
+        if proto is not None:
+            total += len(proto.SerializeToString())
+        stack.extend(getattr(node, 'children', {}).values())
+    return total
+
+
+def answer(at, stage, correct):
+    """현재 문제에 답을 넣고 제출합니다."""
+    state = at.session_state
+    index = state[f'stage{stage}_index']
+    problem = state[f'stage{stage}_problems'][index]
+    numerator = problem.result_num if correct else problem.result_num + 1
+    at.number_input(key=f'stage{stage}_den_{index}').set_value(problem.result_den)
+    at.number_input(key=f'stage{stage}_num_{index}').set_value(numerator)
+    at.button(key=f'stage{stage}_submit').click().run()
+
+
+def click_label(at, prefix):
+    next(b for b in at.button if b.label.startswith(prefix)).click().run()
+
+
+def measure_states():
+    """(상태 이름, 바이트) 목록"""
+    at = AppTest.from_file(PAGE, default_timeout=30)
+    sizes = []
+
+    def snap(name):
+        assert not at.exception, at.exception
+        sizes.append((name, payload_bytes(at)))
+
+    at.run()
+    snap('단계1 첫 문제 (통분 개념 포함)')
+    answer(at, 1, correct=False)
+    answer(at, 1, correct=False)
+    snap('단계1 두 번째 오답 (풀이+정답)')
+    answer(at, 1, correct=True)
+    snap('단계1 정답 후 다음 문제')
+    answer(at, 1, correct=True)
+    answer(at, 1, correct=True)
+    snap('단계1 완료')
+    click_label(at, '다음 단계로 이동')
+    snap('단계2 역수 개념 설명')
+    at.button(key='stage2_understand').click().run()
+    snap('단계2 첫 연습문제')
+    answer(at, 2, correct=True)
+    snap('단계2 정답 후 다음 문제')
+    answer(at, 2, correct=True)
+    answer(at, 2, correct=True)
+    snap('단계2 완료')
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    sizes = measure_states()
+    if args.json:
+        print(json.dumps(dict(sizes), ensure_ascii=False, indent=2))
+    else:
+        for name, size in sizes:
+            print(f'{name:<28} {size:>7,} B')
+        print(f'{"합계":<28} {sum(size for _, size in sizes):>7,} B')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
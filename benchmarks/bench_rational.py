@@ -0,0 +1,144 @@
+"""정수 쌍 분수 계산 확인과 속도 비교
+
+1) elemath.rational의 함수가 fractions.Fraction과 같은 결과를 내는지 모든 경우를 확인합니다.
+   - 피연산자 범위 전체: 분자·분모 1~--max (기본 20, 단계 1·2 범위를 모두 포함)의 a/b, c/d 조합
+   - 부호와 0: -6~6 범위 (분모 0 제외)의 조합, 분모가 0일 때 ZeroDivisionError
+   약분, 나눗셈, 곱셈, 비교, 정수 여부, 엇갈려 약분하기, 결과값 범위 검사, make_problem 결과를 비교합니다.
+2) 같은 계산을 Fraction으로 할 때와 정수 쌍으로 할 때의 호출당 시간을 잽니다.
+
+    python benchmarks/bench_rational.py [--max 20] [--repeat 200000]
+"""
+import argparse
+import itertools
+import sys
+import timeit
+from fractions import Fraction
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath.problems import make_problem  # noqa: E402
+from elemath.rational import (  # noqa: E402
+    compare,
+    cross_cancel,
+    divide,
+    in_range,
+    is_integer,
+    multiply,
+    reduce_fraction,
+)
+
+# 결과값 범위 검사에 쓰는 범위 (정수, Fraction, 제한 없음)
+BOUNDS = [(2, 10), (Fraction(1, 2), Fraction(7, 3)), (0, 1), None]
+
+
+def pair(value):
+    return value.numerator, value.denominator
+
+
+def check_quad(a, b, c, d, mismatches):
+    """분수 a/b, c/d 한 쌍을 Fraction과 비교해 다른 항목을 mismatches에 더합니다."""
+    x, y = Fraction(a, b), Fraction(c, d)
+    if reduce_fraction(a, b) != pair(x):
+        mismatches.append(('reduce_fraction', a, b))
+    if multiply(a, b, c, d) != pair(x * y):
+        mismatches.append(('multiply', a, b, c, d))
+    if compare(a, b, c, d) != (x > y) - (x < y):
+        mismatches.append(('compare', a, b, c, d))
+    if c != 0:
+        quotient = x / y
+        if divide(a, b, c, d) != pair(quotient):
+            mismatches.append(('divide', a, b, c, d))
+        if is_integer(a * d, b * c) != (quotient.denominator == 1):
+            mismatches.append(('is_integer', a, b, c, d))
+        for bounds in BOUNDS:
+            expected = bounds is None or Fraction(bounds[0]) <= quotient <= Fraction(bounds[1])
+            if in_range(a * d, b * c, bounds) != expected:
+                mismatches.append(('in_range', a, b, c, d, bounds))
+    elif not raises_zero_division(divide, a, b, c, d):
+        mismatches.append(('divide by zero', a, b, c, d))
+    # 기약분수 두 개를 엇갈려 약분한 뒤 곱하면 바로 기약분수여야 함
+    if (a, b) == pair(x) and (c, d) == pair(y):
+        g1, g2 = cross_cancel(a, b, c, d)
+        if ((a // g1) * (c // g2), (b // g2) * (d // g1)) != pair(x * y):
+            mismatches.append(('cross_cancel', a, b, c, d))
+
+
+def raises_zero_division(function, *args):
+    try:
+        function(*args)
+    except ZeroDivisionError:
+        return True
+    return False
+
+
+def verify(maximum):
+    """확인한 조합 수와 다른 항목 목록"""
+    mismatches = []
+    checked = 0
+    positive = range(1, maximum + 1)
+    for a, b, c, d in itertools.product(positive, repeat=4):
+        check_quad(a, b, c, d, mismatches)
+        p = make_problem(a, b, c, d)
+        if (p.result_num, p.result_den) != pair(Fraction(a, b) / Fraction(c, d)):
+            mismatches.append(('make_problem', a, b, c, d))
+        checked += 1
+    signed = list(range(-6, 7))
+    nonzero = [n for n in signed if n != 0]
+    for a, b, c, d in itertools.product(signed, nonzero, signed, nonzero):
+        check_quad(a, b, c, d, mismatches)
+        checked += 1
+    for n in signed:
+        if not raises_zero_division(reduce_fraction, n, 0):
+            mismatches.append(('reduce_fraction by zero', n, 0))
+    return checked, mismatches
+
+
+def micro_benchmark(repeat):
+    """(이름, Fraction µs, 정수 쌍 µs) 목록"""
+    a, b, c, d = 9, 10, 3, 4
+    cases = [
+        ('약분 12/18', lambda: Fraction(12, 18), lambda: reduce_fraction(12, 18)),
+        ('나눗셈 a/b ÷ c/d', lambda: Fraction(a, b) / Fraction(c, d), lambda: divide(a, b, c, d)),
+        ('곱셈 a/b × c/d', lambda: Fraction(a, b) * Fraction(c, d), lambda: multiply(a, b, c, d)),
+        ('비교 a/b < c/d', lambda: Fraction(a, b) < Fraction(c, d), lambda: compare(a, b, c, d) < 0),
+        ('나누어떨어지는지', lambda: (Fraction(a, b) / Fraction(c, d)).denominator == 1,
+         lambda: is_integer(a * d, b * c)),
+    ]
+    # 결과값 범위 검사는 예전 문제 생성기처럼 범위 끝을 그때그때 Fraction으로 바꿈
+    for bounds in BOUNDS[:2]:
+        cases.append((
+            f'범위 안인지 {bounds[0]}~{bounds[1]}',
+            lambda bounds=bounds: Fraction(bounds[0]) <= Fraction(a * d, b * c) <= Fraction(bounds[1]),
+            lambda bounds=bounds: in_range(a * d, b * c, bounds),
+        ))
+    rows = []
+    for name, with_fraction, with_pairs in cases:
+        rows.append((
+            name,
+            min(timeit.repeat(with_fraction, number=repeat, repeat=3)) / repeat * 1e6,
+            min(timeit.repeat(with_pairs, number=repeat, repeat=3)) / repeat * 1e6,
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max', type=int, default=20, help='분자·분모 최댓값')
+    parser.add_argument('--repeat', type=int, default=200_000)
+    args = parser.parse_args()
+
+    checked, mismatches = verify(args.max)
+    print(f"Fraction과 비교한 조합 {checked:,}개, 다른 결과 {len(mismatches)}개")
+    for mismatch in mismatches[:10]:
+        print('  ', mismatch)
+
+    print(f"{'계산':<16}{'Fraction µs':>13}{'정수 쌍 µs':>12}{'배':>7}")
+    for name, fraction_us, pair_us in micro_benchmark(args.repeat):
+        print(f"{name:<16}{fraction_us:>13.3f}{pair_us:>12.3f}{fraction_us / pair_us:>7.1f}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
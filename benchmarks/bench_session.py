@@ -0,0 +1,62 @@
+"""세션 상태 키 수와 크기
+
+AppTest로 페이지를 헤드리스로 실행하며 주요 상태마다 세션 상태의 키 수와 어림 크기(elemath.session.size_report)를
+출력합니다. 단계를 옮기거나 추가 연습을 여러 번 해도 키 수가 늘지 않아야 합니다.
+
+    python benchmarks/bench_session.py [--rounds 10] [--seed 0]
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_payload import PAGE, answer, click_label  # noqa: E402
+from elemath.session import size_report  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=10, help='추가 연습하기 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    at = AppTest.from_file(PAGE, default_timeout=30)
+    rows = []
+
+    def snap(name):
+        assert not at.exception, at.exception
+        sizes = size_report(at.session_state._state.filtered_state)
+        rows.append((name, len(sizes), sum(size for _, size in sizes)))
+
+    at.run()
+    snap('단계1 첫 문제')
+    for _ in range(3):
+        answer(at, 1, correct=True)
+    snap('단계1 완료')
+    click_label(at, '다음 단계로 이동')
+    snap('단계2 개념 설명')
+    at.button(key='stage2_understand').click().run()
+    for _ in range(3):
+        answer(at, 2, correct=True)
+    snap('단계2 완료')
+    for number in range(args.rounds):
+        at.button(key='stage2_more_practice').click().run()
+        for _ in range(3):
+            answer(at, 2, correct=True)
+        snap(f'추가 연습 {number + 1}회 완료')
+    at.button(key='stage2_restart_all').click().run()
+    snap('처음부터 다시 시작')
+
+    print(f"{'상태':<20}{'키':>5}{'바이트':>10}")
+    for name, keys, size in rows:
+        print(f"{name:<20}{keys:>5}{size:>10,}")
+
+
+if __name__ == '__main__':
+    main()
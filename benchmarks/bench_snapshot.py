@@ -0,0 +1,153 @@
+"""이어 하기 스냅숏 확인과 측정
+
+1) AppTest로 페이지를 실행하며 상태마다 스냅숏 크기를 보고, 중간(단계 2 두 번째 문제, 한 번 틀린 상태)에서
+   같은 토큰(?resume=)으로 새 세션을 열어 단계, 문제 번호, 틀린 횟수, 문제, 맞힌 수, 풀이 기록 누적 값,
+   난이도 구간별 통계가 그대로인지, 되살린 세션이 새 토큰을 받아 원래 스냅숏을 덮어쓰지 않는지 확인합니다.
+2) 답 입력칸 값만 바꾸는 재실행에서는 스냅숏을 쓰지 않는지(ELEMATH_METRICS의 snapshots_saved) 확인합니다.
+3) 스냅숏 만들기·바이트 변환과 저장소(메모리, SQLite) 쓰기·읽기 시간을 잽니다.
+
+    python benchmarks/bench_snapshot.py [--repeat 20000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ['ELEMATH_METRICS'] = '1'  # 저장 횟수를 세기 위해 elemath를 불러오기 전에 켬
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_payload import PAGE, answer, click_label  # noqa: E402
+from elemath import generate_non_divisible_problem, make_practice_problems, metrics  # noqa: E402
+from elemath.snapshot import (  # noqa: E402
+    MemorySnapshotStore,
+    SqliteSnapshotStore,
+    capture,
+    decode,
+    encode,
+    open_snapshot_store,
+)
+
+# 답 입력칸 값만 바꾸는 재실행 수
+RERUNS = 5
+
+
+def saved():
+    return metrics.snapshot()['counters'].get('snapshots_saved', 0)
+
+
+def progress(state):
+    """비교할 진행 상황"""
+    stage = state['stage']
+    history = state['problem_history']
+    return (stage, state['correct_count'], state[f'stage{stage}_index'], state[f'stage{stage}_attempts'],
+            [p.operands for p in state[f'stage{stage}_problems']],
+            dict(history.correct), dict(history.attempts), history.total, dict(history.results),
+            state['student_stats'].levels,
+            # 구간 통계의 실수는 스냅숏에 float32로 담기므로 반올림해서 비교
+            {key: (band.answered, band.wrong, round(band.accuracy, 4), round(band.seconds, 4))
+             for key, band in state['student_stats'].bands.items()})
+
+
+def check_resume():
+    """(상태별 스냅숏 크기, 되살린 진행 상황이 같은지, 입력칸만 바꾼 재실행 동안 저장 횟수,
+    되살린 세션이 새 토큰을 받고 원래 스냅숏을 그대로 두었는지)"""
+    at = AppTest.from_file(PAGE, default_timeout=30)
+    sizes = []
+
+    def snap(name):
+        assert not at.exception, at.exception
+        sizes.append((name, len(open_snapshot_store().get(at.session_state['resume_token']))))
+
+    at.run()
+    snap('단계1 첫 문제')
+    answer(at, 1, correct=True)
+    snap('단계1 두 번째 문제')
+    answer(at, 1, correct=True)
+    answer(at, 1, correct=True)
+    click_label(at, '다음 단계로 이동')
+    snap('단계2 개념 설명')
+    at.button(key='stage2_understand').click().run()
+    answer(at, 2, correct=True)
+    answer(at, 2, correct=False)
+    snap('단계2 두 번째 문제 (한 번 틀림)')
+
+    # 답 입력칸만 바꾸는 재실행은 스냅숏을 쓰지 않아야 함
+    before = saved()
+    index = at.session_state['stage2_index']
+    for value in range(2, 2 + RERUNS):
+        at.number_input(key=f'stage2_den_{index}').set_value(value).run()
+    rerun_writes = saved() - before
+
+    expected = progress(at.session_state)
+    token = at.session_state['resume_token']
+    original = open_snapshot_store().get(token)
+    resumed = AppTest.from_file(PAGE, default_timeout=30)
+    resumed.query_params['resume'] = token
+    resumed.run()
+    assert not resumed.exception, resumed.exception
+    same = progress(resumed.session_state) == expected
+    # 되살린 세션에서 한 번 맞혀도 원래 토큰의 스냅숏은 그대로여야 함
+    answer(resumed, 2, correct=True)
+    new_token = resumed.session_state['resume_token']
+    forked = new_token != token and open_snapshot_store().get(token) == original
+    return sizes, same, rerun_writes, forked
+
+
+def per_call_us(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    sizes, same, rerun_writes, forked = check_resume()
+    for name, size in sizes:
+        print(f"{name:<28}{size:>4} B")
+    print(f"같은 토큰으로 새 세션을 열었을 때 진행 상황이 같음: {same}")
+    print(f"되살린 세션이 새 토큰을 받고 원래 스냅숏은 그대로: {forked}")
+    print(f"답 입력칸만 바꾼 재실행 {RERUNS}번 동안 저장 {rerun_writes}번")
+
+    state = {
+        'stage': 2, 'correct_count': 4, 'stage2_index': 1, 'stage2_attempts': 1,
+        'stage2_concept_understood': True, 'class_code': '3-2',
+    }
+    state['stage2_example'] = generate_non_divisible_problem()
+    state['stage2_problems'] = make_practice_problems(state['stage2_example'], 3)
+    data = encode(capture(state))
+    print(f"capture+encode {per_call_us(lambda: encode(capture(state)), args.repeat):.2f} µs  "
+          f"decode {per_call_us(lambda: decode(data), args.repeat):.2f} µs  ({len(data)} B)")
+    memory = MemorySnapshotStore()
+    tokens = [os.urandom(12).hex() for _ in range(args.repeat)]
+    for token in tokens:
+        memory.put(token, data)
+    lookups = iter(tokens * 2)
+    print(f"메모리 저장소 ({len(memory):,}개): 쓰기 {per_call_us(lambda: memory.put(tokens[0], data), args.repeat):.2f} µs  "
+          f"읽기 {per_call_us(lambda: memory.get(next(lookups)), args.repeat):.2f} µs")
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite = SqliteSnapshotStore(Path(directory) / 'snapshots.sqlite')
+        repeat = max(args.repeat // 100, 10)
+        for token in tokens[:repeat]:
+            sqlite.put(token, data)
+        lookups = iter(tokens[:repeat] * 2)
+        print(f"SQLite 저장소 ({repeat:,}개): 쓰기 {per_call_us(lambda: sqlite.put(tokens[0], data), repeat) / 1000:.2f} ms  "
+              f"읽기 {per_call_us(lambda: sqlite.get(next(lookups)), repeat) / 1000:.2f} ms")
+    if not same or not forked or rerun_writes:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
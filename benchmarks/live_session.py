@@ -0,0 +1,199 @@
+"""실행 중인 Streamlit 서버에 브라우저 대신 붙는 간단한 세션 클라이언트
+
+AppTest는 스크립트 전체를 실행하므로 fragment만 다시 실행되는 경우나 여러 학생이
+동시에 접속하는 경우를 재현할 수 없습니다. 이 모듈은 브라우저처럼 웹소켓으로
+BackMsg(rerun_script)를 보내고, 실행이 끝났다는 ForwardMsg(script_finished)가
+올 때까지 걸린 시간과 받은 바이트 수를 잽니다. 서버가 보내는 page_profile 메시지에서
+스크립트 실행 자체에 걸린 서버 쪽 시간도 함께 읽습니다.
+
+    with streamlit_server() as server:
+        session = LiveSession(server.url, page_name='초등수학')
+        await session.connect()
+        run = await session.rerun()
+"""
+import contextlib
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+from typing import NamedTuple
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+class RunResult(NamedTuple):
+    """재실행 한 번의 결과"""
+    seconds: float  # 요청을 보낸 뒤 실행 완료 메시지를 받을 때까지 걸린 시간
+    server_seconds: float  # 서버에서 스크립트(또는 fragment)를 실행한 시간
+    received_bytes: int  # 그동안 받은 메시지 크기 합
+    fragment: bool  # fragment만 다시 실행됐는지
+
+
+class Server(NamedTuple):
+    """띄운 streamlit 서버"""
+    url: str
+    pid: int  # CPU 시간과 메모리를 잴 때 쓰는 서버 프로세스 id
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@contextlib.contextmanager
+def streamlit_server(script='streamlit_app.py', timeout=30):
+    """저장소 루트에서 streamlit 서버를 띄우고 Server(기본 URL, 프로세스 id)를 돌려줍니다.
+
+    gatherUsageStats를 켜야 서버가 실행 시간이 담긴 page_profile 메시지를 보냅니다.
+    이 메시지는 웹소켓으로 이 클라이언트에만 전달되고 밖으로 나가지 않습니다.
+    """
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script,
+         '--server.headless', 'true', '--server.port', str(port),
+         '--browser.gatherUsageStats', 'true', '--server.fileWatcherType', 'none'],
+        cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    url = f'http://127.0.0.1:{port}'
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(f'{url}/_stcore/health', timeout=1)
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError('streamlit 서버를 시작하지 못했습니다')
+                time.sleep(0.2)
+        yield Server(url, process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+class LiveSession:
+    """브라우저 탭 하나에 해당하는 세션
+
+    화면의 위젯 값과 fragment id를 기억해 두었다가 다음 재실행 요청에 함께 보냅니다.
+    """
+
+    def __init__(self, url, page_name=''):
+        self.ws_url = url.replace('http', 'ws', 1) + '/_stcore/stream'
+        self.page_name = page_name
+        self.connection = None
+        self.page_script_hash = ''
+        self.widgets = {}  # 사용자 key -> (위젯 id, fragment id)
+        self.values = {}  # 위젯 id -> 입력한 값 (브라우저처럼 재실행 사이에 유지)
+        self.buttons = {}  # 버튼 이름(key 또는 label) -> (위젯 id, fragment id)
+        self.markdown = {}  # 요소 위치(delta path) -> 마크다운 본문
+        self.markdown_fragments = {}  # 요소 위치 -> 그 요소를 그린 fragment id (fragment 밖이면 '')
+
+    async def connect(self):
+        self.connection = await websockets.connect(self.ws_url, max_size=None)
+        return await self.rerun()
+
+    async def close(self):
+        if self.connection is not None:
+            await self.connection.close()
+
+    def set_value(self, key, value):
+        widget_id, fragment_id = self.widgets[key]
+        self.values[widget_id] = value
+        return fragment_id
+
+    async def type_value(self, key, value):
+        """숫자 입력: 브라우저처럼 값을 바꾸고 위젯이 속한 범위를 다시 실행"""
+        return await self.rerun(fragment_id=self.set_value(key, value))
+
+    async def click(self, name):
+        """버튼 클릭 (name은 버튼 key, key가 없으면 label의 앞부분)"""
+        widget_id, fragment_id = next(
+            value for button, value in self.buttons.items() if button.startswith(name)
+        )
+        return await self.rerun(trigger=widget_id, fragment_id=fragment_id)
+
+    async def rerun(self, trigger=None, fragment_id=''):
+        msg = BackMsg()
+        client_state = msg.rerun_script
+        client_state.page_script_hash = self.page_script_hash
+        client_state.page_name = self.page_name
+        client_state.fragment_id = fragment_id
+        for widget_id, _ in self.widgets.values():
+            widget = client_state.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.double_value = self.values[widget_id]
+        if trigger is not None:
+            widget = client_state.widget_states.widgets.add()
+            widget.id = trigger
+            widget.trigger_value = True
+
+        started = time.perf_counter()
+        await self.connection.send(msg.SerializeToString())
+        received = 0
+        server_seconds = 0.0
+        ran_fragment = bool(fragment_id)
+        # 브라우저처럼 다시 실행하는 범위의 요소를 지우고 이번 실행에서 받은 요소로 채움
+        self._forget(fragment_id)
+        while True:
+            data = await self.connection.recv()
+            received += len(data)
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+            if kind == 'new_session':
+                if not forward.new_session.fragment_ids_this_run:
+                    # fragment 안에서 st.rerun(scope='app')이 불리면 전체 실행으로 바뀜
+                    ran_fragment = False
+                    self._forget()
+            elif kind == 'navigation':
+                # 서버가 fragment 안에서 전체 재실행을 시작할 때도 같은 페이지를 유지하도록 기억
+                self.page_script_hash = forward.navigation.page_script_hash
+            elif kind == 'page_profile':
+                server_seconds += forward.page_profile.exec_time / 1e6
+            elif kind == 'delta':
+                self._remember(tuple(forward.metadata.delta_path), forward.delta)
+            elif kind == 'script_finished':
+                if forward.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return RunResult(time.perf_counter() - started, server_seconds, received, ran_fragment)
+
+    def _forget(self, fragment_id=''):
+        """기억한 요소를 지웁니다. fragment_id를 주면 그 fragment가 그린 요소만 지웁니다."""
+        if not fragment_id:
+            self.widgets.clear()
+            self.buttons.clear()
+            self.markdown.clear()
+            self.markdown_fragments.clear()
+            return
+        for elements in (self.widgets, self.buttons):
+            for key in [key for key, (_, owner) in elements.items() if owner == fragment_id]:
+                del elements[key]
+        for path in [path for path, owner in self.markdown_fragments.items() if owner == fragment_id]:
+            del self.markdown[path], self.markdown_fragments[path]
+
+    def _remember(self, path, delta):
+        if delta.WhichOneof('type') != 'new_element':
+            return
+        element = delta.new_element
+        kind = element.WhichOneof('type')
+        if kind == 'markdown':
+            self.markdown[path] = element.markdown.body
+            self.markdown_fragments[path] = delta.fragment_id
+        elif kind == 'number_input':
+            widget = element.number_input
+            # 위젯 id 끝에 사용자 key가 붙어 있음: $$ID-<hash>-<key>
+            key = widget.id.rsplit('-', 1)[-1]
+            if widget.set_value or widget.id not in self.values:
+                self.values[widget.id] = widget.value if widget.set_value else widget.default
+            self.widgets[key] = (widget.id, delta.fragment_id)
+        elif kind == 'button':
+            widget = element.button
+            key = widget.id.rsplit('-', 1)[-1]
+            self.buttons[key if key != 'None' else widget.label] = (widget.id, delta.fragment_id)
+
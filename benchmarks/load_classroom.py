@@ -0,0 +1,180 @@
+"""교실 하나 분량의 동시 접속 부하 시험
+
+streamlit 서버 하나를 띄우고 학생 --students명이 live_session 웹소켓 클라이언트로 동시에
+'초등수학' 페이지를 풉니다. 학생마다 같은 흐름을 따릅니다.
+
+1. 단계 1 세 문제 (첫 문제는 한 번 틀린 뒤 맞힘)
+2. 다음 단계로 이동, 역수 개념 설명을 읽고 연습문제로 이동
+3. 단계 2 세 문제
+4. '추가 연습하기'를 --extra번 눌러 매번 세 문제를 더 풂
+
+동작 사이에는 평균 --think초(0.5~1.5배 무작위)를 쉬고, 접속은 --ramp초에 걸쳐 고르게 시작합니다.
+끝나면 동작별 재실행 왕복 시간 p50/p90/p99, 서버 프로세스의 CPU 시간(학생 한 명당),
+서버 메모리(RSS)의 시작·최대·종료 값과 학생 한 명당 증가량을 보여줍니다.
+부하를 만드는 이 스크립트도 같은 기계의 CPU를 쓰므로, 코어가 적은 기계에서는 왕복 시간에
+클라이언트 쪽 처리 시간도 섞여 있습니다 (클라이언트 CPU 시간을 함께 출력).
+
+    python benchmarks/load_classroom.py [--students 200] [--extra 1] [--think 1.0] [--ramp 10] [--json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from collections import defaultdict
+
+from bench_interaction import current_answer
+from live_session import LiveSession, streamlit_server
+
+# 서버 메모리를 재는 간격 (초)
+SAMPLE_INTERVAL = 0.5
+
+
+def process_usage(pid):
+    """리눅스 /proc에서 읽은 (CPU 시간 초, RSS 바이트)"""
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')  # utime + stime
+    with open(f'/proc/{pid}/status') as f:
+        rss_kb = next(int(line.split()[1]) for line in f if line.startswith('VmRSS:'))
+    return cpu_seconds, rss_kb * 1024
+
+
+class Student:
+    """시뮬레이션 학생 한 명: 동작마다 쉬었다가 재실행 결과를 종류별로 기록"""
+
+    def __init__(self, url, seed, think, timings):
+        self.session = LiveSession(url, page_name='초등수학')
+        self.rng = random.Random(seed)
+        self.think = think
+        self.timings = timings
+
+    async def act(self, kind, action):
+        await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+        self.timings[kind].append(await action)
+
+    async def solve(self, stage, wrong_first=False):
+        session = self.session
+        index = next(key for key in session.widgets if key.startswith(f'stage{stage}_num_')).rsplit('_', 1)[1]
+        answer = current_answer(session)
+        await self.act('입력', session.type_value(f'stage{stage}_den_{index}', answer.denominator))
+        if wrong_first:
+            await self.act('입력', session.type_value(f'stage{stage}_num_{index}', answer.numerator + 1))
+            await self.act('오답 제출', session.click(f'stage{stage}_submit'))
+        await self.act('입력', session.type_value(f'stage{stage}_num_{index}', answer.numerator))
+        await self.act('정답 제출', session.click(f'stage{stage}_submit'))
+
+    async def run(self, extra):
+        await self.act('접속', self.session.connect())
+        try:
+            for number in range(3):
+                await self.solve(1, wrong_first=number == 0)
+            await self.act('단계 이동', self.session.click('다음 단계로'))
+            await self.act('단계 이동', self.session.click('stage2_understand'))
+            for _ in range(3):
+                await self.solve(2)
+            for _ in range(extra):
+                await self.act('추가 연습', self.session.click('stage2_more_practice'))
+                for _ in range(3):
+                    await self.solve(2)
+        finally:
+            await self.session.close()
+
+
+async def sample_rss(pid, peak, stop):
+    """stop이 설정될 때까지 서버 RSS의 최댓값을 peak[0]에 기록"""
+    while not stop.is_set():
+        peak[0] = max(peak[0], process_usage(pid)[1])
+        try:
+            await asyncio.wait_for(stop.wait(), SAMPLE_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def load(server, args):
+    timings = defaultdict(list)
+    # 서버가 페이지 모듈과 문제 목록을 한 번 준비하도록 학생 한 명을 먼저 돌림
+    await Student(server.url, -1, 0, defaultdict(list)).run(0)
+    cpu_before, rss_before = process_usage(server.pid)
+    peak, stop = [rss_before], asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server.pid, peak, stop))
+
+    async def start(number):
+        await asyncio.sleep(args.ramp * number / args.students)
+        await Student(server.url, args.seed + number, args.think, timings).run(args.extra)
+
+    started, client_cpu = time.perf_counter(), time.process_time()
+    outcomes = await asyncio.gather(*(start(n) for n in range(args.students)), return_exceptions=True)
+    elapsed, client_cpu = time.perf_counter() - started, time.process_time() - client_cpu
+    stop.set()
+    await sampler
+    cpu_after, rss_after = process_usage(server.pid)
+    failures = [repr(outcome) for outcome in outcomes if isinstance(outcome, BaseException)]
+    finished = args.students - len(failures)
+    return {
+        'students': args.students,
+        'failed': len(failures),
+        'errors': sorted(set(failures))[:5],
+        'seconds': round(elapsed, 1),
+        'interactions': summarize(timings),
+        'server_cpu_seconds': round(cpu_after - cpu_before, 2),
+        'server_cpu_ms_per_student': round((cpu_after - cpu_before) / max(finished, 1) * 1000, 1),
+        'client_cpu_seconds': round(client_cpu, 2),
+        'rss_mb': {
+            'before': round(rss_before / 2 ** 20, 1),
+            'peak': round(peak[0] / 2 ** 20, 1),
+            'after': round(rss_after / 2 ** 20, 1),
+        },
+        'rss_kb_per_student': round((peak[0] - rss_before) / args.students / 1024, 1),
+    }
+
+
+def summarize(timings):
+    def percentile(values, q):
+        return round(values[min(len(values) - 1, int(len(values) * q))] * 1000, 1)
+
+    rows = {}
+    everything = sorted(run.seconds for runs in timings.values() for run in runs)
+    for kind, runs in [*timings.items(), ('전체', None)]:
+        seconds = everything if runs is None else sorted(run.seconds for run in runs)
+        if seconds:
+            rows[kind] = {
+                'count': len(seconds),
+                'p50_ms': percentile(seconds, 0.5),
+                'p90_ms': percentile(seconds, 0.9),
+                'p99_ms': percentile(seconds, 0.99),
+            }
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=200)
+    parser.add_argument('--extra', type=int, default=1, help="'추가 연습하기'를 누르는 횟수")
+    parser.add_argument('--think', type=float, default=1.0, help='동작 사이 평균 쉬는 시간 (초)')
+    parser.add_argument('--ramp', type=float, default=10.0, help='모든 학생이 접속을 시작하는 데 걸리는 시간 (초)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    with streamlit_server() as server:
+        report = asyncio.run(load(server, args))
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+    print(f"학생 {report['students']}명 (실패 {report['failed']}명), {report['seconds']}초")
+    for error in report['errors']:
+        print(f"  오류: {error}")
+    print(f"{'동작':<8}{'횟수':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    for kind, row in report['interactions'].items():
+        print(f"{kind:<8}{row['count']:>7}{row['p50_ms']:>9}{row['p90_ms']:>9}{row['p99_ms']:>9}")
+    print(f"서버 CPU {report['server_cpu_seconds']}s (학생당 {report['server_cpu_ms_per_student']} ms), "
+          f"부하 클라이언트 CPU {report['client_cpu_seconds']}s")
+    rss = report['rss_mb']
+    print(f"서버 RSS {rss['before']} → 최대 {rss['peak']} → 종료 {rss['after']} MB "
+          f"(학생당 {report['rss_kb_per_student']} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""난이도 맞춤 문제 고르기 모의 실험
+
+가상의 학생 --students명이 단계 2 연습 세트(세 문제)를 --sets번 풉니다.
+- adaptive: elemath.adaptive가 학생 통계로 고른 세트
+- random: 지금처럼 make_practice_problems로 무작위로 고른 세트
+
+가상 학생 모형 (문제 고르기와 상관없는 가정)
+- 실력 θ와 문제 난이도 d(LEVELS 안의 구간 순서 0~5)로 한 번에 맞힐 확률 1 / (1 + e^(-1.5(θ - d)))
+- 문제 하나를 맞히거나 세 번 틀릴 때까지 제출하고, 제출마다 θ가 LEARNING_RATE × p × (1 - p)만큼 늘어남
+  (너무 쉽거나 너무 어려운 문제에서는 덜 배움)
+- 풀이 시간은 20초 × e^(0.3d - 0.2θ) × 로그정규 잡음
+
+세트마다 평균 실력과 첫 제출 정답률(학습 곡선)을 출력하고, 통계 갱신(record)과
+다음 세트 고르기(next_set)에 걸린 시간의 p50/p99도 보여줍니다.
+
+    python benchmarks/simulate_adaptive.py [--students 1000] [--sets 10]
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath import generate_non_divisible_problem, make_practice_problems  # noqa: E402
+from elemath.adaptive import LEVELS, StudentStats, difficulty_band, next_set  # noqa: E402
+
+LEARNING_RATE = 0.15
+MAX_SUBMISSIONS = 3
+DIFFICULTY = {band: level for level, band in enumerate(LEVELS[2])}
+
+
+def solve(student, problem, rng, stats, timings):
+    """문제 하나를 풀고 첫 제출에 맞혔는지 돌려줍니다."""
+    difficulty = DIFFICULTY[difficulty_band(2, problem)]
+    for submission in range(MAX_SUBMISSIONS):
+        p = 1 / (1 + math.exp(-1.5 * (student['theta'] - difficulty)))
+        correct = rng.random() < p
+        seconds = 20 * math.exp(0.3 * difficulty - 0.2 * student['theta']) * rng.lognormvariate(0, 0.3)
+        student['theta'] += LEARNING_RATE * p * (1 - p)
+        if stats is not None:
+            started = time.perf_counter_ns()
+            stats.record(2, problem, correct, seconds)
+            timings['record'].append(time.perf_counter_ns() - started)
+        if correct:
+            return submission == 0
+    return False
+
+
+def simulate(policy, students, sets, seed):
+    """세트별 (평균 실력, 첫 제출 정답률)과 시간 측정값"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    curve = [[0.0, 0] for _ in range(sets)]
+    timings = {'record': [], 'next_set': []}
+    for _ in range(students):
+        student = {'theta': rng.gauss(1.0, 1.0)}
+        stats = StudentStats() if policy == 'adaptive' else None
+        for number in range(sets):
+            example = generate_non_divisible_problem(rng=rng)
+            if stats is not None and stats.has_answers(2):
+                started = time.perf_counter_ns()
+                problems = next_set(stats, 2, 3, rng=rng, exclude=(example,))
+                timings['next_set'].append(time.perf_counter_ns() - started)
+            else:
+                problems = make_practice_problems(example, 3, rng=rng)
+            first_try = sum(solve(student, p, rng, stats, timings) for p in problems)
+            curve[number][0] += student['theta'] / students
+            curve[number][1] += first_try / (3 * students)
+    return curve, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--sets', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    results = {policy: simulate(policy, args.students, args.sets, args.seed) for policy in ('random', 'adaptive')}
+    print(f"{'세트':>4}  {'random 실력':>11}{'정답률':>8}  {'adaptive 실력':>13}{'정답률':>8}")
+    for number in range(args.sets):
+        (theta_r, acc_r), (theta_a, acc_a) = results['random'][0][number], results['adaptive'][0][number]
+        print(f"{number + 1:>4}  {theta_r:>11.2f}{acc_r:>8.0%}  {theta_a:>13.2f}{acc_a:>8.0%}")
+    for name, values in results['adaptive'][1].items():
+        values.sort()
+        print(f"{name}: p50 {values[len(values) // 2] / 1000:.2f} µs  "
+              f"p99 {values[int(len(values) * 0.99)] / 1000:.2f} µs  ({len(values):,}회)")
+
+
+if __name__ == '__main__':
+    main()
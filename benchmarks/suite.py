@@ -0,0 +1,147 @@
+"""문제 생성기 벤치마크 모음
+
+문제 생성기(등록한 문제 종류 모두), 연습 문제 세트 만들기, 채점을 같은 시드로 여러 번 불러
+호출당 지연 시간 p50/p99, 문제 하나당 평균 시도 횟수, 최후의 수단 사용 비율을 잽니다.
+
+    python benchmarks/suite.py                 # 측정하고 baseline.json과 비교 (느려지면 종료 코드 1)
+    python benchmarks/suite.py --save          # 측정 결과를 baseline.json으로 저장
+    python benchmarks/suite.py --json          # 측정 결과를 JSON으로 출력
+
+시도 횟수와 최후의 수단 비율은 시드가 같으면 항상 같으므로 기준값보다 조금이라도 늘면 실패로 보고,
+지연 시간은 기계 상태에 따라 흔들리므로 --tolerance(p50), --p99-tolerance(p99) 비율까지 허용합니다.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from elemath import (  # noqa: E402
+    PROBLEM_TYPES,
+    check_answer,
+    generate_divisible_problem,
+    generate_non_divisible_problem,
+    generate_problem,
+    make_practice_problems,
+    make_stage1_problems,
+)
+
+BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+# 넓은 범위: 분모가 커질수록 조건에 맞는 후보가 드물어져 시도 횟수가 늘어나는지 봄
+WIDE_NUMERATOR_RANGE = (1, 1000)
+WIDE_DENOMINATOR_RANGE = (2, 1000)
+
+
+def _cases(rng, stats):
+    """(이름, 인자 없이 한 번 부르는 함수, 시도 횟수를 세는지) 목록"""
+    example = generate_non_divisible_problem(rng=rng)
+    answers = [(rng.randint(1, 20), rng.randint(1, 20), rng.randint(1, 20), rng.randint(1, 20)) for _ in range(64)]
+    answer_index = iter(range(10 ** 9))
+    # 단계 1, 2 밖에 새로 등록한 문제 종류도 기본 범위로 잼
+    registered = [
+        (f'generate_problem[{key}]', lambda t=t: generate_problem(
+            t.key, t.numerator_range, t.denominator_range, t.result_range, rng=rng, stats=stats), True)
+        for key, t in PROBLEM_TYPES.items() if key not in (1, 2)
+    ]
+    return registered + [
+        ('generate_divisible_problem', lambda: generate_divisible_problem(rng=rng, stats=stats), True),
+        ('generate_divisible_problem (1~1000)', lambda: generate_divisible_problem(
+            WIDE_NUMERATOR_RANGE, WIDE_DENOMINATOR_RANGE, (2, 50), rng=rng, stats=stats), True),
+        ('generate_non_divisible_problem', lambda: generate_non_divisible_problem(rng=rng, stats=stats), True),
+        ('generate_non_divisible_problem (1~1000)', lambda: generate_non_divisible_problem(
+            WIDE_NUMERATOR_RANGE, WIDE_DENOMINATOR_RANGE, rng=rng, stats=stats), True),
+        ('make_practice_problems', lambda: make_practice_problems(example, 3), False),
+        ('make_stage1_problems', lambda: make_stage1_problems(3), False),
+        ('check_answer', lambda: check_answer(*answers[next(answer_index) % len(answers)]), False),
+    ]
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run(repeat, seed):
+    """사례별 측정 결과 딕셔너리"""
+    results = {}
+    for index in range(len(_cases(random.Random(seed), Counter()))):
+        # 사례마다 시드를 새로 맞춰 다른 사례의 실행 횟수에 영향을 받지 않게 함
+        random.seed(seed)
+        stats = Counter()
+        name, call, counts_tries = _cases(random.Random(seed), stats)[index]
+        for _ in range(min(repeat // 10, 200)):  # 캐시·문제 목록을 미리 만들어 둠
+            call()
+        stats.clear()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter_ns()
+            call()
+            timings.append(time.perf_counter_ns() - started)
+        timings.sort()
+        row = {
+            'p50_us': round(_percentile(timings, 0.5) / 1000, 2),
+            'p99_us': round(_percentile(timings, 0.99) / 1000, 2),
+        }
+        if counts_tries:
+            row['mean_tries'] = round(stats['tries'] / stats['calls'], 4)
+            row['fallback_rate'] = round(stats['fallbacks'] / stats['calls'], 6)
+        results[name] = row
+    return results
+
+
+def regressions(results, baseline, tolerance, p99_tolerance):
+    """기준값보다 나빠진 항목 설명 목록"""
+    problems = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key, allowed in (('p50_us', tolerance), ('p99_us', p99_tolerance)):
+            if row[key] > base[key] * (1 + allowed):
+                problems.append(f"{name}: {key} {base[key]} → {row[key]} (허용 +{allowed:.0%})")
+        for key in ('mean_tries', 'fallback_rate'):
+            if key in base and row.get(key, 0) > base[key]:
+                problems.append(f"{name}: {key} {base[key]} → {row[key]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save', action='store_true', help='측정 결과를 기준값으로 저장')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='p50 허용 증가 비율')
+    parser.add_argument('--p99-tolerance', type=float, default=1.0, help='p99 허용 증가 비율')
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'사례':<42}{'p50 µs':>9}{'p99 µs':>9}{'평균 시도':>9}{'최후의 수단':>10}")
+        for name, row in results.items():
+            print(f"{name:<42}{row['p50_us']:>9}{row['p99_us']:>9}"
+                  f"{row.get('mean_tries', '-'):>11}{row.get('fallback_rate', '-'):>12}")
+
+    if args.save:
+        args.baseline.write_text(json.dumps(results, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"기준값 파일이 없습니다: {args.baseline} (--save로 만드세요)")
+        return 0
+    problems = regressions(results, json.loads(args.baseline.read_text(encoding='utf-8')),
+                           args.tolerance, args.p99_tolerance)
+    for problem in problems:
+        print(f"느려짐: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""분수의 나눗셈 엔진
+
+문제 생성, 채점, 풀이 과정 계산을 Streamlit 없이 쓸 수 있도록 모아 둔 패키지입니다.
+페이지(`pages/초등수학.py`)와 일괄 작업(`python -m elemath`)이 함께 사용합니다.
+"""
+from elemath.grading import GRADE_LABELS, GradeResult, check_answer, grade_batch
+from elemath.history import JsonlHistoryStore, ProblemHistory, SqliteHistoryStore, open_history_store
+from elemath.problems import (
+    STAGE1_DENOMINATOR_RANGE,
+    STAGE1_NUMERATOR_RANGE,
+    STAGE1_RESULT_RANGE,
+    STAGE2_DENOMINATOR_RANGE,
+    STAGE2_NUMERATOR_RANGE,
+    STAGE2_RESULT_RANGE,
+    Problem,
+    build_divisible_index,
+    build_non_divisible_bank,
+    generate_divisible_problem,
+    generate_non_divisible_problem,
+    generate_problem,
+    make_practice_problems,
+    make_problem,
+    make_stage1_problems,
+    pick_divisible_problem,
+    pick_non_divisible_problem,
+)
+from elemath.registry import PROBLEM_TYPES, ProblemType, get_problem_type, register_problem_type
+from elemath.render import render_block, render_cache_stats
+from elemath.steps import Stage1Steps, Stage2Steps, solution_steps, stage1_steps, stage2_steps
+
+__all__ = [
+    "STAGE1_DENOMINATOR_RANGE",
+    "STAGE1_NUMERATOR_RANGE",
+    "STAGE1_RESULT_RANGE",
+    "STAGE2_DENOMINATOR_RANGE",
+    "STAGE2_NUMERATOR_RANGE",
+    "STAGE2_RESULT_RANGE",
+    "GRADE_LABELS",
+    "PROBLEM_TYPES",
+    "GradeResult",
+    "JsonlHistoryStore",
+    "Problem",
+    "ProblemHistory",
+    "ProblemType",
+    "SqliteHistoryStore",
+    "Stage1Steps",
+    "Stage2Steps",
+    "build_divisible_index",
+    "build_non_divisible_bank",
+    "check_answer",
+    "generate_divisible_problem",
+    "generate_non_divisible_problem",
+    "generate_problem",
+    "get_problem_type",
+    "grade_batch",
+    "make_practice_problems",
+    "make_problem",
+    "make_stage1_problems",
+    "open_history_store",
+    "pick_divisible_problem",
+    "pick_non_divisible_problem",
+    "register_problem_type",
+    "render_block",
+    "render_cache_stats",
+    "solution_steps",
+    "stage1_steps",
+    "stage2_steps",
+]
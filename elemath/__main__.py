@@ -0,0 +1,196 @@
+"""문제 일괄 생성·채점·내보내기 CLI
+
+예시:
+    python -m elemath generate --stage 2 --count 1000 --format csv > problems.csv
+    python -m elemath generate --stage 1 --count 50 --seed 7 --den-max 100
+    python -m elemath grade submissions.csv --output graded.csv
+    python -m elemath export --stage 2 --sheets 1000 --size 50 --format latex --workers 4 --output-dir out
+    python -m elemath bank --stage 2 --num-max 30 --den-max 30 --output stage2.bank
+"""
+import argparse
+import csv
+import json
+import random
+import subprocess
+import sys
+
+from elemath.bank import write_bank
+from elemath.export import FORMATS, export_worksheets
+from elemath.grading import GRADE_LABELS, grade_batch
+from elemath.problems import (
+    STAGE1_DENOMINATOR_RANGE,
+    STAGE1_NUMERATOR_RANGE,
+    STAGE1_RESULT_RANGE,
+    STAGE2_DENOMINATOR_RANGE,
+    STAGE2_NUMERATOR_RANGE,
+    STAGE2_RESULT_RANGE,
+    generate_problem,
+)
+
+FIELDS = ['numerator1', 'denominator1', 'numerator2', 'denominator2', 'result_num', 'result_den']
+
+
+def _add_generate_parser(subparsers):
+    parser = subparsers.add_parser('generate', help='문제를 여러 개 만들어 출력합니다')
+    parser.add_argument('--stage', type=int, choices=(1, 2), default=1)
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--format', choices=('csv', 'jsonl'), default='csv')
+    parser.add_argument('--seed', type=int, default=None, help='같은 시드면 같은 문제가 나옵니다')
+    _add_range_arguments(parser)
+
+
+def _add_range_arguments(parser):
+    parser.add_argument('--num-min', type=int, default=None)
+    parser.add_argument('--num-max', type=int, default=None)
+    parser.add_argument('--den-min', type=int, default=None)
+    parser.add_argument('--den-max', type=int, default=None)
+    parser.add_argument('--result-min', type=int, default=None, help='결과값 최솟값 (단계 1은 몫)')
+    parser.add_argument('--result-max', type=int, default=None, help='결과값 최댓값 (단계 1은 몫)')
+
+
+def _pick(value, default):
+    """명령행에서 준 값 (0도 준 값으로 봄), 없으면 기본값"""
+    return value if value is not None else default
+
+
+def _ranges(args):
+    """명령행 인자와 단계별 기본 범위를 합쳐 (분자, 분모, 결과값) 범위를 만듭니다.
+    범위가 뒤집혔거나 분자가 1보다, 분모가 2보다 작으면 ValueError를 냅니다.
+    """
+    if args.stage == 1:
+        num_range, den_range, result_range = STAGE1_NUMERATOR_RANGE, STAGE1_DENOMINATOR_RANGE, STAGE1_RESULT_RANGE
+    else:
+        num_range, den_range, result_range = STAGE2_NUMERATOR_RANGE, STAGE2_DENOMINATOR_RANGE, STAGE2_RESULT_RANGE
+    num_range = (_pick(args.num_min, num_range[0]), _pick(args.num_max, num_range[1]))
+    den_range = (_pick(args.den_min, den_range[0]), _pick(args.den_max, den_range[1]))
+    if args.result_min is not None or args.result_max is not None:
+        # 단계 2는 결과값 범위가 없으므로 한쪽만 주면 다른 쪽은 나올 수 있는 결과값을 모두 포함하는 값으로 둠
+        low, high = result_range or (0, num_range[1] * den_range[1])
+        result_range = (_pick(args.result_min, low), _pick(args.result_max, high))
+    if num_range[0] < 1 or den_range[0] < 2:
+        raise ValueError('분자 최솟값은 1, 분모 최솟값은 2 이상이어야 합니다')
+    for name, (low, high) in (('분자', num_range), ('분모', den_range), ('결과값', result_range or (0, 0))):
+        if low > high:
+            raise ValueError(f'{name} 범위의 최솟값({low})이 최댓값({high})보다 큽니다')
+    return num_range, den_range, result_range
+
+
+def generate(args, out):
+    rng = random.Random(args.seed)
+    num_range, den_range, result_range = _ranges(args)
+    if args.format == 'csv':
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+    for _ in range(args.count):
+        p = generate_problem(args.stage, num_range, den_range, result_range, rng)
+        if args.format == 'csv':
+            writer.writerow([p[field] for field in FIELDS])
+        else:
+            out.write(json.dumps({field: p[field] for field in FIELDS}) + '\n')
+
+
+def _add_grade_parser(subparsers):
+    parser = subparsers.add_parser('grade', help='학습지 제출 결과 CSV를 한꺼번에 채점합니다')
+    parser.add_argument('path', help='user_num, user_den, result_num, result_den 열이 있는 CSV '
+                                     '(numerator1 등 피연산자 열이 있으면 역수 실수도 가려냄)')
+    parser.add_argument('--output', default=None, help='correct, code 열을 덧붙인 CSV를 쓸 경로')
+
+
+def grade(args, out):
+    """CSV 전체를 정수 배열로 읽어 grade_batch로 채점하고 분류별 개수를 출력합니다."""
+    import numpy as np
+
+    with open(args.path, encoding='utf-8') as f:
+        header = f.readline().strip().split(',')
+    table = np.loadtxt(args.path, delimiter=',', skiprows=1, dtype=np.int64, ndmin=2)
+    column = {name: table[:, i] for i, name in enumerate(header)}
+    operands = None
+    if all(field in column for field in FIELDS[:4]):
+        operands = [column[field] for field in FIELDS[:4]]
+    result = grade_batch(column['user_num'], column['user_den'], column['result_num'], column['result_den'], operands)
+
+    counts = np.bincount(result.code, minlength=len(GRADE_LABELS))
+    out.write(f"채점한 답 {len(table)}개, 정답 {int(result.correct.sum())}개\n")
+    for code, label in GRADE_LABELS.items():
+        out.write(f"{label}\t{counts[code]}\n")
+    if args.output:
+        graded = np.column_stack([table, result.correct, result.code])
+        np.savetxt(args.output, graded, fmt='%d', delimiter=',', header=','.join(header + ['correct', 'code']),
+                   comments='')
+
+
+def _add_export_parser(subparsers):
+    parser = subparsers.add_parser('export', help='학습지와 정답지를 파일로 내보냅니다')
+    parser.add_argument('--stage', type=int, choices=(1, 2), default=1)
+    parser.add_argument('--sheets', type=int, default=1, help='학습지 장 수')
+    parser.add_argument('--size', type=int, default=20, help='학습지 한 장의 문제 수')
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--seed', type=int, default=0, help='같은 시드면 같은 학습지가 나옵니다')
+    parser.add_argument('--workers', type=int, default=0, help='2 이상이면 그만큼의 프로세스로 나눠 만듭니다')
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--name', default='worksheets', help='파일 이름 (정답지는 이름 뒤에 _answers)')
+    _add_range_arguments(parser)
+
+
+def export(args, out):
+    paths = export_worksheets(args.output_dir, args.stage, args.sheets, args.size, _ranges(args),
+                              fmt=args.format, seed=args.seed, workers=args.workers, name=args.name)
+    for path in paths:
+        out.write(f"{path}\n")
+
+
+def _add_bank_parser(subparsers):
+    parser = subparsers.add_parser('bank', help='범위 안의 모든 문제를 메모리 맵 문제 은행 파일로 씁니다')
+    parser.add_argument('--stage', type=int, choices=(1, 2), default=1)
+    parser.add_argument('--output', required=True, help='쓸 파일 경로')
+    _add_range_arguments(parser)
+
+
+def bank(args, out):
+    header = write_bank(args.output, args.stage, *_ranges(args))
+    out.write(f"{args.output}: 단계 {header.stage}, 문제 {header.count}개, CRC32 {header.crc32:08x}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m elemath', description='분수의 나눗셈 문제 도구')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    _add_generate_parser(subparsers)
+    _add_grade_parser(subparsers)
+    _add_export_parser(subparsers)
+    _add_bank_parser(subparsers)
+    args = parser.parse_args(argv)
+    if args.command in ('generate', 'export', 'bank'):
+        try:
+            _ranges(args)
+        except ValueError as error:
+            parser.error(str(error))
+    if args.command == 'generate':
+        try:
+            generate(args, sys.stdout)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+    elif args.command == 'grade':
+        grade(args, sys.stdout)
+    elif args.command == 'export':
+        try:
+            export(args, sys.stdout)
+        except (RuntimeError, ValueError) as error:
+            print(error, file=sys.stderr)
+            return 1
+        except subprocess.CalledProcessError as error:
+            # LaTeX 엔진이 실패한 경우 (자세한 내용은 출력 폴더의 .log 파일)
+            print(f"PDF 변환에 실패했습니다: {error.cmd[-1]} ({error.cmd[0]} 종료 코드 {error.returncode})",
+                  file=sys.stderr)
+            return 1
+    elif args.command == 'bank':
+        try:
+            bank(args, sys.stdout)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""학생 실력에 맞춘 문제 고르기
+
+학생마다 난이도 구간별 통계(맞힌 수, 틀린 제출 수, 최근 정답률, 최근 풀이 시간)를 두고,
+답을 낼 때마다 O(1)로 갱신합니다. 다음 문제는 지금 구간에 해당하는 미리 만들어 둔 문제 묶음에서
+바로 고르므로 후보 문제를 새로 만들지 않습니다.
+
+난이도 구간은 (단계, 수의 크기, 약분 형태)입니다.
+- 단계 1: 분모가 작은 문제(10 이하) → 큰 문제
+- 단계 2: 수가 작은 문제(분자·분모 모두 8 이하) → 큰 문제, 같은 크기 안에서는
+  분모끼리 약분 → 분자끼리 약분 → 둘 다 약분 순서
+지금 구간이나 그보다 어려운 구간의 최근 정답률이 PROMOTE_ACCURACY 이상이고 풀이가 느리지 않으면
+그 다음 구간으로 올리고, 지금 구간의 정답률이 DEMOTE_ACCURACY 아래로 떨어지면 한 구간 내립니다.
+"""
+import random
+from functools import lru_cache
+from typing import NamedTuple
+
+from elemath.problems import build_divisible_index, build_non_divisible_bank, reduction_pattern
+
+# 최근 값에 주는 가중치 (지수 이동 평균)
+EWMA_WEIGHT = 0.3
+# 구간을 올리거나 내리기 전에 그 구간에서 풀어야 하는 최소 문제 수
+MIN_ANSWERED = 2
+PROMOTE_ACCURACY = 0.8
+DEMOTE_ACCURACY = 0.5
+# 최근 풀이 시간이 이보다 길면 정답률이 높아도 구간을 올리지 않음 (초)
+SLOW_SECONDS = 90.0
+# 단계 1은 분모, 단계 2는 분자·분모 중 가장 큰 수가 이 값보다 크면 '큰 수' 구간
+LARGE_OPERAND = {1: 10, 2: 8}
+
+# 쉬운 구간부터 어려운 구간 순서. 단계 2의 약분 형태는 (분자끼리, 분모끼리) 약분 가능 여부
+LEVELS = {
+    1: [(1, False, None), (1, True, None)],
+    2: [
+        (2, large, pattern)
+        for large in (False, True)
+        for pattern in ((False, True), (True, False), (True, True))
+    ],
+}
+LEVEL_INDEX = {band: index for levels in LEVELS.values() for index, band in enumerate(levels)}
+
+
+class Band(NamedTuple):
+    """난이도 구간 하나의 통계"""
+    answered: int = 0  # 맞혀서 끝낸 문제 수
+    wrong: int = 0  # 틀린 제출 수
+    accuracy: float = 0.0  # 제출마다 갱신하는 최근 정답률
+    seconds: float = 0.0  # 맞힐 때까지 걸린 최근 시간
+
+
+def difficulty_band(stage, problem):
+    """문제가 속한 난이도 구간 (LEVELS의 원소)"""
+    if stage == 1:
+        return 1, max(problem.denominator1, problem.denominator2) > LARGE_OPERAND[1], None
+    return 2, max(problem.operands) > LARGE_OPERAND[2], reduction_pattern(problem)
+
+
+def result_key(problem):
+    """결과값 (분자, 분모). 연습 세트 안에서 결과값이 겹치지 않게 할 때 씀"""
+    return problem.result_num, problem.result_den
+
+
+@lru_cache(maxsize=None)
+def band_pools(stage):
+    """미리 만들어 둔 문제 목록을 난이도 구간별, 그 안에서 결과값별로 나눈 것 (프로세스당 한 번)
+    {구간: {결과값: [문제, ...]}}
+    """
+    problems = build_divisible_index()['problems'] if stage == 1 else build_non_divisible_bank()['problems']
+    pools = {band: {} for band in LEVELS[stage]}
+    for p in problems:
+        pools[difficulty_band(stage, p)].setdefault(result_key(p), []).append(p)
+    return pools
+
+
+class StudentStats:
+    """학생 한 명의 구간별 통계와 단계별 현재 구간"""
+
+    def __init__(self):
+        self.bands = {}
+        self.levels = {1: 0, 2: 0}
+
+    def band(self, band):
+        return self.bands.get(band, Band())
+
+    def record(self, stage, problem, correct, seconds=None):
+        """답 한 번을 반영합니다 (O(1)). seconds는 문제를 보여준 뒤 맞힐 때까지 걸린 시간입니다."""
+        key = difficulty_band(stage, problem)
+        old = self.band(key)
+        first = old.answered == 0 and old.wrong == 0
+        accuracy = float(correct) if first else old.accuracy + EWMA_WEIGHT * (correct - old.accuracy)
+        elapsed = old.seconds
+        if correct and seconds is not None:
+            elapsed = seconds if old.answered == 0 else old.seconds + EWMA_WEIGHT * (seconds - old.seconds)
+        new = Band(old.answered + bool(correct), old.wrong + (not correct), accuracy, elapsed)
+        self.bands[key] = new
+        self._adjust(stage, key, new)
+
+    def _adjust(self, stage, key, band):
+        level, index = self.levels[stage], LEVEL_INDEX[key]
+        if index < level or band.answered + band.wrong < MIN_ANSWERED:
+            return
+        if band.accuracy >= PROMOTE_ACCURACY and band.seconds <= SLOW_SECONDS:
+            self.levels[stage] = min(index + 1, len(LEVELS[stage]) - 1)
+        elif index == level and band.accuracy < DEMOTE_ACCURACY:
+            self.levels[stage] = max(level - 1, 0)
+
+    def has_answers(self, stage):
+        """그 단계 문제에 답을 낸 적이 있는지"""
+        return any(band[0] == stage for band in self.bands)
+
+    def current_band(self, stage):
+        return LEVELS[stage][self.levels[stage]]
+
+
+def _nearby_levels(stage, level):
+    """level부터 가까운 구간 순서 (같은 거리면 쉬운 구간 먼저)"""
+    count = len(LEVELS[stage])
+    for distance in range(count):
+        for index in (level - distance, level + distance) if distance else (level,):
+            if 0 <= index < count:
+                yield index
+
+
+def next_set(stats, stage, n=3, rng=random, exclude=()):
+    """지금 구간에서 결과값이 서로 다른 문제 n개. exclude에 든 문제(예시 문제 등)와도 결과값이 겹치지 않습니다.
+    지금 구간의 결과값이 모자라면 가까운 구간까지 넓혀서 고르고, 그래도 모자라면 있는 만큼만 돌려줍니다.
+    """
+    return level_set(stage, stats.levels[stage], n, rng, exclude)
+
+
+def level_set(stage, level, n=3, rng=random, exclude=()):
+    """next_set과 같되 구간 번호(LEVELS[stage]의 위치)를 직접 받음. 미리 만들기처럼 통계 없이 고를 때 씀"""
+    pools = band_pools(stage)
+    used = {result_key(p) for p in exclude}
+    chosen = []
+    for index in _nearby_levels(stage, level):
+        pool = pools[LEVELS[stage][index]]
+        keys = [key for key in pool if key not in used]
+        for key in rng.sample(keys, min(n - len(chosen), len(keys))):
+            used.add(key)
+            chosen.append(rng.choice(pool[key]))
+        if len(chosen) == n:
+            break
+    return chosen
+
+
+def next_problem(stats, stage, rng=random, exclude=()):
+    """지금 구간의 문제 하나 (exclude에 든 문제와 결과값이 겹치지 않음). 고를 문제가 없으면 None"""
+    chosen = next_set(stats, stage, 1, rng, exclude)
+    return chosen[0] if chosen else None
@@ -0,0 +1,174 @@
+"""메모리 맵 문제 은행 파일
+
+한 기계에서 서버 프로세스를 여러 개 띄우면 프로세스마다 문제 목록을 새로 만들어 메모리에 따로 둡니다.
+문제 은행 파일은 단계와 범위에 맞는 모든 문제를 한 번 만들어 고정 폭 이진 레코드로 써 두고,
+각 프로세스는 파일을 읽기 전용 메모리 맵으로 엽니다. 그러면 모든 프로세스가 운영 체제의 같은
+페이지를 함께 쓰고, 시작할 때 문제를 다시 만들 필요가 없습니다.
+서버는 ELEMATH_BANK_DIR 환경 변수에 준 폴더에서 단계와 범위가 같은 파일을 찾아
+problem_space, build_divisible_index, build_non_divisible_bank의 문제 목록으로 씁니다 (elemath.problems).
+
+파일 구성 (모두 little-endian)
+- 머리말 HEADER_SIZE바이트: 식별자, 버전, 단계, 분자·분모·결과값 범위, 문제 수, 레코드 크기, 레코드 CRC32
+- 레코드 RECORD.size바이트씩: numerator1, denominator1, numerator2, denominator2 (각 2바이트),
+  result_num, result_den (각 4바이트). 결과값 순서로 정렬되어 있어 같은 결과값의 문제가 붙어 있습니다.
+
+    python -m elemath bank --stage 2 --output stage2.bank
+    with open_bank('stage2.bank') as bank:
+        bank.choice(rng)
+"""
+import bisect
+import mmap
+import os
+import random
+import struct
+import zlib
+from fractions import Fraction
+from typing import NamedTuple
+
+from elemath.problems import Problem, iter_problem_space
+from elemath.rational import as_pair
+from elemath.registry import get_problem_type
+
+MAGIC = b'ELEMBANK'
+VERSION = 1
+HEADER_SIZE = 64
+
+# 식별자, 버전, 단계, 결과값 범위 유무, 분자 범위, 분모 범위, 결과값 범위(분수 두 개),
+# 문제 수, 레코드 크기, 레코드 CRC32
+HEADER = struct.Struct('<8sHBB4H4IIHI')
+RECORD = struct.Struct('<4H2I')
+_RESULT = struct.Struct('<2I')  # 레코드 안의 (result_num, result_den)
+_RESULT_OFFSET = 8
+
+# 레코드 한 칸에 담을 수 있는 최댓값
+MAX_OPERAND = 0xFFFF
+
+
+class BankHeader(NamedTuple):
+    """문제 은행 파일 머리말"""
+    stage: int
+    numerator_range: tuple
+    denominator_range: tuple
+    result_range: object  # (최솟값, 최댓값) Fraction 튜플, 제한이 없으면 None
+    count: int
+    crc32: int
+
+
+def write_bank(path, stage, numerator_range, denominator_range, result_range=None):
+    """범위 안의 모든 문제를 결과값 순서로 정렬해 path에 씁니다. 머리말을 돌려줍니다.
+    다른 프로세스가 예전 파일을 열어 두었어도 깨지지 않도록 임시 파일에 쓴 뒤 바꿔 넣습니다.
+    """
+    if result_range is None:
+        result_range = get_problem_type(stage).result_range
+    if max(*numerator_range, *denominator_range) > MAX_OPERAND or min(*numerator_range, *denominator_range) < 1:
+        raise ValueError(f'분자와 분모는 1~{MAX_OPERAND} 범위여야 합니다')
+    problems = sorted(
+        iter_problem_space(stage, numerator_range, denominator_range, result_range),
+        key=lambda p: (p.result_num, p.result_den, p.operands),
+    )
+    records = bytearray(RECORD.size * len(problems))
+    for i, p in enumerate(problems):
+        RECORD.pack_into(records, i * RECORD.size, *p)
+    crc = zlib.crc32(records)
+    low, high = result_range if result_range is not None else (0, 0)
+    header = BankHeader(stage, tuple(numerator_range), tuple(denominator_range),
+                        None if result_range is None else (Fraction(low), Fraction(high)), len(problems), crc)
+    packed = HEADER.pack(
+        MAGIC, VERSION, stage, result_range is not None, *numerator_range, *denominator_range,
+        *as_pair(low), *as_pair(high), len(problems), RECORD.size, crc,
+    )
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(packed.ljust(HEADER_SIZE, b'\0'))
+        f.write(records)
+    os.replace(temp_path, path)
+    return header
+
+
+def _read_header(buffer):
+    if len(buffer) < HEADER_SIZE:
+        raise ValueError('문제 은행 파일이 너무 짧습니다')
+    (magic, version, stage, has_result_range, num_min, num_max, den_min, den_max,
+     low_num, low_den, high_num, high_den, count, record_size, crc) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError('문제 은행 파일이 아닙니다')
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f'지원하지 않는 문제 은행 버전입니다: {version}')
+    if len(buffer) != HEADER_SIZE + count * record_size:
+        raise ValueError('문제 은행 파일 크기가 머리말과 맞지 않습니다')
+    result_range = (Fraction(low_num, low_den), Fraction(high_num, high_den)) if has_result_range else None
+    return BankHeader(stage, (num_min, num_max), (den_min, den_max), result_range, count, crc)
+
+
+class ProblemBank:
+    """읽기 전용 메모리 맵으로 연 문제 은행. 문제 목록(시퀀스)처럼 씁니다.
+    문제는 꺼낼 때마다 Problem으로 만들고, 파일 내용 자체는 프로세스 메모리에 복사하지 않습니다.
+    """
+
+    def __init__(self, path, verify=True):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.header = _read_header(self._map)
+            if verify:
+                with memoryview(self._map) as view, view[HEADER_SIZE:] as records:
+                    crc = zlib.crc32(records)
+                if crc != self.header.crc32:
+                    raise ValueError('문제 은행 파일이 손상되었습니다 (CRC 불일치)')
+        except ValueError:
+            self._map.close()
+            raise
+
+    def __len__(self):
+        return self.header.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.header.count
+        if not 0 <= index < self.header.count:
+            raise IndexError(index)
+        return Problem(*RECORD.unpack_from(self._map, HEADER_SIZE + index * RECORD.size))
+
+    def _result_at(self, index):
+        return _RESULT.unpack_from(self._map, HEADER_SIZE + index * RECORD.size + _RESULT_OFFSET)
+
+    def result_span(self, result_num, result_den=1):
+        """결과값이 result_num/result_den(기약분수)인 문제의 (시작, 끝) 위치. 이진 탐색이라 O(log n)"""
+        results = _ResultView(self)
+        start = bisect.bisect_left(results, (result_num, result_den))
+        return start, bisect.bisect_right(results, (result_num, result_den), start)
+
+    def by_result(self, result_num, result_den=1):
+        """결과값이 같은 문제 목록"""
+        return [self[i] for i in range(*self.result_span(result_num, result_den))]
+
+    def choice(self, rng=random):
+        """문제 하나를 고릅니다."""
+        return self[rng.randrange(self.header.count)]
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _ResultView:
+    """bisect가 레코드의 결과값만 읽도록 하는 시퀀스"""
+
+    def __init__(self, bank):
+        self.bank = bank
+
+    def __len__(self):
+        return len(self.bank)
+
+    def __getitem__(self, index):
+        return self.bank._result_at(index)
+
+
+def open_bank(path, verify=True):
+    """문제 은행 파일을 읽기 전용 메모리 맵으로 엽니다. verify면 레코드 CRC32를 확인합니다."""
+    return ProblemBank(path, verify)
@@ -0,0 +1,223 @@
+"""NumPy로 문제를 한꺼번에 만들기 (학습지 대량 출력용)
+
+generate_problem과 같은 방법으로 문제를 만들되, 후보 N개의 피연산자를 배열로 한 번에 뽑고
+기약분수·나누어짐·분모가 서로 다름 같은 조건을 마스크로 걸러 냅니다.
+조건을 통과한 후보만 남기고 모자란 만큼 다시 뽑으므로, 결과의 분포는 문제를 하나씩
+만드는 generate_problem과 같습니다.
+
+numpy를 불러오는 데 시간이 걸리므로 elemath 패키지를 import할 때는 불러오지 않습니다.
+필요한 곳에서 `from elemath.batch import generate_batch`로 씁니다.
+NumPy 구성 함수가 없는 다른 문제 종류(elemath.registry)는 범위 안의 문제 목록에서 한꺼번에 고릅니다.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+
+from elemath.problems import Problem, _divisors, fallback_problem, problem_space
+from elemath.rational import as_pair, compare
+from elemath.registry import get_problem_type
+
+
+class ProblemBatch(NamedTuple):
+    """문제 여러 개를 열(column)별 배열로 담은 묶음
+    Problem과 필드 이름이 같고, batch['result_num']처럼 이름으로도 열을 꺼낼 수 있습니다.
+    """
+    numerator1: np.ndarray
+    denominator1: np.ndarray
+    numerator2: np.ndarray
+    denominator2: np.ndarray
+    result_num: np.ndarray
+    result_den: np.ndarray
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    @property
+    def size(self):
+        """문제 수"""
+        return len(self.numerator1)
+
+    def problem(self, i):
+        """i번째 문제를 Problem으로"""
+        return Problem(*(int(column[i]) for column in self))
+
+    def to_problems(self):
+        """모든 문제를 Problem 목록으로"""
+        return [Problem(*row) for row in zip(*(column.tolist() for column in self))]
+
+
+@lru_cache(maxsize=None)
+def _divisor_table(limit):
+    """0..limit 각 수의 1보다 큰 약수를 담은 표 (약수 개수, 약수 배열)"""
+    divisors = [_divisors(n) if n > 0 else [] for n in range(limit + 1)]
+    counts = np.array([len(d) for d in divisors], dtype=np.int64)
+    table = np.zeros((limit + 1, max(1, counts.max())), dtype=np.int64)
+    for n, d in enumerate(divisors):
+        table[n, :len(d)] = d
+    return counts, table
+
+
+def _pick_divisor(values, limit, rng):
+    """values 각각의 1보다 큰 약수 중 하나를 고르게 고름 (약수가 없으면 0)"""
+    counts, table = _divisor_table(limit)
+    count = counts[values]
+    index = rng.integers(0, np.maximum(count, 1))
+    return np.where(count > 0, table[values, index], 0)
+
+
+def _randint(low, high, rng):
+    """low~high (양 끝 포함) 정수를 원소별로 뽑음. high < low인 자리는 low를 돌려줌"""
+    return rng.integers(low, np.maximum(high, low), endpoint=True)
+
+
+def _construct_divisible(n, num_range, den_range, result_range, rng):
+    """단계 1 후보 n개 (problems._construct_divisible의 배열판). (피연산자 네 열, 통과 마스크)"""
+    min_num, max_num = num_range
+    min_den, max_den = den_range
+    quotient = rng.integers(result_range[0], result_range[1], size=n, endpoint=True)
+    m = _pick_divisor(quotient, result_range[1], rng)  # 분모의 배수
+    ok = m > 0
+    m = np.maximum(m, 1)
+    k = quotient // m  # 분자의 배수
+    ok &= (max_den // m >= min_den) & (max_num // np.maximum(k, 1) >= min_num)
+    denominator1 = _randint(min_den, max_den // m, rng)
+    denominator2 = denominator1 * m
+    numerator2 = _randint(min_num, max_num // np.maximum(k, 1), rng)
+    numerator1 = numerator2 * k
+    # 두 분수 모두 기약분수여야 함
+    ok &= (np.gcd(numerator1, denominator1) == 1) & (np.gcd(numerator2, denominator2) == 1)
+    return (numerator1, denominator1, numerator2, denominator2), ok
+
+
+def _construct_non_divisible(n, num_range, den_range, result_range, rng):
+    """단계 2 후보 n개 (problems._construct_non_divisible의 배열판). (피연산자 네 열, 통과 마스크)"""
+    # 절반은 결과값이 같은 d/c ÷ b/a로 뒤집으므로 분자와 분모의 범위를 바꿔서 만듦
+    swap = rng.random(n) < 0.5
+    min_num = np.where(swap, den_range[0], num_range[0])
+    max_num = np.where(swap, den_range[1], num_range[1])
+    min_den = np.where(swap, max(num_range[0], 2), den_range[0])
+    max_den = np.where(swap, num_range[1], den_range[1])
+    ok = max_den >= min_den
+    denominator2 = _randint(min_den, max_den, rng)
+    numerator2 = _randint(min_num, max_num, rng)
+    ok &= np.gcd(numerator2, denominator2) == 1
+    common = _pick_divisor(denominator2, max(num_range[1], den_range[1]), rng)  # 두 분모의 공약수
+    common = np.maximum(common, 1)
+    low = -(-min_den // common)
+    high = max_den // common
+    ok &= high >= low
+    denominator1 = common * _randint(low, high, rng)
+
+    # 결과값 a×d / (b×c)가 범위 안에 들도록 분자 a의 범위를 정함
+    min_a, max_a = min_num, max_num
+    if result_range is not None:
+        (low_num, low_den), (high_num, high_den) = as_pair(result_range[0]), as_pair(result_range[1])
+        scale = denominator1 * numerator2
+        min_a = np.maximum(min_a, -(-(low_num * scale) // (low_den * denominator2)))
+        max_a = np.minimum(max_a, (high_num * scale) // (high_den * denominator2))
+    ok &= max_a >= min_a
+    numerator1 = _randint(min_a, max_a, rng)
+    ok &= np.gcd(numerator1, denominator1) == 1
+    # 나누어 떨어지지 않는 경우인지 확인
+    ok &= numerator1 * denominator2 % (denominator1 * numerator2) != 0
+    # 두 분수의 분모가 서로 달라야 함 (뒤집은 경우에는 분자였던 수끼리 비교)
+    ok &= np.where(swap, numerator1 != numerator2, denominator1 != denominator2)
+    # 분모끼리(뒤집은 경우 분자끼리) 공약수 common이 있으므로 역수로 곱할 때 항상 약분됨
+    operands = (
+        np.where(swap, denominator2, numerator1),
+        np.where(swap, numerator2, denominator1),
+        np.where(swap, denominator1, numerator2),
+        np.where(swap, numerator1, denominator2),
+    )
+    return operands, ok
+
+
+def make_batch(numerator1, denominator1, numerator2, denominator2):
+    """피연산자 배열로 ProblemBatch를 만듭니다. 결과는 한꺼번에 기약분수로 약분합니다."""
+    top = numerator1 * denominator2
+    bottom = denominator1 * numerator2
+    common = np.gcd(top, bottom)
+    return ProblemBatch(numerator1, denominator1, numerator2, denominator2, top // common, bottom // common)
+
+
+# 문제 종류별 NumPy 구성 함수 (없는 종류는 문제 목록에서 고름)
+BATCH_CONSTRUCTS = {1: _construct_divisible, 2: _construct_non_divisible}
+
+# 한 번에 뽑는 후보 수의 상한 (통과율이 낮아도 배열 여섯 개가 수 MB를 넘지 않도록)
+MAX_CHUNK = 1 << 16
+
+
+def _division_reachable(numerator_range, denominator_range, result_range):
+    """a/b ÷ c/d = a×d / (b×c)가 result_range에 들 수 있는지 (분자·분모 범위의 끝값만 비교, O(1))
+    가장 작은 결과값은 (최소 분자 × 최소 분모) / (최대 분모 × 최대 분자), 가장 큰 결과값은 그 반대입니다.
+    """
+    if result_range is None:
+        return True
+    (min_num, max_num), (min_den, max_den) = numerator_range, denominator_range
+    low, high = as_pair(result_range[0]), as_pair(result_range[1])
+    return (compare(*low, max_num * max_den, min_den * min_num) <= 0
+            and compare(min_num * min_den, max_den * max_num, *high) <= 0)
+
+
+def _sample_problem_space(problem_type, n, numerator_range, denominator_range, result_range, rng):
+    """범위 안의 문제 목록에서 n개를 (중복 허용) 고름. 목록이 비어 있으면 최후의 수단 문제로 채움
+    (그것도 범위 밖이면 ValueError). 결과값은 그 종류의 make로 계산해 둔 값을 그대로 씁니다.
+    """
+    candidates = problem_space(problem_type.key, tuple(numerator_range), tuple(denominator_range), result_range)
+    if not candidates:
+        problem = fallback_problem(problem_type, numerator_range, denominator_range, result_range)
+        table = np.array([problem] * n, dtype=np.int64).reshape(n, 6)
+    else:
+        table = np.array(candidates, dtype=np.int64)[rng.integers(0, len(candidates), size=n)]
+    return ProblemBatch(*table.T)
+
+
+def generate_batch(stage, n, numerator_range=None, denominator_range=None, result_range=None, rng=None,
+                   max_tries=1000):
+    """단계 1 또는 단계 2(또는 등록한 다른 문제 종류) 문제 n개를 한꺼번에 만들어 ProblemBatch로 돌려줍니다.
+    범위를 주지 않으면 단계별 기본 범위를 쓰고, rng에는 np.random.Generator나 시드(정수)를 줄 수 있습니다.
+    generate_problem처럼 문제 하나당 max_tries번 안에 조건에 맞는 후보를 못 찾으면
+    남은 자리는 간단한 예시 문제로 채웁니다 (예시 문제도 범위 밖이면 ValueError).
+    후보는 MAX_CHUNK개씩 나눠 뽑습니다. 분자·분모 범위로 나올 수 있는 결과값이 result_range에 닿지 않거나,
+    처음 max_tries개 후보 중 하나도 통과하지 못하면 더 뽑지 않고 바로 최후의 수단으로 넘어갑니다.
+    """
+    rng = np.random.default_rng(rng)
+    problem_type = get_problem_type(stage)
+    numerator_range = numerator_range or problem_type.numerator_range
+    denominator_range = denominator_range or problem_type.denominator_range
+    if result_range is None:
+        result_range = problem_type.result_range
+    construct = BATCH_CONSTRUCTS.get(stage)
+    if construct is None:
+        return _sample_problem_space(problem_type, n, numerator_range, denominator_range, result_range, rng)
+
+    if not _division_reachable(numerator_range, denominator_range, result_range):
+        raise ValueError('no problem in range')
+
+    chunks = [[] for _ in range(4)]
+    found = 0
+    tries = 0
+    accept_rate = 0.5
+    while found < n and tries < max_tries * n:
+        # 지금까지의 통과율로 남은 개수를 채울 만큼 후보를 뽑음 (MAX_CHUNK개까지)
+        size = min(max(int((n - found) / accept_rate * 1.1) + 16, 1024), MAX_CHUNK, max_tries * n - tries)
+        operands, ok = construct(size, numerator_range, denominator_range, result_range, rng)
+        tries += size
+        passed = int(ok.sum())
+        accept_rate = max(passed / size, 1 / max_tries)
+        for chunk, column in zip(chunks, operands):
+            chunk.append(column[ok])
+        found += passed
+        if not found and tries >= max_tries:
+            # generate_problem처럼 첫 문제를 max_tries번 안에 못 찾으면 그만 뽑음
+            break
+
+    columns = [np.concatenate(chunk)[:n] if chunk else np.empty(0, dtype=np.int64) for chunk in chunks]
+    if found < n:
+        # 최후의 수단: 범위에 맞는 문제가 없을 때 간단한 예시로 채움
+        fallback = fallback_problem(problem_type, numerator_range, denominator_range, result_range).operands
+        columns = [np.concatenate([column, np.full(n - len(column), value)]) for column, value in zip(columns, fallback)]
+    return make_batch(*(column.astype(np.int64) for column in columns))
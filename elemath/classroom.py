@@ -0,0 +1,84 @@
+"""반 코드로 같은 문제 나눠 주기
+
+선생님이 정한 반 코드(예: '3-2')를 넣은 학생들은 모두 같은 문제를 풉니다.
+반 코드로 시드를 정한 random.Random으로 문제 세트를 만들고, 프로세스 전체가 함께 쓰는
+캐시에 CLASS_TTL_SECONDS 동안 (최대 MAX_CLASS_SETS개) 둡니다. 그래서 한 반 30명이 접속해도
+세트는 한 번만 만들고 나머지 학생은 캐시에서 꺼내 쓰기만 합니다. 캐시에서 지워진 뒤에 다시 만들어도 시드가 같으므로
+같은 문제가 나옵니다.
+
+세트는 여러 세션이 함께 보므로 리스트 대신 튜플로 돌려줍니다.
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from elemath.metrics import count
+from elemath.problems import generate_non_divisible_problem, make_practice_problems, make_stage1_problems
+
+# 반 세트를 캐시에 두는 시간 (하루 수업 시간)과 최대 개수 (넘치면 오래된 것부터 지움)
+CLASS_TTL_SECONDS = 8 * 60 * 60
+MAX_CLASS_SETS = 10_000
+
+_lock = threading.Lock()
+_cache = OrderedDict()  # 키 -> (만료 시각, 세트). 만료 시간이 같으므로 넣은 순서가 곧 만료 순서
+_building = {}  # 지금 만들고 있는 키 -> 다 만들면 알리는 threading.Event
+
+
+def normalize_code(code):
+    """앞뒤 공백과 대소문자 차이를 없앤 반 코드 (빈 문자열이면 반 모드가 아님)"""
+    return code.strip().upper()
+
+
+def _cached(key, build):
+    """키의 세트를 캐시에서 꺼내고, 없으면 만들어 넣습니다.
+    세트는 전체 잠금 밖에서 만들고, 같은 키를 동시에 만들려는 다른 스레드는 다 만들 때까지 기다립니다.
+    """
+    while True:
+        now = time.monotonic()
+        with _lock:
+            # 가장 오래된 것부터 만료된 세트를 지움
+            while _cache and next(iter(_cache.values()))[0] <= now:
+                _cache.popitem(last=False)
+            entry = _cache.get(key)
+            if entry is not None:
+                count('classroom_hits')
+                return entry[1]
+            building = _building.get(key)
+            if building is None:
+                building = _building[key] = threading.Event()
+                break
+        building.wait()
+
+    try:
+        count('classroom_builds')
+        value = build(random.Random(':'.join(map(str, key))))
+        with _lock:
+            _cache[key] = (time.monotonic() + CLASS_TTL_SECONDS, value)
+            while len(_cache) > MAX_CLASS_SETS:
+                _cache.popitem(last=False)
+    finally:
+        with _lock:
+            del _building[key]
+        building.set()
+    return value
+
+
+def class_stage1_set(code):
+    """반 전체가 푸는 단계 1 세 문제"""
+    return _cached((normalize_code(code), 'stage1'), lambda rng: tuple(make_stage1_problems(3, rng=rng)))
+
+
+def class_stage2_set(code, round_number=0):
+    """반 전체가 보는 단계 2 (예시 문제, 연습 문제 세 개).
+    round_number는 '추가 연습하기'를 누른 횟수로, 같은 횟수째에는 반 전체가 같은 세트를 받습니다.
+    """
+    def build(rng):
+        example = generate_non_divisible_problem(rng=rng)
+        return example, tuple(make_practice_problems(example, 3, rng=rng))
+    return _cached((normalize_code(code), 'stage2', round_number), build)
+
+
+def clear_classroom_cache():
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,170 @@
+"""학습지 내보내기 (CSV / LaTeX / PDF)
+
+문제 M개짜리 학습지 K장을 만들어 문제지와 정답지(정답 + 풀이)를 파일로 씁니다.
+- 학습지 한 장씩 만들고 바로 파일에 쓰므로, 5만 문제를 뽑아도 메모리 사용량이 늘지 않습니다.
+- 학습지마다 (시드, 학습지 번호)로 난수를 따로 만들므로, 프로세스 풀에 나눠 만들어도 같은 결과가 나옵니다.
+- 풀이는 페이지의 풀이 과정과 같은 solution_steps 값으로 씁니다.
+"""
+import csv
+import io
+import random
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from elemath.problems import generate_problem
+from elemath.steps import solution_steps
+
+FORMATS = ('csv', 'latex', 'pdf')
+
+# 한 번에 프로세스 풀에 맡겨 두는 학습지 수 (작업자 한 명당)
+PENDING_PER_WORKER = 4
+
+SHEET_FIELDS = ['worksheet', 'number', 'numerator1', 'denominator1', 'numerator2', 'denominator2', 'problem']
+ANSWER_FIELDS = ['worksheet', 'number', 'result_num', 'result_den', 'answer', 'solution']
+
+LATEX_PREAMBLE = r"""\documentclass[11pt,a4paper]{article}
+\usepackage{kotex}
+\usepackage{amsmath}
+\usepackage[margin=2cm]{geometry}
+\pagestyle{empty}
+\begin{document}
+"""
+LATEX_END = "\\end{document}\n"
+
+
+def worksheet_problems(stage, index, size, seed, ranges):
+    """index번 학습지의 문제 size개. ranges는 (분자, 분모, 결과값) 범위입니다."""
+    rng = random.Random(f'{seed}:{index}')
+    return [generate_problem(stage, *ranges, rng=rng) for _ in range(size)]
+
+
+def _text_frac(numerator, denominator):
+    return f'{numerator}/{denominator}' if denominator != 1 else f'{numerator}'
+
+
+def _latex_frac(numerator, denominator):
+    return f'\\frac{{{numerator}}}{{{denominator}}}' if denominator != 1 else f'{numerator}'
+
+
+def solution_chain(stage, problem, frac=_text_frac, div=' ÷ ', times=' × '):
+    """풀이를 등호로 이어지는 식 목록으로 (단계 1은 통분, 단계 2는 역수의 곱셈)"""
+    steps = solution_steps(stage, *problem.operands)
+    first = frac(problem.numerator1, problem.denominator1)
+    second = frac(problem.numerator2, problem.denominator2)
+    if stage == 1:
+        return [
+            first + div + second,
+            frac(steps.new_num1, steps.common_denom) + div + frac(steps.new_num2, steps.common_denom),
+            f'{steps.new_num1}{div}{steps.new_num2}',
+            f'{steps.quotient}',
+        ]
+    return [
+        first + div + second,
+        first + times + frac(steps.reciprocal_num, steps.reciprocal_den),
+        frac(steps.product_num, steps.product_den),
+        frac(steps.result_num, steps.result_den),
+    ]
+
+
+def _csv_sheet(index, stage, problems):
+    sheet, answers = io.StringIO(), io.StringIO()
+    sheet_writer, answer_writer = csv.writer(sheet), csv.writer(answers)
+    for number, p in enumerate(problems, 1):
+        chain = solution_chain(stage, p)
+        sheet_writer.writerow([index, number, *p.operands, chain[0]])
+        answer_writer.writerow([index, number, p.result_num, p.result_den, chain[-1], ' = '.join(chain)])
+    return sheet.getvalue(), answers.getvalue()
+
+
+def _latex_sheet(index, stage, problems):
+    sheet = [f'\\section*{{학습지 {index}}}\n', '\\begin{enumerate}\n']
+    answers = [f'\\section*{{학습지 {index} 정답}}\n', '\\begin{enumerate}\n']
+    for p in problems:
+        chain = solution_chain(stage, p, frac=_latex_frac, div=' \\div ', times=' \\times ')
+        sheet.append(f'  \\item ${chain[0]} = \\underline{{\\hspace{{4em}}}}$\n')
+        answers.append(f"  \\item ${' = '.join(chain)}$\n")
+    end = '\\end{enumerate}\n\\newpage\n'
+    return ''.join(sheet) + end, ''.join(answers) + end
+
+
+def render_sheet(job):
+    """학습지 한 장을 (문제지 조각, 정답지 조각) 문자열로 만듭니다. 프로세스 풀에서도 부릅니다."""
+    fmt, stage, index, size, seed, ranges = job
+    problems = worksheet_problems(stage, index, size, seed, ranges)
+    if fmt == 'csv':
+        return _csv_sheet(index, stage, problems)
+    return _latex_sheet(index, stage, problems)
+
+
+def _rendered_sheets(jobs, workers):
+    """학습지 순서대로 렌더링 결과를 내놓습니다.
+    프로세스 풀을 쓸 때도 맡겨 둔 작업을 작업자 수 × PENDING_PER_WORKER개로 제한해 메모리를 묶어 둡니다.
+    """
+    if workers <= 1:
+        yield from map(render_sheet, jobs)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        for job in jobs:
+            pending.append(pool.submit(render_sheet, job))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _latex_engine():
+    engine = shutil.which('xelatex') or shutil.which('pdflatex')
+    if engine is None:
+        raise RuntimeError('PDF를 만들려면 xelatex 또는 pdflatex가 필요합니다')
+    return engine
+
+
+def compile_pdf(tex_path):
+    """LaTeX 파일을 PDF로 만듭니다 (xelatex 또는 pdflatex 필요)."""
+    engine = _latex_engine()
+    tex_path = Path(tex_path)
+    subprocess.run(
+        [engine, '-interaction=batchmode', '-halt-on-error', tex_path.name],
+        cwd=tex_path.parent, check=True, stdout=subprocess.DEVNULL,
+    )
+    return tex_path.with_suffix('.pdf')
+
+
+def export_worksheets(out_dir, stage, sheets, size, ranges, fmt='csv', seed=0, workers=0, name='worksheets'):
+    """학습지 sheets장(장마다 size문제)과 정답지를 out_dir에 씁니다. 쓴 파일 경로 목록을 돌려줍니다.
+    fmt는 'csv', 'latex', 'pdf' 중 하나이고, workers가 2 이상이면 그만큼의 프로세스에 나눠 만듭니다.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'지원하지 않는 형식입니다: {fmt}')
+    if fmt == 'pdf':
+        _latex_engine()  # 학습지를 다 만든 뒤에 실패하지 않도록 미리 확인
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = '.csv' if fmt == 'csv' else '.tex'
+    sheet_path = out_dir / f'{name}{suffix}'
+    answer_path = out_dir / f'{name}_answers{suffix}'
+    render_fmt = 'csv' if fmt == 'csv' else 'latex'
+    jobs = ((render_fmt, stage, index, size, seed, ranges) for index in range(1, sheets + 1))
+
+    with open(sheet_path, 'w', encoding='utf-8', newline='') as sheet_file, \
+            open(answer_path, 'w', encoding='utf-8', newline='') as answer_file:
+        if fmt == 'csv':
+            csv.writer(sheet_file).writerow(SHEET_FIELDS)
+            csv.writer(answer_file).writerow(ANSWER_FIELDS)
+        else:
+            sheet_file.write(LATEX_PREAMBLE)
+            answer_file.write(LATEX_PREAMBLE)
+        for sheet_chunk, answer_chunk in _rendered_sheets(jobs, workers):
+            sheet_file.write(sheet_chunk)
+            answer_file.write(answer_chunk)
+        if fmt != 'csv':
+            sheet_file.write(LATEX_END)
+            answer_file.write(LATEX_END)
+
+    if fmt == 'pdf':
+        return [compile_pdf(sheet_path), compile_pdf(answer_path)]
+    return [sheet_path, answer_path]
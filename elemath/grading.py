@@ -0,0 +1,79 @@
+"""답 채점
+
+답 하나(check_answer)와 학습지 제출 결과 여러 줄(grade_batch)을 같은 비교식으로 채점합니다.
+Fraction을 만들지 않고 정수 곱셈(교차 곱)만으로 비교하므로, 정수를 넣으면 bool이,
+NumPy 배열을 넣으면 줄마다의 bool 배열이 나옵니다.
+"""
+from typing import NamedTuple
+
+from elemath.metrics import timed
+from elemath.registry import get_problem_type
+
+# 채점 결과 분류. grade_batch는 INVALID(분모가 0 이하)를 가장 먼저 판정하고,
+# 나머지는 CORRECT → UNREDUCED → SWAPPED → FORGOT_RECIPROCAL 순서로 판정해 어디에도 안 맞으면 WRONG
+CORRECT = 0            # 정답 (기약분수)
+UNREDUCED = 1          # 값은 같지만 약분하지 않음 (정답으로 인정)
+SWAPPED = 2            # 분자와 분모를 바꿔 씀
+FORGOT_RECIPROCAL = 3  # 역수로 바꾸지 않고 그대로 곱함 (a/b × c/d). 다른 문제 종류는 그 종류의 흔한 오답
+WRONG = 4              # 그 밖의 오답
+INVALID = 5            # 분모가 0 이하
+
+GRADE_LABELS = {
+    CORRECT: '정답',
+    UNREDUCED: '약분 안 함',
+    SWAPPED: '분자·분모 바뀜',
+    FORGOT_RECIPROCAL: '역수 안 씀',
+    WRONG: '오답',
+    INVALID: '잘못된 답',
+}
+
+
+class GradeResult(NamedTuple):
+    """grade_batch 결과: 줄마다 정답 여부(bool 배열)와 분류 코드(int8 배열)"""
+    correct: object
+    code: object
+
+
+def _compare(user_num, user_den, correct_num, correct_den):
+    """답과 정답을 교차 곱으로 비교합니다. 정수와 NumPy 배열 모두에 쓸 수 있습니다.
+    정답은 기약분수라고 가정하므로, 값이 같은 답은 분모까지 같을 때만 기약분수입니다.
+    (값이 같음, 기약분수임, 분자·분모가 바뀜)을 돌려줍니다.
+    """
+    equal = user_num * correct_den == correct_num * user_den
+    reduced = user_den == correct_den
+    swapped = user_num * correct_num == user_den * correct_den
+    return equal, reduced, swapped
+
+
+@timed('check_answer')
+def check_answer(user_num, user_den, correct_num, correct_den):
+    """사용자 답 검증 (약분하지 않은 답도 값이 같으면 정답)"""
+    if user_den <= 0:
+        return False
+    equal, _, _ = _compare(user_num, user_den, correct_num, correct_den)
+    return equal
+
+
+def grade_batch(user_num, user_den, correct_num, correct_den, operands=None, problem_type=2):
+    """제출한 답 여러 줄을 한꺼번에 채점합니다.
+    인자는 같은 길이의 정수 배열(또는 리스트)이고, operands에 문제의 피연산자 배열 네 개
+    (numerator1, denominator1, numerator2, denominator2)나 ProblemBatch를 주면
+    problem_type(문제 종류 키)의 흔한 오답도 가려냅니다 (분수의 나눗셈은 '역수 안 씀').
+    줄마다 Python 객체를 만들지 않고 배열 연산으로만 계산합니다.
+    """
+    import numpy as np
+
+    user_num, user_den, correct_num, correct_den = (
+        np.asarray(column, dtype=np.int64) for column in (user_num, user_den, correct_num, correct_den)
+    )
+    equal, reduced, swapped = _compare(user_num, user_den, correct_num, correct_den)
+    invalid = user_den <= 0
+    conditions = [invalid, equal & reduced, equal, swapped]
+    choices = [INVALID, CORRECT, UNREDUCED, SWAPPED]
+    mistake = get_problem_type(problem_type).mistake
+    if operands is not None and mistake is not None:
+        mistake_num, mistake_den = mistake(*(np.asarray(column, dtype=np.int64) for column in tuple(operands)[:4]))
+        conditions.append(user_num * mistake_den == user_den * mistake_num)
+        choices.append(FORGOT_RECIPROCAL)
+    code = np.select(conditions, choices, default=WRONG).astype(np.int8)
+    return GradeResult(code <= UNREDUCED, code)
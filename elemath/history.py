@@ -0,0 +1,171 @@
+"""문제 풀이 기록
+
+세션마다 끝없이 쌓이던 problem_history 리스트를 대신합니다.
+- 단계별 맞힌 수·시도 수와 결과값 분포는 기록할 때마다 바로 더해 둡니다 (O(1)).
+- 최근 기록만 고정 크기 링 버퍼(deque)에 남깁니다.
+- 저장소를 주면 링 버퍼에서 밀려난 기록을 JSONL 또는 SQLite 파일에 모아서 씁니다.
+그래서 학생이 오래 연습해도 세션 메모리가 늘어나지 않습니다.
+"""
+import os
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from typing import NamedTuple
+
+from elemath.metrics import observe_count
+from elemath.problems import Problem
+
+
+class HistoryEntry(NamedTuple):
+    """기록 한 건"""
+    stage: int
+    problem: Problem
+    correct: bool
+    answered_at: float  # time.time()
+
+
+class ProblemHistory:
+    """누적 통계 + 최근 기록 링 버퍼 + (선택) 디스크 저장소"""
+
+    def __init__(self, recent_size=20, store=None, session_id=None):
+        self.session_id = session_id or os.urandom(6).hex()
+        self.recent = deque(maxlen=recent_size)
+        self.correct = Counter()   # 단계별 맞힌 수
+        self.attempts = Counter()  # 단계별 제출 수
+        self.results = Counter()   # 맞힌 문제의 결과값 (result_num, result_den) 분포
+        self.total = 0
+        self.runs = 0        # 마지막으로 맞힌 뒤 페이지 스크립트가 실행된 횟수 (답 입력 영역만 실행한 것 포함)
+        self.page_run = False  # 지금 실행이 전체 실행이고 답 입력 영역이 아직 실행되지 않았는지
+        self.solve_runs = 0  # 맞힌 문제마다 든 실행 횟수의 합
+        self.store = store
+
+    def record(self, stage, problem, correct):
+        """답 제출 한 번을 기록합니다."""
+        self.total += 1
+        self.attempts[stage] += 1
+        if correct:
+            self.correct[stage] += 1
+            self.solve_runs += self.runs
+            observe_count('runs_per_solve', self.runs)
+            self.runs = 0
+            self.results[(problem.result_num, problem.result_den)] += 1
+        # 링 버퍼가 가득 찼으면 가장 오래된 기록을 저장소로 내보냄
+        if self.store is not None and len(self.recent) == self.recent.maxlen:
+            self.store.append(self.session_id, self.recent[0])
+        self.recent.append(HistoryEntry(stage, problem, correct, time.time()))
+
+    def note_run(self, fragment=False):
+        """페이지 스크립트가 한 번 실행될 때마다, 그리고 답 입력 영역(@st.fragment)이 실행될 때마다
+        fragment=True로 호출합니다. 전체 실행 안에서 답 입력 영역이 함께 실행되면 한 번으로 셉니다.
+        """
+        if fragment and self.page_run:
+            self.page_run = False
+            return
+        self.page_run = not fragment
+        self.runs += 1
+
+    def runs_per_solve(self):
+        """문제 하나를 맞힐 때까지 평균 몇 번 실행됐는지 (맞힌 문제가 없으면 None)
+        답을 입력하느라 생긴 실행도, 답 입력 영역만 다시 실행한 것도 포함됩니다.
+        프로세스 전체의 분포는 metrics의 runs_per_solve 횟수 분포('성능 지표' 페이지)로 봅니다.
+        """
+        solved = sum(self.correct.values())
+        if not solved:
+            return None
+        return self.solve_runs / solved
+
+    def accuracy(self, stage):
+        """단계별 정답률 (제출이 없으면 None)"""
+        if not self.attempts[stage]:
+            return None
+        return self.correct[stage] / self.attempts[stage]
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        """최근 기록 (오래된 것부터)"""
+        return iter(self.recent)
+
+
+def _entry_row(session_id, entry):
+    return (session_id, entry.stage, *entry.problem.operands, int(entry.correct), entry.answered_at)
+
+
+class _BatchedStore:
+    """기록을 batch_size개씩 모아서 쓰는 저장소의 공통 부분.
+    같은 파일을 여러 세션이 함께 쓰므로 경로별 잠금으로 쓰기를 보호하고,
+    저장소가 사라질 때(세션 종료) 남은 기록도 마저 씁니다.
+    """
+    _locks = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, path, batch_size=50):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self._buffer = []
+        with self._locks_guard:
+            self._lock = self._locks.setdefault(self.path, threading.Lock())
+        self._finalizer = weakref.finalize(self, self._flush_rows, self.path, self._lock, self._buffer)
+
+    def append(self, session_id, entry):
+        self._buffer.append(_entry_row(session_id, entry))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self._flush_rows(self.path, self._lock, self._buffer)
+
+    def close(self):
+        self._finalizer()
+
+    @classmethod
+    def _flush_rows(cls, path, lock, buffer):
+        if not buffer:
+            return
+        rows = buffer[:]
+        buffer.clear()
+        with lock:
+            cls._write(path, rows)
+
+
+class JsonlHistoryStore(_BatchedStore):
+    """한 줄에 기록 하나씩 JSON으로 덧붙이는 저장소"""
+
+    FIELDS = ('session', 'stage', 'numerator1', 'denominator1', 'numerator2', 'denominator2',
+              'correct', 'answered_at')
+
+    @classmethod
+    def _write(cls, path, rows):
+        import json  # 저장소를 쓸 때만 필요하므로 엔진 임포트 시간에서 뺌
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(dict(zip(cls.FIELDS, row))) + '\n' for row in rows)
+
+
+class SqliteHistoryStore(_BatchedStore):
+    """SQLite history 테이블에 덧붙이는 저장소"""
+
+    @classmethod
+    def _write(cls, path, rows):
+        import sqlite3  # 저장소를 쓸 때만 필요하므로 엔진 임포트 시간에서 뺌
+
+        conn = sqlite3.connect(path)
+        try:
+            with conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS history ('
+                    'session TEXT, stage INTEGER, numerator1 INTEGER, denominator1 INTEGER, '
+                    'numerator2 INTEGER, denominator2 INTEGER, correct INTEGER, answered_at REAL)'
+                )
+                conn.executemany('INSERT INTO history VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        finally:
+            conn.close()
+
+
+def open_history_store(path, batch_size=50):
+    """확장자에 따라 저장소를 엽니다 (.sqlite/.sqlite3/.db는 SQLite, 나머지는 JSONL)."""
+    if str(path).endswith(('.sqlite', '.sqlite3', '.db')):
+        return SqliteHistoryStore(path, batch_size)
+    return JsonlHistoryStore(path, batch_size)
@@ -0,0 +1,184 @@
+"""실행 시간·횟수 측정
+
+문제 생성, 연습 문제 세트 만들기, 채점, 페이지의 각 영역(개념 설명, 문제, 힌트, 피드백)이
+얼마나 자주, 얼마나 오래 걸리는지 프로세스 전체에서 하나의 저장소에 모읍니다.
+
+- ELEMATH_METRICS 환경 변수가 비어 있거나 0이면 꺼져 있습니다. 이때 timed는 함수를
+  그대로 돌려주므로 감싼 함수에 추가 비용이 전혀 없습니다. (import 할 때 한 번 정해짐)
+- 시간이 아닌 값의 분포(예: 문제 하나를 맞힐 때까지 페이지가 실행된 횟수)는 observe_count로 모읍니다.
+- 값은 '성능 지표' 페이지에서 볼 수 있고, prometheus_text()로 Prometheus 텍스트 형식으로 내보냅니다.
+- ELEMATH_METRICS_FILE에 파일 경로를 주면 ELEMATH_METRICS_INTERVAL초(기본 15초)마다
+  그 파일을 새로 씁니다. (node_exporter textfile 수집기 등이 읽어 가도록)
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+ENABLED = os.environ.get('ELEMATH_METRICS', '') not in ('', '0')
+
+# 모든 지표 이름 앞에 붙는 접두사
+PREFIX = 'elemath_'
+
+# 시간 분포 구간 경계 (초). 문제 하나 만들기(수십 µs)부터 느린 화면 그리기(1초)까지
+BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+# 횟수 분포 구간 경계. 문제 하나를 맞힐 때까지의 실행 횟수처럼 작은 자연수
+COUNT_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_distributions = {}
+
+
+class Histogram:
+    """값 분포: 구간별 누적 전 개수, 합계, 최댓값 (기본은 초 단위 시간 분포)"""
+
+    def __init__(self, bounds=BUCKETS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # 마지막 칸은 마지막 경계 초과
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """구간 경계로 어림한 분위수. 마지막 구간이면 최댓값"""
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.buckets):
+            seen += n
+            if seen >= rank and seen:
+                return min(bound, self.max)
+        return self.max
+
+
+def observe(name, seconds):
+    """name 시간 분포에 측정값 하나를 더합니다."""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+
+def observe_count(name, value):
+    """name 횟수 분포(COUNT_BUCKETS)에 값 하나를 더합니다. 꺼져 있으면 아무것도 하지 않습니다."""
+    if not ENABLED:
+        return
+    with _lock:
+        histogram = _distributions.get(name)
+        if histogram is None:
+            histogram = _distributions[name] = Histogram(COUNT_BUCKETS)
+        histogram.observe(value)
+
+
+def count(name, amount=1):
+    """name 횟수를 늘립니다. 꺼져 있으면 아무것도 하지 않습니다."""
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def timed(name):
+    """함수 실행 시간을 name 시간 분포에 기록하는 데코레이터 (꺼져 있으면 함수를 그대로 돌려줌)"""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def _summary(histogram):
+    return {
+        'count': histogram.count, 'sum': histogram.sum, 'max': histogram.max,
+        'p50': histogram.quantile(0.5), 'p99': histogram.quantile(0.99),
+    }
+
+
+def snapshot():
+    """지금까지의 값: {'counters': {이름: 횟수}, 'timings': {이름: {count, sum, max, p50, p99}},
+    'distributions': {이름: {count, sum, max, p50, p99}}}
+    """
+    with _lock:
+        counters = dict(_counters)
+        timings = {name: _summary(h) for name, h in _histograms.items()}
+        distributions = {name: _summary(h) for name, h in _distributions.items()}
+    return {'counters': counters, 'timings': timings, 'distributions': distributions}
+
+
+def reset():
+    """모든 값을 지웁니다."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _distributions.clear()
+
+
+def prometheus_text():
+    """Prometheus 텍스트 형식 (횟수는 counter, 시간 분포는 초 단위 histogram, 횟수 분포는 단위 없는 histogram)"""
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted(
+            [(f'{name}_seconds', h.bounds, list(h.buckets), h.count, h.sum) for name, h in _histograms.items()]
+            + [(name, h.bounds, list(h.buckets), h.count, h.sum) for name, h in _distributions.items()]
+        )
+    lines = []
+    for name, value in counters:
+        metric = f'{PREFIX}{name}_total'
+        lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+    for name, bounds, buckets, total, value_sum in histograms:
+        metric = f'{PREFIX}{name}'
+        lines.append(f'# TYPE {metric} histogram')
+        cumulative = 0
+        for bound, n in zip(bounds, buckets):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines += [
+            f'{metric}_bucket{{le="+Inf"}} {total}',
+            f'{metric}_sum {value_sum}',
+            f'{metric}_count {total}',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(path):
+    """Prometheus 텍스트를 path에 씁니다. 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일을 바꿔 넣습니다."""
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(temp_path, path)
+
+
+def _export_loop(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            write_prometheus(path)
+        except OSError:
+            pass  # 다음 주기에 다시 시도
+
+
+if ENABLED and os.environ.get('ELEMATH_METRICS_FILE'):
+    threading.Thread(
+        target=_export_loop,
+        args=(os.environ['ELEMATH_METRICS_FILE'], float(os.environ.get('ELEMATH_METRICS_INTERVAL', '15'))),
+        name='elemath-metrics-export',
+        daemon=True,
+    ).start()
@@ -0,0 +1,105 @@
+"""다음 문제 세트 미리 만들기
+
+학생이 지금 세트를 푸는 동안 다음 세트(단계 1의 세 문제, 단계 2의 예시 문제와 연습 문제)를
+프로세스 전체가 함께 쓰는 스레드 풀에서 미리 만들어 둡니다. '추가 연습하기'나
+'처음부터 다시 하기'를 누르면 만들어 둔 세트를 바로 꺼내 쓰므로 화면이 멈추지 않습니다.
+
+- 세션마다 Prefetcher를 두고, 미리 만들어 두는 세트 수는 depth개로 제한합니다.
+- 세션이 끝나 Prefetcher가 사라지면(세션 상태가 지워지면) 아직 시작하지 않은 작업을 취소합니다.
+- key를 주면 세트를 맡길 때의 key() 값(학생의 난이도 구간 등)으로 세트를 만들고, 꺼낼 때 key() 값이
+  바뀌었으면 미리 만든 세트를 버리고 지금 값으로 다시 만듭니다.
+"""
+import threading
+import weakref
+from collections import deque
+
+from elemath.adaptive import level_set
+from elemath.metrics import count
+from elemath.problems import generate_non_divisible_problem, make_practice_problems, make_stage1_problems
+
+# 모든 세션이 함께 쓰는 작업 스레드 수 (문제 세트 하나는 수십 µs라 적어도 충분함)
+PREFETCH_WORKERS = 2
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    """프로세스 전체가 함께 쓰는 스레드 풀 (처음 쓸 때 만듦)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _executor = ThreadPoolExecutor(PREFETCH_WORKERS, thread_name_prefix='elemath-prefetch')
+        return _executor
+
+
+def _cancel_pending(pending):
+    for _, future in pending:
+        future.cancel()
+    pending.clear()
+
+
+def stage1_set(level=None):
+    """단계 1에서 풀 세 문제. level(난이도 구간 번호)을 주면 그 구간에서 결과값이 서로 다르게 고름"""
+    if level is None:
+        return make_stage1_problems(3)
+    return level_set(1, level, 3)
+
+
+def stage2_set(level=None):
+    """단계 2의 (예시 문제, 예시와 겹치지 않는 연습 문제 세 개). level을 주면 연습 문제를 그 구간에서 고름"""
+    example = generate_non_divisible_problem()
+    if level is None:
+        return example, make_practice_problems(example, 3)
+    return example, level_set(2, level, 3, exclude=(example,))
+
+
+class Prefetcher:
+    """build()의 결과를 depth개까지 미리 만들어 두고 take()로 하나씩 꺼냅니다.
+    key를 주면 build(key())로 만들고, 꺼낼 때 key()가 달라졌으면 그 세트는 버립니다.
+    """
+
+    def __init__(self, build, depth=1, key=None):
+        self.build = build
+        self.depth = depth
+        self.key = key
+        self.pending = deque()  # (build에 넘긴 인자, future)
+        # 세션 상태와 함께 이 객체가 사라지면 대기 중인 작업을 취소 (self를 붙잡지 않도록 deque만 넘김)
+        self._finalizer = weakref.finalize(self, _cancel_pending, self.pending)
+        self.fill()
+
+    def fill(self):
+        """미리 만든(또는 만드는 중인) 세트가 depth개가 되도록 작업을 맡깁니다."""
+        args = self._args()
+        while len(self.pending) < self.depth:
+            self.pending.append((args, _shared_executor().submit(self.build, *args)))
+
+    def _args(self):
+        return (self.key(),) if self.key is not None else ()
+
+    def take(self):
+        """다음 세트를 꺼내고, 빈자리에 새 작업을 맡깁니다.
+        아직 만드는 중이면 끝날 때까지 기다리고, 시작도 못 했으면 취소하고 여기서 바로 만듭니다.
+        """
+        args = self._args()
+        # 맡길 때와 key가 달라진 세트(학생의 난이도 구간이 바뀜 등)는 버림
+        while self.pending and self.pending[0][0] != args:
+            self.pending.popleft()[1].cancel()
+            count('prefetch_stale')
+        future = self.pending.popleft()[1] if self.pending else None
+        if future is not None and future.done():
+            count('prefetch_hits')
+            result = future.result()
+        elif future is not None and not future.cancel():
+            count('prefetch_waits')
+            result = future.result()
+        else:
+            count('prefetch_misses')
+            result = self.build(*args)
+        self.fill()
+        return result
+
+    def close(self):
+        """대기 중인 작업을 모두 취소합니다."""
+        self._finalizer()
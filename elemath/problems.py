@@ -0,0 +1,448 @@
+"""분수의 나눗셈 문제 생성
+
+단계 1(나누어지는 분수)과 단계 2(나누어지지 않는 분수) 문제를 만들고,
+미리 만들어 둔 문제 목록에서 연습 문제 세트를 고릅니다.
+두 단계는 문제 종류 1, 2로 등록되어 있고(elemath.registry), 문제 목록 만들기와 문제 생성은
+등록한 종류의 조건을 읽어 같은 코드로 처리합니다.
+
+ELEMATH_BANK_DIR 환경 변수에 폴더를 주면, 그 폴더의 문제 은행 파일(*.bank, elemath.bank) 가운데
+단계와 범위가 같은 파일이 있을 때 문제 목록을 새로 만들지 않고 그 파일을 메모리 맵으로 엽니다.
+"""
+import os
+import random
+from functools import lru_cache
+from math import gcd
+from pathlib import Path
+from typing import NamedTuple
+
+from elemath.metrics import count, timed
+from elemath.rational import as_pair, cross_cancel, divide, in_range, is_integer
+from elemath.registry import ProblemType, get_problem_type, register_problem_type
+from elemath.steps import common_denominator_steps, reciprocal_steps
+
+
+class Problem(NamedTuple):
+    """분수의 나눗셈 문제 한 개: numerator1/denominator1 ÷ numerator2/denominator2 = result_num/result_den
+    여섯 개의 작은 정수만 담는 불변 튜플이라 세션마다 저장해도 메모리를 적게 씁니다.
+    예전 딕셔너리처럼 problem['numerator1']으로도 읽을 수 있습니다.
+    """
+    numerator1: int
+    denominator1: int
+    numerator2: int
+    denominator2: int
+    result_num: int  # 기약분수로 나타낸 결과의 분자
+    result_den: int  # 기약분수로 나타낸 결과의 분모
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    @property
+    def operands(self):
+        """문제를 구분하는 피연산자 네 개 (numerator1, denominator1, numerator2, denominator2)"""
+        return tuple.__getitem__(self, slice(4))
+
+    @property
+    def result(self):
+        """결과를 Fraction으로 (필요할 때만 만듦)"""
+        from fractions import Fraction
+
+        return Fraction(self.result_num, self.result_den)
+
+
+def make_problem(numerator1, denominator1, numerator2, denominator2):
+    """두 분수로 문제를 만듭니다. 결과는 기약분수로 약분해 둡니다."""
+    return Problem(numerator1, denominator1, numerator2, denominator2,
+                   *divide(numerator1, denominator1, numerator2, denominator2))
+
+
+# 단계 1 문제 범위: 분자 1~11, 분모 2~20, 몫은 2~10의 자연수
+STAGE1_NUMERATOR_RANGE = (1, 11)
+STAGE1_DENOMINATOR_RANGE = (2, 20)
+STAGE1_RESULT_RANGE = (2, 10)
+
+
+# 단계 2 문제 범위: 분자 1~12, 분모 2~12 (결과값 범위 제한 없음)
+STAGE2_NUMERATOR_RANGE = (1, 12)
+STAGE2_DENOMINATOR_RANGE = (2, 12)
+STAGE2_RESULT_RANGE = None
+
+
+def _divisors(n):
+    """n의 1보다 큰 약수 목록"""
+    small = [i for i in range(2, int(n ** 0.5) + 1) if n % i == 0]
+    return small + [n // i for i in reversed(small) if i * i != n] + ([n] if n > 1 else [])
+
+
+def _construct_divisible(num_range, den_range, result_range, rng):
+    """단계 1 문제 한 개를 직접 만들어 봅니다 (조건이 안 맞으면 None).
+    a/b ÷ c/d가 자연수 q이고 두 분수가 기약분수이면 d = b×m, a = c×k, q = k×m 꼴이므로
+    몫 q와 그 약수 m을 먼저 고르고, 나누는 수 c/d를 정한 뒤 나누어지는 수 a/b를 구합니다.
+    """
+    min_num, max_num = num_range
+    min_den, max_den = den_range
+    quotient = rng.randint(*result_range)
+    divisors = _divisors(quotient)
+    if not divisors:
+        return None
+    m = rng.choice(divisors)  # 분모의 배수
+    k = quotient // m         # 분자의 배수
+    if max_den // m < min_den or max_num // k < min_num:
+        return None
+    denominator1 = rng.randint(min_den, max_den // m)
+    denominator2 = denominator1 * m
+    numerator2 = rng.randint(min_num, max_num // k)
+    numerator1 = numerator2 * k
+    # 두 분수 모두 기약분수여야 함
+    if gcd(numerator1, denominator1) != 1 or gcd(numerator2, denominator2) != 1:
+        return None
+    return numerator1, denominator1, numerator2, denominator2
+
+
+def _construct_non_divisible(num_range, den_range, result_range, rng):
+    """단계 2 문제 한 개를 직접 만들어 봅니다 (조건이 안 맞으면 None).
+    나누는 수 c/d와 두 분모의 공약수 g를 먼저 정해 분모끼리 약분이 되게 하고,
+    결과값 범위에 맞는 분자 a를 골라 나누어지는 수 a/b를 구합니다.
+    절반은 이렇게 만든 a/b ÷ c/d를 결과값이 같은 d/c ÷ b/a로 바꾸어 분자끼리 약분되는 문제를 만듭니다.
+    """
+    swap = rng.random() < 0.5
+    if swap:
+        # 뒤집으면 분자와 분모의 자리가 바뀌므로 범위도 바꿔서 만듦
+        num_range, den_range = den_range, (max(num_range[0], 2), num_range[1])
+    min_num, max_num = num_range
+    min_den, max_den = den_range
+    if max_den < min_den:
+        return None
+    denominator2 = rng.randint(min_den, max_den)
+    numerator2 = rng.randint(min_num, max_num)
+    if gcd(numerator2, denominator2) != 1:
+        return None
+    common = rng.choice(_divisors(denominator2))  # 두 분모의 공약수
+    low = -(-min_den // common)
+    if max_den // common < low:
+        return None
+    denominator1 = common * rng.randint(low, max_den // common)
+    
+    # 결과값 a×d / (b×c)가 범위 안에 들도록 분자 a의 범위를 정함
+    min_a, max_a = min_num, max_num
+    if result_range is not None:
+        (low_num, low_den), (high_num, high_den) = as_pair(result_range[0]), as_pair(result_range[1])
+        scale = denominator1 * numerator2
+        min_a = max(min_a, -(-(low_num * scale) // (low_den * denominator2)))
+        max_a = min(max_a, (high_num * scale) // (high_den * denominator2))
+    if max_a < min_a:
+        return None
+    numerator1 = rng.randint(min_a, max_a)
+    if gcd(numerator1, denominator1) != 1:
+        return None
+    # 나누어 떨어지지 않는 경우인지 확인
+    if numerator1 * denominator2 % (denominator1 * numerator2) == 0:
+        return None
+    
+    # 두 분수의 분모가 서로 달라야 함 (뒤집은 경우에는 분자였던 수끼리 비교)
+    if swap:
+        if numerator1 == numerator2:
+            return None
+        return denominator2, numerator2, denominator1, numerator1
+    if denominator1 == denominator2:
+        return None
+    return numerator1, denominator1, numerator2, denominator2
+
+
+def _accepts_divisible(numerator1, denominator1, numerator2, denominator2, result_range):
+    """나눗셈 결과가 result_range 안의 자연수인지 (a/b ÷ c/d = a×d / b×c)"""
+    top = numerator1 * denominator2
+    bottom = denominator1 * numerator2
+    return is_integer(top, bottom) and result_range[0] <= top // bottom <= result_range[1]
+
+
+def _accepts_non_divisible(numerator1, denominator1, numerator2, denominator2, result_range):
+    """나누어 떨어지지 않고, 역수로 곱할 때 분자끼리나 분모끼리 하나는 약분 가능하며, 결과값이 범위 안인지"""
+    top = numerator1 * denominator2
+    bottom = denominator1 * numerator2
+    if is_integer(top, bottom):
+        return False
+    if cross_cancel(numerator1, denominator1, denominator2, numerator2) == (1, 1):
+        return False
+    return in_range(top, bottom, result_range)
+
+
+def _division_mistake(numerator1, denominator1, numerator2, denominator2):
+    """역수로 바꾸지 않고 그대로 곱한 답 (a×c) / (b×d)"""
+    return numerator1 * numerator2, denominator1 * denominator2
+
+
+DIVISIBLE = register_problem_type(ProblemType(
+    key=1,
+    title='나누어지는 분수의 나눗셈',
+    numerator_range=STAGE1_NUMERATOR_RANGE,
+    denominator_range=STAGE1_DENOMINATOR_RANGE,
+    result_range=STAGE1_RESULT_RANGE,
+    make=make_problem,
+    accepts=_accepts_divisible,
+    steps=common_denominator_steps,
+    construct=_construct_divisible,
+    mistake=_division_mistake,
+    fallback=(1, 2, 1, 4),
+))
+
+NON_DIVISIBLE = register_problem_type(ProblemType(
+    key=2,
+    title='나누어지지 않는 분수의 나눗셈',
+    numerator_range=STAGE2_NUMERATOR_RANGE,
+    denominator_range=STAGE2_DENOMINATOR_RANGE,
+    result_range=STAGE2_RESULT_RANGE,
+    make=make_problem,
+    accepts=_accepts_non_divisible,
+    steps=reciprocal_steps,
+    construct=_construct_non_divisible,
+    mistake=_division_mistake,
+    fallback=(3, 4, 5, 6),
+))
+
+
+def iter_problem_space(stage, numerator_range=None, denominator_range=None, result_range=None):
+    """범위 안에서 문제 종류의 조건을 만족하는 모든 문제를 내놓습니다.
+    stage는 문제 종류 키이고, 범위를 주지 않으면 그 종류의 기본 범위를 씁니다.
+    피연산자의 꼴(기본은 분모가 서로 다른 기약분수 두 개)은 종류의 candidates로, 나머지는 accepts로 검사합니다.
+    """
+    problem_type = get_problem_type(stage)
+    numerator_range = numerator_range or problem_type.numerator_range
+    denominator_range = denominator_range or problem_type.denominator_range
+    if result_range is None:
+        result_range = problem_type.result_range
+    accepts, make = problem_type.accepts, problem_type.make
+    for operands in problem_type.candidates(numerator_range, denominator_range):
+        if accepts(*operands, result_range):
+            yield make(*operands)
+
+
+@lru_cache(maxsize=None)
+def _bank_files():
+    """ELEMATH_BANK_DIR 폴더의 문제 은행 {(단계, 분자 범위, 분모 범위, 결과값 범위): ProblemBank} (프로세스당 한 번 엶)
+    읽을 수 없거나 CRC가 맞지 않는 파일은 건너뛰고 bank_files_skipped로 셉니다.
+    """
+    directory = os.environ.get('ELEMATH_BANK_DIR')
+    if not directory:
+        return {}
+    from elemath.bank import open_bank
+
+    banks = {}
+    for path in sorted(Path(directory).glob('*.bank')):
+        try:
+            bank = open_bank(path)
+        except (OSError, ValueError):
+            count('bank_files_skipped')
+            continue
+        header = bank.header
+        banks[(header.stage, header.numerator_range, header.denominator_range, header.result_range)] = bank
+    return banks
+
+
+def _bank_for(stage, numerator_range=None, denominator_range=None, result_range=None):
+    """단계와 범위가 같은 문제 은행 파일 (결과값 순서의 문제 시퀀스). 없으면 None"""
+    problem_type = get_problem_type(stage)
+    numerator_range = tuple(numerator_range or problem_type.numerator_range)
+    denominator_range = tuple(denominator_range or problem_type.denominator_range)
+    if result_range is None:
+        result_range = problem_type.result_range
+    bank = _bank_files().get((stage, numerator_range, denominator_range,
+                              None if result_range is None else tuple(result_range)))
+    if bank is not None:
+        count('bank_file_loads')
+    return bank
+
+
+def _problem_list(stage, numerator_range=None, denominator_range=None, result_range=None):
+    """범위 안의 모든 문제: 맞는 문제 은행 파일이 있으면 그 파일, 없으면 iter_problem_space"""
+    bank = _bank_for(stage, numerator_range, denominator_range, result_range)
+    if bank is not None:
+        return bank
+    return iter_problem_space(stage, numerator_range, denominator_range, result_range)
+
+
+@lru_cache(maxsize=32)
+def problem_space(stage, numerator_range=None, denominator_range=None, result_range=None):
+    """범위 안의 모든 문제 시퀀스 (문제 종류와 범위마다 프로세스당 한 번 만듦)
+    맞는 문제 은행 파일이 있으면 메모리 맵으로 연 파일 자체를, 없으면 iter_problem_space의 결과 튜플을 돌려줍니다.
+    """
+    bank = _bank_for(stage, numerator_range, denominator_range, result_range)
+    if bank is not None:
+        return bank
+    return tuple(iter_problem_space(stage, numerator_range, denominator_range, result_range))
+
+
+def fallback_problem(problem_type, numerator_range, denominator_range, result_range):
+    """문제 종류의 최후의 수단 문제. 그 문제도 범위와 조건에 맞지 않으면 ValueError를 냅니다.
+    iter_problem_space와 같은 조건(종류의 well_formed와 accepts)을 검사합니다.
+    """
+    operands = problem_type.fallback
+    if not (problem_type.well_formed(operands, numerator_range, denominator_range)
+            and problem_type.accepts(*operands, result_range)):
+        raise ValueError('no problem in range')
+    return problem_type.make(*operands)
+
+
+@timed('generate_problem')
+def generate_problem(stage, numerator_range, denominator_range, result_range=None, rng=random, max_tries=1000,
+                     stats=None):
+    """분자·분모·결과값 범위를 정해 문제 한 개를 만듭니다.
+    범위 안에서 조건을 만족하는 문제를 바로 구성하므로, 분모가 1000까지 커져도
+    평균 몇 번의 시도 안에 끝납니다. 범위는 (최솟값, 최댓값) 튜플이고, 분모의 최솟값은 2 이상이어야 합니다.
+    단계 1의 result_range는 몫(자연수)의 범위, 단계 2는 결과값의 범위(None이면 제한 없음)입니다.
+    stage에는 등록한 다른 문제 종류의 키도 쓸 수 있고, 구성 함수(construct)가 없는 종류는
+    범위 안의 문제 목록(problem_space)에서 고릅니다.
+    max_tries번 안에 못 찾으면 최후의 수단 문제(fallback_problem)를 내놓고, 그것도 범위에 맞지 않으면 ValueError를 냅니다.
+    stats에 Counter를 주면 호출 수(calls), 시도 횟수(tries), 최후의 수단을 쓴 횟수(fallbacks)를 더합니다.
+    """
+    problem_type = get_problem_type(stage)
+    if result_range is None:
+        result_range = problem_type.result_range
+    if stats is not None:
+        stats['calls'] += 1
+    if problem_type.construct is None:
+        candidates = problem_space(stage, tuple(numerator_range), tuple(denominator_range), result_range)
+        if candidates:
+            if stats is not None:
+                stats['tries'] += 1
+            return rng.choice(candidates)
+    else:
+        for tries in range(1, max_tries + 1):
+            operands = problem_type.construct(numerator_range, denominator_range, result_range, rng)
+            if operands is not None:
+                if stats is not None:
+                    stats['tries'] += tries
+                return problem_type.make(*operands)
+    
+    # 최후의 수단: 범위에 맞는 문제가 없을 때 간단한 예시 반환 (예시도 범위 밖이면 ValueError)
+    if stats is not None:
+        stats['tries'] += max_tries
+    problem = fallback_problem(problem_type, numerator_range, denominator_range, result_range)
+    if stats is not None:
+        stats['fallbacks'] += 1
+    return problem
+
+
+def generate_divisible_problem(numerator_range=STAGE1_NUMERATOR_RANGE, denominator_range=STAGE1_DENOMINATOR_RANGE,
+                               result_range=STAGE1_RESULT_RANGE, rng=random, stats=None):
+    """나누어지는 분수 문제 생성 (단계 1)"""
+    return generate_problem(1, numerator_range, denominator_range, result_range, rng, stats=stats)
+
+
+def generate_non_divisible_problem(numerator_range=STAGE2_NUMERATOR_RANGE, denominator_range=STAGE2_DENOMINATOR_RANGE,
+                                   result_range=STAGE2_RESULT_RANGE, rng=random, stats=None):
+    """나누어지지 않는 분수 문제 생성 (단계 2)
+    역수로 곱셈할 때 약분이 가능하도록 생성합니다.
+    예: 3/4 ÷ 2/6 = 3/4 × 6/2 → 3과 6이 약분, 4와 2가 약분
+    """
+    return generate_problem(2, numerator_range, denominator_range, result_range, rng, stats=stats)
+
+
+def reduction_pattern(p):
+    """역수로 곱할 때의 약분 형태 (분자끼리 약분 가능, 분모끼리 약분 가능)
+    numerator1과 numerator2(역수의 분모), denominator1과 denominator2(역수의 분자)를 비교합니다.
+    """
+    cancel_num, cancel_den = cross_cancel(p.numerator1, p.denominator1, p.denominator2, p.numerator2)
+    return cancel_num > 1, cancel_den > 1
+
+
+@lru_cache(maxsize=None)
+def build_divisible_index():
+    """단계 1에서 나올 수 있는 모든 문제를 미리 만들어 둡니다 (프로세스당 한 번, 처음 호출할 때).
+    조건: 두 분수 모두 기약분수, 두 분모가 서로 다름, 나눗셈 결과가 자연수.
+    결과값별(by_result), 첫 번째 분모별(by_denominator)로도 찾을 수 있습니다.
+    """
+    problems = []
+    by_result = {}
+    by_denominator = {}
+    for p in _problem_list(1, STAGE1_NUMERATOR_RANGE, STAGE1_DENOMINATOR_RANGE, STAGE1_RESULT_RANGE):
+        problems.append(p)
+        by_result.setdefault(p.result_num, []).append(p)
+        by_denominator.setdefault(p.denominator1, []).append(p)
+    return {
+        'problems': problems,
+        'by_result': by_result,
+        'by_denominator': by_denominator,
+    }
+
+
+def pick_divisible_problem(result=None, denominator=None, rng=None):
+    """미리 만들어 둔 단계 1 문제 목록에서 바로 하나를 고릅니다.
+    result를 주면 그 몫이 나오는 문제, denominator를 주면 첫 번째 분모가 그 값인 문제를 고르고,
+    조건에 맞는 문제가 없으면 None을 반환합니다. rng를 주지 않으면 random 모듈의 전역 난수를 씁니다.
+    """
+    index = build_divisible_index()
+    if result is not None:
+        pool = index['by_result'].get(result, [])
+        if denominator is not None:
+            pool = [p for p in pool if p.denominator1 == denominator]
+    elif denominator is not None:
+        pool = index['by_denominator'].get(denominator, [])
+    else:
+        pool = index['problems']
+    if not pool:
+        return None
+    return (rng or random).choice(pool)
+
+
+@timed('make_stage1_problems')
+def make_stage1_problems(n=3, rng=random):
+    """단계 1에서 풀 서로 다른 문제 n개를 고릅니다.
+    단계 1의 몫은 2 이상이라 결과가 1인 문제가 없으므로, 문제 목록에서 중복 없이 고르게 뽑습니다.
+    """
+    return rng.sample(build_divisible_index()['problems'], n)
+
+
+@lru_cache(maxsize=None)
+def build_non_divisible_bank():
+    """단계 2에서 나올 수 있는 모든 문제를 미리 만들어 둡니다 (프로세스당 한 번, 처음 호출할 때).
+    조건: 두 분수 모두 기약분수, 두 분모가 서로 다름, 나눗셈 결과가 자연수가 아님,
+    역수로 곱할 때 약분이 가능함 (분자끼리 또는 분모끼리 공약수가 있음).
+    결과값별(by_result), 약분 형태별(by_pattern)로 묶어 둡니다.
+    약분 형태는 (분자끼리 약분 가능, 분모끼리 약분 가능) 튜플입니다.
+    """
+    problems = []
+    by_result = {}
+    by_pattern = {}
+    for p in _problem_list(2, STAGE2_NUMERATOR_RANGE, STAGE2_DENOMINATOR_RANGE, STAGE2_RESULT_RANGE):
+        problems.append(p)
+        by_result.setdefault((p.result_num, p.result_den), []).append(p)
+        by_pattern.setdefault(reduction_pattern(p), []).append(p)
+    return {
+        'problems': problems,
+        'by_result': by_result,
+        'by_pattern': by_pattern,
+        'result_keys': list(by_result),
+    }
+
+
+def pick_non_divisible_problem(pattern=None, rng=random):
+    """미리 만들어 둔 단계 2 문제 목록에서 바로 하나를 고릅니다.
+    pattern을 주면 그 약분 형태(reduction_pattern)의 문제 중에서 고릅니다.
+    pick_divisible_problem은 조건에 맞는 문제가 없으면 None을 돌려주지만, pattern은 정해진 값만 있으므로
+    목록에 없는 약분 형태(예: 둘 다 약분되지 않는 (False, False))를 주면 ValueError를 냅니다.
+    """
+    bank = build_non_divisible_bank()
+    if pattern is None:
+        return rng.choice(bank['problems'])
+    pool = bank['by_pattern'].get(tuple(pattern))
+    if not pool:
+        raise ValueError(f'알 수 없는 약분 형태입니다: {pattern!r}')
+    return rng.choice(pool)
+
+
+@timed('make_practice_problems')
+def make_practice_problems(example_problem, n=3, rng=random):
+    """예시 문제와 중복되지 않고 서로 다른 연습문제 n개 생성.
+    결과값 묶음을 한 번에 중복 없이 n개 뽑으므로 결과값도 모두 서로 다르고,
+    예시 문제와 결과값이 같은 묶음은 제외합니다.
+    """
+    bank = build_non_divisible_bank()
+    result_keys = bank['result_keys']
+    example_result = (example_problem.result_num, example_problem.result_den)
+    
+    # 예시 문제의 결과값이 뽑힐 수 있으니 하나 더 뽑고 빼기
+    chosen = rng.sample(result_keys, min(n + 1, len(result_keys)))
+    chosen = [key for key in chosen if key != example_result][:n]
+    return [rng.choice(bank['by_result'][key]) for key in chosen]
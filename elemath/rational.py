@@ -0,0 +1,67 @@
+"""정수 쌍 분수 계산
+
+분수를 (분자, 분모) 정수 두 개로 다루는 작은 함수 모음입니다. fractions.Fraction 객체를 만들지 않으므로
+문제를 만들 때마다 여러 번 부르는 곳(후보 검사, 결과 약분, 결과값 범위 비교)에서 씁니다.
+결과는 Fraction과 같습니다: 약분한 분수는 분모가 양수인 기약분수이고, 분모가 0이면 ZeroDivisionError를 냅니다.
+benchmarks/bench_rational.py가 피연산자 범위 전체에서 Fraction과 결과가 같은지 모두 확인합니다.
+
+나눗셈·곱셈의 결과는 약분해서 돌려주지만, 인자의 분모는 0이 아니라고 가정하고 따로 검사하지 않습니다.
+"""
+from math import gcd
+
+
+def reduce_fraction(numerator, denominator):
+    """기약분수 (분자, 분모). 분모는 항상 양수입니다. Fraction(numerator, denominator)와 같음"""
+    if denominator == 0:
+        raise ZeroDivisionError(f'분모가 0입니다: {numerator}/0')
+    common = gcd(numerator, denominator)
+    if denominator < 0:
+        common = -common
+    return numerator // common, denominator // common
+
+
+def divide(numerator1, denominator1, numerator2, denominator2):
+    """a/b ÷ c/d를 기약분수로. 나누는 수가 0이면 ZeroDivisionError"""
+    return reduce_fraction(numerator1 * denominator2, denominator1 * numerator2)
+
+
+def multiply(numerator1, denominator1, numerator2, denominator2):
+    """a/b × c/d를 기약분수로"""
+    return reduce_fraction(numerator1 * numerator2, denominator1 * denominator2)
+
+
+def compare(numerator1, denominator1, numerator2, denominator2):
+    """a/b와 c/d를 교차 곱으로 비교해 -1, 0, 1 (작음, 같음, 큼)"""
+    left = numerator1 * denominator2
+    right = numerator2 * denominator1
+    order = (left > right) - (left < right)
+    return -order if (denominator1 < 0) != (denominator2 < 0) else order
+
+
+def is_integer(numerator, denominator):
+    """분수가 정수인지 (나누어떨어지는지)"""
+    return numerator % denominator == 0
+
+
+def cross_cancel(numerator1, denominator1, numerator2, denominator2):
+    """a/b × c/d를 곱하기 전에 엇갈려 약분되는 수 (a와 d의 최대공약수, c와 b의 최대공약수)
+    두 분수가 기약분수이면 이 수로 나눈 뒤 곱한 결과가 바로 기약분수입니다.
+    a/b ÷ c/d는 a/b × d/c이므로 cross_cancel(a, b, d, c)가 (분자끼리, 분모끼리) 약분되는 수입니다.
+    """
+    return gcd(numerator1, denominator2), gcd(numerator2, denominator1)
+
+
+def as_pair(value):
+    """정수, Fraction, float를 (분자, 분모) 기약분수 쌍으로"""
+    try:
+        return value.numerator, value.denominator
+    except AttributeError:
+        return value.as_integer_ratio()
+
+
+def in_range(numerator, denominator, bounds):
+    """분수가 bounds = (최솟값, 최댓값) 안에 있는지 (양 끝 포함). bounds가 None이면 항상 True"""
+    if bounds is None:
+        return True
+    low, high = as_pair(bounds[0]), as_pair(bounds[1])
+    return compare(*low, numerator, denominator) <= 0 and compare(numerator, denominator, *high) <= 0
@@ -0,0 +1,88 @@
+"""문제 종류 등록
+
+문제 종류(예: 나누어지는 분수의 나눗셈)는 ProblemType 하나로 조건과 계산 방법을 한 번만 적고
+register_problem_type으로 등록합니다. 등록한 종류는 키로 다음 기능을 모두 씁니다.
+
+- problems.iter_problem_space / problem_space: 범위 안의 모든 문제 목록 (피연산자 꼴은 candidates, 조건은 accepts)
+- problems.generate_problem: 직접 구성하는 함수(construct)가 있으면 그것으로, 없으면 문제 목록에서 고름
+- batch.generate_batch: NumPy 구성 함수가 없는 종류는 문제 목록에서 한꺼번에 고름
+- steps.solution_steps: 풀이 중간값 LRU 캐시
+- grading.grade_batch: 그 종류의 흔한 오답(mistake) 가려내기
+- benchmarks/suite.py: 등록한 종류마다 생성 속도 측정
+
+기존 단계 1, 단계 2는 키 1, 2로 등록되어 있습니다 (elemath.problems).
+
+피연산자의 꼴(몇 개인지, 기약분수인지, 분모가 서로 다른지)도 종류마다 candidates와 well_formed로 선언합니다.
+주지 않으면 기약분수 두 개 a/b, c/d(분모가 서로 다름)를 씁니다. 대분수처럼 꼴이 다른 종류는
+그 꼴의 피연산자 튜플을 내놓는 함수를 주면 됩니다.
+"""
+from math import gcd
+from typing import NamedTuple
+
+
+def fraction_pairs(numerator_range, denominator_range):
+    """범위 안의 기약분수 두 개 a/b, c/d (분모가 서로 다름)를 (분모1, 분자1, 분모2, 분자2) 순서로 모두 내놓습니다.
+    분자·분모 범위 크기의 제곱에 비례하는 조합을 모두 확인하므로 범위가 작을 때만 씁니다.
+    """
+    min_num, max_num = numerator_range
+    min_den, max_den = denominator_range
+    for denominator1 in range(min_den, max_den + 1):
+        for numerator1 in range(min_num, max_num + 1):
+            if gcd(numerator1, denominator1) != 1:
+                continue
+            for denominator2 in range(min_den, max_den + 1):
+                if denominator2 == denominator1:
+                    continue
+                for numerator2 in range(min_num, max_num + 1):
+                    if gcd(numerator2, denominator2) == 1:
+                        yield numerator1, denominator1, numerator2, denominator2
+
+
+def is_fraction_pair(operands, numerator_range, denominator_range):
+    """피연산자 튜플 하나가 fraction_pairs가 내놓는 꼴인지"""
+    if len(operands) != 4:
+        return False
+    numerator1, denominator1, numerator2, denominator2 = operands
+    (min_num, max_num), (min_den, max_den) = numerator_range, denominator_range
+    return (min_num <= numerator1 <= max_num and min_num <= numerator2 <= max_num
+            and min_den <= denominator1 <= max_den and min_den <= denominator2 <= max_den
+            and denominator1 != denominator2
+            and gcd(numerator1, denominator1) == 1 and gcd(numerator2, denominator2) == 1)
+
+
+class ProblemType(NamedTuple):
+    """문제 종류 하나의 선언 (기본은 a/b ○ c/d 꼴). 아래 '피연산자'는 candidates가 내놓는 튜플입니다."""
+    key: object  # 등록 키 (기존 단계는 1, 2)
+    title: str
+    numerator_range: tuple  # 기본 분자 범위
+    denominator_range: tuple  # 기본 분모 범위
+    result_range: object  # 기본 결과값 범위 (None이면 제한 없음)
+    make: object  # (*피연산자) -> 결과를 기약분수로 계산한 문제
+    accepts: object  # (*피연산자, result_range) -> candidates가 내놓은 피연산자가 이 종류의 조건도 맞는지
+    steps: object  # (*피연산자) -> 풀이 중간값 NamedTuple
+    construct: object = None  # (분자 범위, 분모 범위, 결과값 범위, rng) -> 피연산자 또는 None
+    mistake: object = None  # (*피연산자) -> 흔한 오답의 (분자, 분모). 정수와 NumPy 배열 모두에 쓸 수 있어야 함
+    fallback: tuple = None  # 범위에 맞는 문제가 없을 때 내놓는 피연산자
+    candidates: object = fraction_pairs  # (분자 범위, 분모 범위) -> 이 종류의 꼴에 맞는 피연산자를 모두 내놓음
+    well_formed: object = is_fraction_pair  # (피연산자, 분자 범위, 분모 범위) -> 피연산자 하나가 그 꼴에 맞는지
+
+
+PROBLEM_TYPES = {}
+
+
+def register_problem_type(problem_type):
+    """문제 종류를 등록합니다. 이미 등록한 키면 ValueError를 냅니다.
+    문제 목록, 풀이, 렌더링 캐시가 키로 결과를 기억하므로 등록한 종류는 바꿔 넣지 않습니다.
+    """
+    if problem_type.key in PROBLEM_TYPES:
+        raise ValueError(f'이미 등록된 문제 종류입니다: {problem_type.key!r}')
+    PROBLEM_TYPES[problem_type.key] = problem_type
+    return problem_type
+
+
+def get_problem_type(key):
+    """등록한 문제 종류 (없으면 ValueError)"""
+    try:
+        return PROBLEM_TYPES[key]
+    except KeyError:
+        raise ValueError(f'등록되지 않은 문제 종류입니다: {key!r}') from None
@@ -0,0 +1,155 @@
+"""문제별 설명 블록 렌더링
+
+문제 제시, 힌트, 풀이 과정처럼 문제마다 달라지는 마크다운/HTML 문자열을 만듭니다.
+(단계, 블록 종류, 문제 튜플)마다 한 번만 만들고 프로세스 전체에서 공유하는 LRU 캐시에 두므로,
+같은 문제를 받은 학생이 여럿이어도 문자열을 만드는 비용은 문제당 한 번만 듭니다.
+페이지에서는 st.markdown(..., unsafe_allow_html=True)로 그대로 출력합니다.
+색상과 여백은 elemath.theme의 CSS 클래스로 지정하므로 페이지에서 스타일시트를 먼저 붙여야 합니다.
+"""
+from functools import lru_cache
+
+from elemath.problems import make_problem
+from elemath.steps import solution_steps
+
+# 캐시에 둘 블록 수 (문제 목록 전체 × 블록 종류 몇 개를 담는 크기)
+RENDER_CACHE_SIZE = 8192
+
+
+def _frac(numerator, denominator):
+    return f"\\frac{{{numerator}}}{{{denominator}}}"
+
+
+def _division(p):
+    return f"{_frac(p.numerator1, p.denominator1)} \\div {_frac(p.numerator2, p.denominator2)}"
+
+
+def _problem(p, steps):
+    return f"""### 문제
+
+다음 분수의 나눗셈을 계산하세요:
+
+$${_division(p)}$$"""
+
+
+def _stage1_hint(p, steps):
+    return f"""<div class='em-note em-sky'>
+    <p><strong><span class='em-hl em-h-sky'>통분</span>을 이용해서 풀어보세요!</strong></p>
+</div>
+
+**분모를 같게 만들어요 (<span class='em-hl em-h-lightblue'>통분</span>):**
+
+${_frac(p.numerator1, p.denominator1)}$ → ${_frac(steps.new_num1, steps.common_denom)}$
+
+${_frac(p.numerator2, p.denominator2)}$ → ${_frac(steps.new_num2, steps.common_denom)}$
+
+<p><strong>이제 분모가 같으니 <span class='em-hl em-h-lavender'>분자끼리만 나누면</span> 돼요:</strong></p>
+
+${_frac(steps.new_num1, steps.common_denom)} \\div {_frac(steps.new_num2, steps.common_denom)} = {steps.new_num1} \\div {steps.new_num2}$
+
+정답을 맞춘 후에 풀이 과정을 배워볼 수 있어요! 🎯"""
+
+
+def _stage2_hint(p, steps):
+    return f"""<div class='em-note em-lemon'>
+    <p><strong>분수의 나눗셈은 <span class='em-hl em-bold em-h-yellow'>역수</span>를 이용해요!</strong></p>
+    <ol>
+        <li>두 번째 분수를 뒤집어요 (<span class='em-hl em-h-yellow'>역수</span>)</li>
+        <li>나눗셈을 <span class='em-hl em-h-green'>곱셈</span>으로 바꿔요</li>
+        <li>분자끼리, 분모끼리 곱해요</li>
+        <li>약분해요</li>
+    </ol>
+</div>
+
+두 번째 분수: ${_frac(p.numerator2, p.denominator2)}$ → 역수: ${_frac(steps.reciprocal_num, steps.reciprocal_den)}$"""
+
+
+def _stage1_solution(p, steps):
+    return f"""<p class='em-lead'>
+    <strong><span class='em-hl em-h-sky'>통분</span>을 이용한 풀이:</strong>
+</p>
+
+<p><strong>1단계: <span class='em-hl em-h-lightblue'>통분하기</span></strong></p>
+
+분모 {p.denominator1}과 {p.denominator2}의 <span class='em-hl em-h-lavender'>최소공배수</span>는 {steps.common_denom}이에요.
+
+${_frac(p.numerator1, p.denominator1)} \\times {_frac(steps.mult1, steps.mult1)} = {_frac(steps.new_num1, steps.common_denom)}$
+
+${_frac(p.numerator2, p.denominator2)} \\times {_frac(steps.mult2, steps.mult2)} = {_frac(steps.new_num2, steps.common_denom)}$
+
+<p><strong>2단계: 분모가 같으니 <span class='em-hl em-h-pink'>분자끼리 나누기</span></strong></p>
+
+${_frac(steps.new_num1, steps.common_denom)} \\div {_frac(steps.new_num2, steps.common_denom)} = {steps.new_num1} \\div {steps.new_num2} = {steps.quotient}$"""
+
+
+def _stage2_solution(p, steps):
+    return f"""<p><strong>Step 1:</strong> 두 번째 분수의 분자와 분모를 뒤집어요 (<span class='em-hl em-bold em-h-yellow'>역수</span>)</p>
+
+$${_frac(p.numerator2, p.denominator2)} \\rightarrow {_frac(steps.reciprocal_num, steps.reciprocal_den)}$$
+
+<p><strong>Step 2:</strong> 나눗셈을 <span class='em-hl em-bold em-h-green'>곱셈</span>으로 바꿔 계산해요</p>
+
+$${_frac(p.numerator1, p.denominator1)} \\times {_frac(steps.reciprocal_num, steps.reciprocal_den)} = {_frac(steps.product_num, steps.product_den)}$$
+
+**Step 3:** 약분하면
+
+$$= {_frac(steps.result_num, steps.result_den)}$$"""
+
+
+def _stage2_example(p, steps):
+    return f"""### 📚 개념 설명: 역수를 이용한 분수의 나눗셈
+
+**예시 문제를 함께 풀어볼게요!**
+
+$${_division(p)}$$
+
+분모끼리 나누어떨어지지 않아서 단계 1 방법으로는 풀기 어려워요."""
+
+
+def _stage2_example_solution(p, steps):
+    product = _frac(f"{p.numerator1} \\times {p.denominator2}", f"{p.denominator1} \\times {p.numerator2}")
+    return f"""### 📖 풀이 과정
+
+$${_division(p)}$$
+
+<p><strong>Step 1:</strong> 두 번째 분수의 <span class='em-hl em-bold em-h-yellow'>역수</span>를 구해요</p>
+
+$${_frac(p.numerator2, p.denominator2)} \\text{{의 역수}} = {_frac(steps.reciprocal_num, steps.reciprocal_den)}$$
+
+<p><strong>Step 2:</strong> 나눗셈을 <span class='em-hl em-bold em-h-green'>역수의 곱셈</span>으로 바꿔요</p>
+
+$${_division(p)} = {_frac(p.numerator1, p.denominator1)} \\times {_frac(steps.reciprocal_num, steps.reciprocal_den)}$$
+
+**Step 3:** 분자끼리, 분모끼리 곱해요
+
+$$= {product} = {_frac(steps.product_num, steps.product_den)}$$
+
+**Step 4:** 약분하면 최종 답!
+
+$$= {_frac(steps.result_num, steps.result_den)}$$"""
+
+
+# (블록 종류, 단계) → 문자열을 만드는 함수
+BLOCKS = {
+    ('problem', 1): _problem,
+    ('problem', 2): _problem,
+    ('hint', 1): _stage1_hint,
+    ('hint', 2): _stage2_hint,
+    ('solution', 1): _stage1_solution,
+    ('solution', 2): _stage2_solution,
+    ('example', 2): _stage2_example,
+    ('example_solution', 2): _stage2_example_solution,
+}
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_block(block, stage, numerator1, denominator1, numerator2, denominator2):
+    """문제 하나의 설명 블록 문자열 (프로세스 전체에서 캐시됨)"""
+    problem = make_problem(numerator1, denominator1, numerator2, denominator2)
+    steps = solution_steps(stage, numerator1, denominator1, numerator2, denominator2)
+    return BLOCKS[(block, stage)](problem, steps)
+
+
+def render_cache_stats():
+    """렌더링 캐시의 적중·실패 횟수와 크기"""
+    info = render_block.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
@@ -0,0 +1,129 @@
+"""페이지 세션 상태 키 관리
+
+분수의 나눗셈 페이지가 st.session_state에 두는 키를 이름 공간 두 개로 나눕니다.
+- 세션 전체 키(SESSION_KEYS): 단계와 상관없이 세션이 끝날 때까지 두는 값
+- 단계 키: 'stage1_', 'stage2_'로 시작하는 값. 문제 세트, 진행 상황, 그리고 그 단계의 위젯
+  (답 입력칸 stage1_den_0, 제출 버튼 stage1_submit 등)
+
+단계가 바뀌거나 다음 문제로 넘어갈 때 compact()를 부르면, 지금 단계에서 쓰는 키(live_keys)만 남기고
+나머지 단계 키를 지웁니다. 세션 전체 키도 단계 키도 아닌 키(다른 페이지의 키)는 건드리지 않습니다.
+Streamlit 없이 딕셔너리처럼 쓸 수 있는 객체면 무엇이든 받습니다.
+
+size_report()는 세션 상태의 키별 크기(바이트)를 어림합니다.
+"""
+import sys
+import types
+from collections import deque
+
+from elemath.metrics import count
+
+STAGES = (1, 2)
+
+# 세션 전체 키
+SESSION_KEYS = frozenset({
+    'stage',            # 지금 단계 (1, 2)
+    'correct_count',    # 맞힌 문제 수
+    'problem_history',  # ProblemHistory
+    'student_stats',    # adaptive.StudentStats
+    'prefetch_stage1',  # 다음 단계 1 세트를 미리 만드는 Prefetcher (처음 필요할 때 만듦)
+    'prefetch_stage2',  # 다음 단계 2 세트를 미리 만드는 Prefetcher (처음 필요할 때 만듦)
+    'theme_injected',   # CSS를 브라우저에 붙였는지
+    'class_code',       # 사이드바 반 코드 입력칸
+    'resume_token',     # 이어 하기 토큰 (elemath.snapshot)
+})
+
+# 단계마다 두는 값 (stage{단계}_{이름})
+STAGE_STATE = (
+    'problems', 'index', 'attempts', 'feedback', 'shown_at',
+    'example', 'concept_understood', 'round',
+)
+# 단계마다 두는 버튼 (stage{단계}_{이름})
+STAGE_BUTTONS = ('submit', 'restart', 'restart_all', 'more_practice', 'understand')
+# 문제마다 바뀌는 답 입력칸 (stage{단계}_{이름}_{문제 번호})
+ANSWER_INPUTS = ('den', 'num')
+
+_STAGE_PREFIXES = tuple(f'stage{stage}_' for stage in STAGES)
+
+
+def stage_key(stage, name):
+    """단계 키 이름 (예: stage_key(1, 'problems') → 'stage1_problems')"""
+    return f'stage{stage}_{name}'
+
+
+def answer_key(stage, name, index):
+    """문제 번호별 답 입력칸 키 (예: answer_key(2, 'den', 0) → 'stage2_den_0')"""
+    return f'stage{stage}_{name}_{index}'
+
+
+def live_keys(state):
+    """지금 단계와 지금 문제에서 쓰는 키 집합"""
+    stage = state.get('stage', 1)
+    live = set(SESSION_KEYS)
+    live.update(stage_key(stage, name) for name in STAGE_STATE + STAGE_BUTTONS)
+    index = state.get(stage_key(stage, 'index'), 0)
+    live.update(answer_key(stage, name, index) for name in ANSWER_INPUTS)
+    return live
+
+
+def compact(state):
+    """지금 쓰지 않는 단계 키(다른 단계의 값, 지난 문제의 답 입력칸)를 지우고 지운 키 목록을 돌려줍니다."""
+    live = live_keys(state)
+    stale = [key for key in list(state.keys()) if key.startswith(_STAGE_PREFIXES) and key not in live]
+    for key in stale:
+        del state[key]
+    count('session_keys_compacted', len(stale))
+    return stale
+
+
+def clear_stages(state):
+    """모든 단계 키를 지웁니다 (처음부터 다시 시작)."""
+    for key in [key for key in list(state.keys()) if key.startswith(_STAGE_PREFIXES)]:
+        del state[key]
+
+
+# 크기를 셀 때 따라가지 않는 객체: 코드, 모듈, 클래스처럼 모든 세션이 함께 쓰는 것
+_SKIP_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+    types.CodeType,
+)
+_SCALAR_TYPES = (str, bytes, int, float, complex, type(None))
+
+
+def deep_sizeof(obj, seen=None):
+    """obj와 그 안에 든 객체들의 sys.getsizeof 합 (문자열·숫자가 아닌 같은 객체는 한 번만)
+    다른 세션과 함께 쓰는 객체(미리 만든 문제 목록의 Problem 등)도 더하므로 실제 사용량의 상한입니다.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, _SCALAR_TYPES):
+            # 작은 정수나 True처럼 파이썬이 함께 쓰는 값도 나온 자리마다 셈
+            total += sys.getsizeof(item)
+            continue
+        if id(item) in seen or isinstance(item, _SKIP_TYPES):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        else:
+            if hasattr(item, '__dict__'):
+                stack.append(vars(item))
+            slots = getattr(type(item), '__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if hasattr(item, name):
+                    stack.append(getattr(item, name))
+    return total
+
+
+def size_report(state):
+    """세션 상태의 키별 크기 [(키, 바이트)]를 큰 순서로. 여러 키가 함께 가리키는 객체는 처음 센 키에만 더합니다."""
+    seen = set()
+    sizes = [(key, deep_sizeof(state[key], seen)) for key in sorted(state.keys())]
+    return sorted(sizes, key=lambda row: row[1], reverse=True)
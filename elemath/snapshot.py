@@ -0,0 +1,303 @@
+"""이어 하기 스냅숏
+
+학교 무선망에서 태블릿 연결이 끊기면 Streamlit은 새 세션을 만들고 학생은 단계 1부터 다시 시작합니다.
+진행 상황(단계, 문제 번호, 틀린 횟수, 지금 세트의 문제, 맞힌 문제 수, 난이도 구간, 반 코드)과
+풀이 기록(ProblemHistory)의 누적 값, 난이도 구간별 통계(StudentStats)를 100바이트 안팎의 이진 스냅숏으로
+만들어 이어 하기 토큰을 키로 저장해 두고, 다시 연결한 세션이 주소의 토큰으로 스냅숏을 꺼내 상태를 되살립니다.
+문제는 피연산자로 바로 다시 만들므로 새로 고르지 않습니다. 풀이 기록의 최근 기록 링 버퍼는 담지 않습니다.
+
+주소는 다른 사람에게 그대로 전해질 수 있으므로, 되살린 세션은 새 토큰을 받아 그 토큰으로 저장합니다.
+같은 주소로 여러 명이 접속해도 저마다 복사본에서 이어 하고 원래 스냅숏을 덮어쓰지 않습니다.
+
+스냅숏은 상태가 바뀔 때(답 제출, 단계 이동, 새 세트)만 저장하고, 다시 실행할 때마다 쓰지는 않습니다.
+
+스냅숏 구성 (little-endian)
+- 머리말 HEADER.size바이트: 버전, 단계, 맞힌 수, 문제 번호, 틀린 횟수, 추가 연습 횟수, 플래그,
+  단계별 난이도 구간, 문제 수, 반 코드 길이
+- 문제 수 × 피연산자 네 개, 플래그에 예시 문제가 있으면 피연산자 네 개 더
+  (피연산자는 1바이트씩, 255보다 큰 수가 있으면 2바이트씩)
+- 반 코드 (UTF-8)
+- 풀이 기록 STATS.size바이트: 단계별 맞힌 수·제출 수, 전체 제출 수, 마지막으로 맞힌 뒤 실행 수, 실행 수 합,
+  구간 수, 결과값 수
+- 구간 수 × BAND (단계, 구간 번호, 맞힌 수, 틀린 수, 최근 정답률, 최근 풀이 시간)
+- 결과값 수 × RESULT (맞힌 문제의 결과 분자, 분모, 맞힌 횟수)
+
+    store = open_snapshot_store(None)  # 프로세스 메모리, 경로를 주면 SQLite
+    store.put(token, encode(capture(st.session_state)))
+    restore(st.session_state, decode(store.get(token)))
+"""
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from elemath.adaptive import LEVEL_INDEX, LEVELS, Band, StudentStats
+from elemath.history import ProblemHistory
+from elemath.metrics import count
+from elemath.registry import get_problem_type
+from elemath.session import STAGES, stage_key
+
+VERSION = 2
+# 버전, 단계, 맞힌 수, 문제 번호, 틀린 횟수, 추가 연습 횟수, 플래그, 단계 1·2 난이도 구간, 문제 수, 반 코드 길이
+HEADER = struct.Struct('<BBHBBHBBBBB')
+# 단계 1·2 맞힌 수, 단계 1·2 제출 수, 전체 제출 수, 마지막으로 맞힌 뒤 실행 수, 실행 수 합, 구간 수, 결과값 수
+STATS = struct.Struct('<HHHHIHIBH')
+# 단계, 구간 번호, 맞힌 수, 틀린 수, 최근 정답률, 최근 풀이 시간
+BAND = struct.Struct('<BBHHff')
+# 결과 분자, 결과 분모, 맞힌 횟수
+RESULT = struct.Struct('<HHH')
+
+# 플래그
+CONCEPT_UNDERSTOOD = 1
+HAS_EXAMPLE = 2
+WIDE_OPERANDS = 4
+
+# 저장하는 반 코드 최대 글자 수 (UTF-8로 255바이트를 넘지 않도록)
+MAX_CLASS_CODE = 63
+
+# 메모리 저장소에 두는 스냅숏 수와 시간 (하루 수업 시간)
+SNAPSHOT_TTL_SECONDS = 8 * 60 * 60
+MAX_SNAPSHOTS = 100_000
+
+
+class Snapshot(NamedTuple):
+    """세션 하나의 진행 상황"""
+    stage: int
+    correct_count: int
+    index: int           # 지금 단계의 문제 번호
+    attempts: int        # 지금 문제에서 틀린 횟수
+    round: int           # 반 모드에서 '추가 연습하기'를 누른 횟수
+    concept_understood: bool
+    levels: tuple        # (단계 1, 단계 2) 난이도 구간 번호
+    problems: tuple      # 지금 세트 문제들의 피연산자 네 개
+    example: tuple       # 단계 2 예시 문제의 피연산자 네 개 (없으면 None)
+    class_code: str = ''
+    history: tuple = (0,) * 7  # STATS 앞 일곱 칸 (ProblemHistory 누적 값)
+    bands: tuple = ()    # BAND 튜플들 (StudentStats 구간별 통계)
+    results: tuple = ()  # RESULT 튜플들 (ProblemHistory.results)
+
+
+def new_token():
+    """이어 하기 토큰 (추측하기 어려운 임의의 16진수 문자열)"""
+    return os.urandom(12).hex()
+
+
+def _u16(n):
+    return min(n, 0xFFFF)
+
+
+def _u32(n):
+    return min(n, 0xFFFFFFFF)
+
+
+def capture(state):
+    """세션 상태에서 스냅숏을 만듭니다."""
+    stage = state.get('stage', 1)
+    stats = state.get('student_stats')
+    example = state.get(stage_key(stage, 'example'))
+    history = state.get('problem_history')
+    history_values = (0,) * 7
+    results = ()
+    if history is not None:
+        history_values = (history.correct[1], history.correct[2], history.attempts[1], history.attempts[2],
+                          history.total, history.runs, history.solve_runs)
+        results = tuple((num, den, n) for (num, den), n in history.results.items())
+    bands = ()
+    if stats is not None:
+        bands = tuple((key[0], LEVEL_INDEX[key], band.answered, band.wrong, band.accuracy, band.seconds)
+                      for key, band in stats.bands.items())
+    return Snapshot(
+        stage=stage,
+        correct_count=state.get('correct_count', 0),
+        index=state.get(stage_key(stage, 'index'), 0),
+        attempts=state.get(stage_key(stage, 'attempts'), 0),
+        round=state.get(stage_key(stage, 'round'), 0),
+        concept_understood=bool(state.get(stage_key(stage, 'concept_understood'))),
+        levels=(stats.levels[1], stats.levels[2]) if stats is not None else (0, 0),
+        problems=tuple(p.operands for p in state.get(stage_key(stage, 'problems'), ())),
+        example=example.operands if example is not None else None,
+        class_code=state.get('class_code', ''),
+        history=history_values,
+        bands=bands,
+        results=results,
+    )
+
+
+def restore(state, snapshot):
+    """스냅숏으로 세션 상태를 되살립니다. 문제는 피연산자로 바로 다시 만듭니다."""
+    stage = snapshot.stage
+    make = get_problem_type(stage).make
+    state['stage'] = stage
+    state['correct_count'] = snapshot.correct_count
+    stats = StudentStats()
+    stats.levels = {1: snapshot.levels[0], 2: snapshot.levels[1]}
+    for band_stage, index, answered, wrong, accuracy, seconds in snapshot.bands:
+        stats.bands[LEVELS[band_stage][index]] = Band(answered, wrong, accuracy, seconds)
+    state['student_stats'] = stats
+    # 풀이 기록은 페이지가 만든 것(저장소 설정 포함)이 있으면 그 객체에 누적 값을 채움
+    history = state.get('problem_history')
+    if history is None:
+        history = state['problem_history'] = ProblemHistory()
+    (history.correct[1], history.correct[2], history.attempts[1], history.attempts[2],
+     history.total, history.runs, history.solve_runs) = snapshot.history
+    history.results.clear()
+    history.results.update({(num, den): n for num, den, n in snapshot.results})
+    if snapshot.problems:
+        state[stage_key(stage, 'problems')] = [make(*operands) for operands in snapshot.problems]
+        state[stage_key(stage, 'index')] = snapshot.index
+        state[stage_key(stage, 'attempts')] = snapshot.attempts
+    if snapshot.example is not None:
+        state[stage_key(stage, 'example')] = make(*snapshot.example)
+    if snapshot.round:
+        state[stage_key(stage, 'round')] = snapshot.round
+    if stage == 2:
+        state[stage_key(stage, 'concept_understood')] = snapshot.concept_understood
+    if snapshot.class_code:
+        state['class_code'] = snapshot.class_code
+
+
+def encode(snapshot):
+    """스냅숏을 바이트로 (지금 페이지 상태로는 100바이트 안팎)"""
+    operands = [n for ops in snapshot.problems for n in ops]
+    if snapshot.example is not None:
+        operands.extend(snapshot.example)
+    flags = (CONCEPT_UNDERSTOOD * snapshot.concept_understood
+             | HAS_EXAMPLE * (snapshot.example is not None)
+             | WIDE_OPERANDS * any(n > 0xFF for n in operands))
+    code = snapshot.class_code[:MAX_CLASS_CODE].encode('utf-8')
+    # 틀린 횟수와 맞힌 수는 화면에 쓰는 만큼만 있으면 되므로 칸에 맞게 자름
+    header = HEADER.pack(
+        VERSION, snapshot.stage, min(snapshot.correct_count, 0xFFFF), snapshot.index, min(snapshot.attempts, 0xFF),
+        min(snapshot.round, 0xFFFF), flags, *snapshot.levels, len(snapshot.problems), len(code),
+    )
+    body = struct.pack(f"<{len(operands)}{'H' if flags & WIDE_OPERANDS else 'B'}", *operands)
+    results = snapshot.results[:0xFFFF]
+    correct1, correct2, attempts1, attempts2, total, runs, solve_runs = snapshot.history
+    stats = STATS.pack(_u16(correct1), _u16(correct2), _u16(attempts1), _u16(attempts2), _u32(total), _u16(runs),
+                       _u32(solve_runs), len(snapshot.bands), len(results))
+    bands = b''.join(BAND.pack(band_stage, index, _u16(answered), _u16(wrong), accuracy, seconds)
+                     for band_stage, index, answered, wrong, accuracy, seconds in snapshot.bands)
+    results = b''.join(RESULT.pack(_u16(num), _u16(den), _u16(n)) for num, den, n in results)
+    return header + body + code + stats + bands + results
+
+
+def decode(data):
+    """encode의 반대. 버전, 길이, 단계나 난이도 구간 번호가 맞지 않으면 ValueError"""
+    if len(data) < HEADER.size or data[0] != VERSION:
+        raise ValueError('지원하지 않는 스냅숏입니다')
+    (_, stage, correct_count, index, attempts, round_number, flags, level1, level2,
+     problem_count, code_length) = HEADER.unpack_from(data)
+    if stage not in STAGES or level1 >= len(LEVELS[1]) or level2 >= len(LEVELS[2]):
+        raise ValueError('스냅숏의 단계나 난이도 구간이 올바르지 않습니다')
+    operand_count = 4 * (problem_count + bool(flags & HAS_EXAMPLE))
+    body = struct.Struct(f"<{operand_count}{'H' if flags & WIDE_OPERANDS else 'B'}")
+    offset = HEADER.size + body.size + code_length
+    if len(data) < offset + STATS.size:
+        raise ValueError('스냅숏 길이가 머리말과 맞지 않습니다')
+    *history, band_count, result_count = STATS.unpack_from(data, offset)
+    offset += STATS.size
+    if len(data) != offset + band_count * BAND.size + result_count * RESULT.size:
+        raise ValueError('스냅숏 길이가 머리말과 맞지 않습니다')
+    bands = tuple(BAND.iter_unpack(data[offset:offset + band_count * BAND.size]))
+    if any(band_stage not in STAGES or band_index >= len(LEVELS[band_stage])
+           for band_stage, band_index, *_ in bands):
+        raise ValueError('스냅숏의 난이도 구간이 올바르지 않습니다')
+    offset += band_count * BAND.size
+    operands = body.unpack_from(data, HEADER.size)
+    quads = tuple(operands[i:i + 4] for i in range(0, operand_count, 4))
+    return Snapshot(
+        stage, correct_count, index, attempts, round_number, bool(flags & CONCEPT_UNDERSTOOD),
+        (level1, level2), quads[:problem_count], quads[problem_count] if flags & HAS_EXAMPLE else None,
+        data[HEADER.size + body.size:HEADER.size + body.size + code_length].decode('utf-8'),
+        tuple(history), bands, tuple(RESULT.iter_unpack(data[offset:])),
+    )
+
+
+class MemorySnapshotStore:
+    """프로세스 메모리에 두는 저장소. 같은 서버 프로세스로 다시 연결하면 이어 할 수 있습니다.
+    최대 max_entries개를 ttl초 동안 두고, 넘치거나 오래된 것부터 지웁니다.
+    """
+
+    def __init__(self, max_entries=MAX_SNAPSHOTS, ttl=SNAPSHOT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 토큰 -> (만료 시각, 바이트). 마지막으로 저장한 순서
+
+    def put(self, token, data):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[token] = (now + self.ttl, data)
+            self._entries.move_to_end(token)
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or next(iter(self._entries.values()))[0] <= now):
+                self._entries.popitem(last=False)
+
+    def get(self, token):
+        with self._lock:
+            entry = self._entries.get(token)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SqliteSnapshotStore:
+    """SQLite snapshots 테이블 (토큰이 기본 키). 서버를 다시 시작하거나 프로세스가 여러 개여도 이어 할 수 있습니다."""
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def _connect(self):
+        import sqlite3  # 저장소를 쓸 때만 필요하므로 엔진 임포트 시간에서 뺌
+
+        conn = sqlite3.connect(self.path)
+        conn.execute('CREATE TABLE IF NOT EXISTS snapshots (token TEXT PRIMARY KEY, data BLOB, saved_at REAL)')
+        return conn
+
+    def put(self, token, data):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)', (token, data, time.time()))
+        finally:
+            conn.close()
+
+    def get(self, token):
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT data FROM snapshots WHERE token = ?', (token,)).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+
+_memory_store = MemorySnapshotStore()
+
+
+def open_snapshot_store(path=None):
+    """path가 없으면 프로세스 전체가 함께 쓰는 메모리 저장소, 있으면 그 SQLite 파일"""
+    if not path:
+        return _memory_store
+    return SqliteSnapshotStore(path)
+
+
+def save_snapshot(store, token, state):
+    """세션 상태의 스냅숏을 저장합니다 (상태가 바뀔 때만 부름)."""
+    store.put(token, encode(capture(state)))
+    count('snapshots_saved')
+
+
+def load_snapshot(store, token):
+    """토큰의 스냅숏 (없거나 읽을 수 없으면 None). 되살릴 수 없는 단계나 구간이 든 스냅숏도 None"""
+    data = store.get(token)
+    if data is None:
+        return None
+    try:
+        return decode(data)
+    except ValueError:
+        return None
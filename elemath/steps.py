@@ -0,0 +1,74 @@
+"""풀이 과정 계산
+
+단계 1은 통분(최소공배수)으로, 단계 2는 역수의 곱셈으로 푸는 과정의 중간값을 구합니다.
+힌트, 정답 풀이, 오답 풀이가 모두 같은 결과를 읽도록 문제 튜플마다 한 번만 계산해 LRU 캐시에 둡니다.
+다른 문제 종류도 등록할 때 준 steps 함수로 같은 캐시를 씁니다.
+"""
+from functools import lru_cache
+from math import lcm
+from typing import NamedTuple
+
+from elemath.rational import cross_cancel, reduce_fraction
+from elemath.registry import get_problem_type
+
+# 캐시에 둘 문제 수 (단계 1·2 문제 목록을 모두 담고도 남는 크기)
+STEPS_CACHE_SIZE = 4096
+
+
+class Stage1Steps(NamedTuple):
+    """통분을 이용한 단계 1 풀이: a/b ÷ c/d = (a×mult1)/공통분모 ÷ (c×mult2)/공통분모"""
+    common_denom: int  # 두 분모의 최소공배수
+    mult1: int         # 첫 번째 분수에 곱하는 수
+    mult2: int         # 두 번째 분수에 곱하는 수
+    new_num1: int      # 통분한 첫 번째 분수의 분자
+    new_num2: int      # 통분한 두 번째 분수의 분자
+    quotient: int      # new_num1 ÷ new_num2 (단계 1 문제는 나누어떨어짐)
+
+
+class Stage2Steps(NamedTuple):
+    """역수를 이용한 단계 2 풀이: a/b ÷ c/d = a/b × d/c"""
+    reciprocal_num: int  # 두 번째 분수의 역수 d/c의 분자
+    reciprocal_den: int  # 두 번째 분수의 역수 d/c의 분모
+    product_num: int     # 약분 전 분자 a×d
+    product_den: int     # 약분 전 분모 b×c
+    cancel_num: int      # 분자끼리(a와 c) 약분되는 수, 없으면 1
+    cancel_den: int      # 분모끼리(b와 d) 약분되는 수, 없으면 1
+    result_num: int      # 약분한 결과의 분자
+    result_den: int      # 약분한 결과의 분모
+
+
+def common_denominator_steps(numerator1, denominator1, numerator2, denominator2):
+    """통분으로 푸는 풀이 (단계 1)"""
+    common_denom = lcm(denominator1, denominator2)
+    mult1 = common_denom // denominator1
+    mult2 = common_denom // denominator2
+    new_num1 = numerator1 * mult1
+    new_num2 = numerator2 * mult2
+    return Stage1Steps(common_denom, mult1, mult2, new_num1, new_num2, new_num1 // new_num2)
+
+
+def reciprocal_steps(numerator1, denominator1, numerator2, denominator2):
+    """역수의 곱셈으로 푸는 풀이 (단계 2)"""
+    product_num = numerator1 * denominator2
+    product_den = denominator1 * numerator2
+    return Stage2Steps(
+        denominator2, numerator2, product_num, product_den,
+        *cross_cancel(numerator1, denominator1, denominator2, numerator2),
+        *reduce_fraction(product_num, product_den),
+    )
+
+
+@lru_cache(maxsize=STEPS_CACHE_SIZE)
+def solution_steps(stage, numerator1, denominator1, numerator2, denominator2):
+    """문제 튜플 하나의 풀이 중간값 (stage는 문제 종류 키. 1이면 Stage1Steps, 2이면 Stage2Steps)"""
+    return get_problem_type(stage).steps(numerator1, denominator1, numerator2, denominator2)
+
+
+def stage1_steps(problem):
+    """통분을 이용한 단계 1 풀이의 중간값"""
+    return solution_steps(1, *problem.operands)
+
+
+def stage2_steps(problem):
+    """역수의 곱셈을 이용한 단계 2 풀이의 중간값"""
+    return solution_steps(2, *problem.operands)
@@ -0,0 +1,76 @@
+"""페이지 공통 스타일
+
+설명 상자(callout/note), 강조 배지(badge), 형광펜(hl)을 짧은 CSS 클래스로 정의합니다.
+예전에는 블록마다 style='background-color: ...; padding: ...' 속성을 반복해서 보냈지만,
+이제 스타일시트 하나만 보내고 HTML에는 클래스 이름만 씁니다.
+
+- 상자: <div class='em-box em-blue'> (테두리 전체), <div class='em-note em-sky'> (왼쪽 테두리)
+- 배지: <span class='em-badge em-b-blue'>흰 글씨 강조</span>
+- 형광펜: <span class='em-hl em-h-yellow'>강조</span> (굵게: em-bold 추가)
+
+Streamlit은 재실행 때 다시 그리지 않은 요소를 화면에서 지우므로, <style> 요소를 그대로 쓰면
+재실행마다 스타일시트를 다시 보내야 합니다. 그래서 INJECT_SCRIPT는 스타일시트를 문서의
+<head>에 직접 붙이는 짧은 스크립트로 만들어, 세션 첫 실행에 한 번만 보내면 되게 합니다.
+"""
+
+# 상자 배경색과 테두리색
+BOX_COLORS = {
+    'blue': ('#bbdefb', '#2196f3'),
+    'indigo': ('#c5cae9', '#673ab7'),
+    'yellow': ('#fff59d', '#fbc02d'),
+    'orange': ('#ffccbc', '#ff5722'),
+    'green': ('#c8e6c9', '#4caf50'),
+    'purple': ('#e1bee7', '#9c27b0'),
+    'teal': ('#b2dfdb', '#00897b'),
+    'sky': ('#e1f5fe', '#0288d1'),
+    'lemon': ('#fff9c4', '#f57f17'),
+}
+
+# 배지(흰 글씨) 배경색
+BADGE_COLORS = {
+    'blue': '#42a5f5',
+    'violet': '#7e57c2',
+    'orange': '#ff9800',
+    'lime': '#8bc34a',
+    'teal': '#4db6ac',
+}
+
+# 형광펜 배경색
+HIGHLIGHT_COLORS = {
+    'yellow': '#ffeb3b',
+    'green': '#a5d6a7',
+    'sky': '#4fc3f7',
+    'lightblue': '#81d4fa',
+    'blue': '#90caf9',
+    'lavender': '#b39ddb',
+    'pink': '#ce93d8',
+}
+
+
+def _build_stylesheet():
+    rules = [
+        '.em-box{padding:20px;border-radius:10px;border:3px solid;margin:10px 0}',
+        '.em-note{padding:15px;border-radius:8px;border-left:5px solid;margin-bottom:10px}',
+        '.em-badge{color:#fff;padding:3px 10px;border-radius:5px}',
+        '.em-hl{padding:2px 8px;border-radius:3px}',
+        '.em-bold{font-weight:bold}',
+        '.em-lead{font-size:1.1em;margin-bottom:10px}',
+        '.em-center{text-align:center;margin:0}',
+        '.em-summary{padding:25px;border-radius:15px;border-width:4px}',
+        '.em-summary h4{text-align:center;color:#6a1b9a;margin-bottom:15px}',
+    ]
+    rules += [f'.em-{name}{{background:{bg};border-color:{border}}}' for name, (bg, border) in BOX_COLORS.items()]
+    rules += [f'.em-b-{name}{{background:{color}}}' for name, color in BADGE_COLORS.items()]
+    rules += [f'.em-h-{name}{{background:{color}}}' for name, color in HIGHLIGHT_COLORS.items()]
+    return ''.join(rules)
+
+
+# 공통 CSS 규칙
+STYLESHEET = _build_stylesheet()
+
+# 스타일시트를 <head>에 한 번만 붙이는 스크립트 (이미 있으면 아무것도 하지 않음)
+INJECT_SCRIPT = (
+    "<script>if(!document.getElementById('em-theme')){"
+    "var s=document.createElement('style');s.id='em-theme';"
+    f"s.textContent=`{STYLESHEET}`;document.head.appendChild(s);}}</script>"
+)
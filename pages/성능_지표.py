@@ -0,0 +1,92 @@
+import os
+import sys
+from pathlib import Path
+
+import streamlit as st
+
+# 페이지 파일을 직접 실행해도 저장소 루트의 elemath 패키지를 찾을 수 있도록 경로 추가
+ROOT_DIR = str(Path(__file__).resolve().parent.parent)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from elemath import metrics, render_cache_stats
+from elemath.session import size_report
+
+st.set_page_config(page_title="성능 지표", layout="wide")
+st.title("📈 성능 지표")
+
+# 세션 상태는 페이지끼리 함께 쓰므로 학습 페이지에서 쌓인 값이 그대로 보임 (측정을 꺼도 볼 수 있음)
+with st.expander("이 세션의 상태 크기"):
+    sizes = size_report(st.session_state)
+    st.caption(f"키 {len(sizes)}개, 합계 약 {sum(size for _, size in sizes):,} B. "
+               "다른 세션과 함께 쓰는 문제 객체도 더한 어림값이에요.")
+    st.dataframe([{'키': key, '바이트': size} for key, size in sizes], hide_index=True)
+
+if not metrics.ENABLED:
+    st.info("측정이 꺼져 있어요. ELEMATH_METRICS=1 환경 변수를 주고 서버를 다시 시작하세요.")
+    st.stop()
+
+st.caption("이 서버 프로세스에서 모든 학생 세션이 함께 쌓은 값입니다. 시간은 구간 경계로 어림한 값이에요.")
+live = st.toggle("2초마다 새로 고침", value=True)
+
+
+@st.fragment(run_every=2 if live else None)
+def show_metrics():
+    values = metrics.snapshot()
+    st.write("### 실행 시간")
+    st.dataframe(
+        [
+            {
+                '이름': name,
+                '횟수': t['count'],
+                '평균 ms': round(t['sum'] / t['count'] * 1000, 3),
+                'p50 ms 이하': round(t['p50'] * 1000, 3),
+                'p99 ms 이하': round(t['p99'] * 1000, 3),
+                '최대 ms': round(t['max'] * 1000, 3),
+                '합계 s': round(t['sum'], 3),
+            }
+            for name, t in sorted(values['timings'].items())
+        ],
+        hide_index=True,
+    )
+    st.write("### 횟수 분포")
+    st.caption("runs_per_solve: 문제 하나를 맞힐 때까지 페이지(또는 답 입력 영역)가 실행된 횟수")
+    st.dataframe(
+        [
+            {
+                '이름': name,
+                '횟수': d['count'],
+                '평균': round(d['sum'] / d['count'], 2),
+                'p50 이하': d['p50'],
+                'p99 이하': d['p99'],
+                '최대': d['max'],
+            }
+            for name, d in sorted(values['distributions'].items())
+        ],
+        hide_index=True,
+    )
+    st.write("### 횟수")
+    st.dataframe(
+        [{'이름': name, '횟수': n} for name, n in sorted(values['counters'].items())],
+        hide_index=True,
+    )
+    st.write("### 렌더링 캐시")
+    st.json(render_cache_stats())
+
+
+show_metrics()
+
+st.write("### 내보내기")
+text = metrics.prometheus_text()
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.download_button("Prometheus 텍스트 받기", text, file_name="elemath.prom", mime="text/plain")
+with col2:
+    export_path = os.environ.get('ELEMATH_METRICS_FILE')
+    if export_path and st.button(f"{export_path}에 쓰기"):
+        metrics.write_prometheus(export_path)
+        st.toast("파일에 썼어요")
+with col3:
+    st.button("모든 값 지우기", on_click=metrics.reset)
+with st.expander("Prometheus 텍스트 보기"):
+    st.code(text, language="text")
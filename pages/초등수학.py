@@ -1,344 +1,407 @@
+import os
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
-import random
-from math import gcd
-from fractions import Fraction
+
+# 페이지 파일을 직접 실행해도 저장소 루트의 elemath 패키지를 찾을 수 있도록 경로 추가
+ROOT_DIR = str(Path(__file__).resolve().parent.parent)
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from elemath import (
+    ProblemHistory,
+    check_answer,
+    generate_non_divisible_problem,
+    make_practice_problems,
+    open_history_store,
+    render_block,
+)
+from elemath.adaptive import StudentStats
+from elemath.classroom import class_stage1_set, class_stage2_set, normalize_code
+from elemath.metrics import count, timed
+from elemath.prefetch import Prefetcher, stage1_set, stage2_set
+from elemath.session import answer_key, clear_stages, compact, stage_key
+from elemath.snapshot import load_snapshot, new_token, open_snapshot_store, restore, save_snapshot
+from elemath.theme import INJECT_SCRIPT
 
 # 페이지 설정
 st.set_page_config(page_title="분수의 나눗셈", layout="centered")
 st.title("🧮 분수의 나눗셈 학습")
 
-# 세션 상태 초기화
+# 설명 상자와 강조 표시가 쓰는 CSS 클래스를 세션 첫 실행에 한 번만 브라우저에 붙임
+# (<head>에 붙인 스타일은 재실행 때 요소가 지워져도 남아 있으므로 다시 보내지 않음)
+if not st.session_state.get('theme_injected'):
+    st.html(INJECT_SCRIPT, unsafe_allow_javascript=True)
+    st.session_state.theme_injected = True
+
+def new_problem_history():
+    """세션의 풀이 기록을 새로 만듭니다.
+    ELEMATH_HISTORY_STORE 환경 변수에 파일 경로(.jsonl 또는 .sqlite)를 주면
+    최근 기록에서 밀려난 오래된 기록을 그 파일에 모아서 씁니다.
+    """
+    store_path = os.environ.get('ELEMATH_HISTORY_STORE')
+    return ProblemHistory(store=open_history_store(store_path) if store_path else None)
+
+def snapshot_store():
+    """이어 하기 스냅숏 저장소.
+    ELEMATH_SNAPSHOT_STORE 환경 변수에 SQLite 파일 경로를 주면 그 파일에, 없으면 서버 프로세스 메모리에 둡니다.
+    """
+    return open_snapshot_store(os.environ.get('ELEMATH_SNAPSHOT_STORE'))
+
+def resume_session():
+    """새 세션의 첫 실행: 주소의 이어 하기 토큰(?resume=)으로 연결이 끊기기 전 진행 상황을 되살림.
+    되살린 뒤에는 새 토큰으로 바꿔 저장하므로, 주소를 나눠 받은 다른 사람과 스냅숏을 함께 쓰지 않습니다.
+    """
+    token = st.query_params.get('resume')
+    store = snapshot_store()
+    snapshot = load_snapshot(store, token) if token else None
+    if snapshot is not None:
+        restore(st.session_state, snapshot)
+        count('snapshots_resumed')
+    if snapshot is not None or not token:
+        token = new_token()
+        st.query_params['resume'] = token
+    st.session_state.resume_token = token
+    if snapshot is not None:
+        save_snapshot(store, token, st.session_state)
+
+def end_transition():
+    """상태가 바뀐 뒤(답 제출, 단계 이동, 새 세트): 쓰지 않는 키를 지우고 이어 하기 스냅숏을 저장.
+    다시 실행할 때마다가 아니라 여기서만 저장합니다.
+    """
+    compact(st.session_state)
+    save_snapshot(snapshot_store(), st.session_state.resume_token, st.session_state)
+
+# 풀이 기록은 이어 하기보다 먼저 만들어 되살린 누적 값이 저장소 설정을 가진 이 객체에 채워지게 함
+if 'problem_history' not in st.session_state:
+    st.session_state.problem_history = new_problem_history()
+if 'resume_token' not in st.session_state:
+    resume_session()
+
+# 세션 상태 초기화 (키 이름 공간은 elemath.session 참고)
 if 'stage' not in st.session_state:
     st.session_state.stage = 1  # 1: 기초 단계, 2: 심화 단계
 if 'correct_count' not in st.session_state:
     st.session_state.correct_count = 0
-if 'current_problem' not in st.session_state:
-    st.session_state.current_problem = None
-if 'problem_history' not in st.session_state:
-    st.session_state.problem_history = []
-
-def generate_divisible_problem():
-    """나누어지는 분수 문제 생성 (단계 1)"""
-    # 다양한 형태의 문제를 생성하기 위해 여러 전략 사용
-    for _ in range(500):
-        # 전략 1: 분모가 배수 관계인 경우
-        if random.random() < 0.5:
-            denominator2 = random.randint(2, 6)  # 작은 분모
-            multiplier = random.randint(2, 4)  # 배수
-            denominator1 = denominator2 * multiplier
-        else:
-            # 전략 2: 더 큰 범위에서 약수 관계 찾기
-            denominator1 = random.choice([4, 6, 8, 9, 10, 12, 15, 16, 18, 20])
-            divisors = [i for i in range(2, denominator1) if denominator1 % i == 0]
-            if not divisors:
-                continue
-            denominator2 = random.choice(divisors)
-        
-        # 분자는 더 다양한 범위에서 선택 (1~11)
-        numerator1 = random.randint(1, 11)
-        numerator2 = random.randint(1, 11)
-        
-        # 각 분수를 기약분수로 만들기
-        gcd1 = gcd(numerator1, denominator1)
-        numerator1 //= gcd1
-        denominator1 //= gcd1
-        
-        gcd2 = gcd(numerator2, denominator2)
-        numerator2 //= gcd2
-        denominator2 //= gcd2
-        
-        # 분자와 분모가 같으면 스킵 (1/1, 2/2 방지)
-        if numerator1 == denominator1 or numerator2 == denominator2:
-            continue
-        
-        # 나눗셈 결과가 정수인지 확인
-        result = Fraction(numerator1, denominator1) / Fraction(numerator2, denominator2)
-        if result.denominator == 1 and result.numerator > 0:
-            # 두 분수의 분모가 서로 달라야 함
-            if denominator1 == denominator2:
-                continue
-            
-            return {
-                'numerator1': numerator1,
-                'denominator1': denominator1,
-                'numerator2': numerator2,
-                'denominator2': denominator2,
-                'result': result,
-                'result_num': result.numerator,
-                'result_den': result.denominator
-            }
-        # 아니면 다른 조합을 찾아 재시도
-        continue
-
-    # 실패 시(희박) 백업 방식으로 생성 - 정수 결과를 보장해야 함
-    for _ in range(1000):
-        denominator1 = random.randint(2, 12)
-        divisors = [i for i in range(1, denominator1 + 1) if denominator1 % i == 0]
-        if len(divisors) > 1:
-            divisors.remove(denominator1)
-        denominator2 = random.choice(divisors)
-        
-        if denominator2 % 2 == 0:
-            numerator2 = random.choice([2,4,6,8])
+# 난이도 구간별 정답률과 풀이 시간 (처음부터 다시 시작해도 유지)
+if 'student_stats' not in st.session_state:
+    st.session_state.student_stats = StudentStats()
+def adaptive_level(stage):
+    """다음 세트를 고를 난이도 구간 번호 (그 단계에 답을 낸 적이 없으면 None: 전체에서 고름)"""
+    stats = st.session_state.student_stats
+    return stats.levels[stage] if stats.has_answers(stage) else None
+
+def prefetcher(stage):
+    """다음 문제 세트를 백그라운드에서 미리 만들어 두는 Prefetcher (세션이 끝나면 대기 중인 작업은 취소됨)
+    그 단계의 세트가 처음 필요할 때 만들므로, 반 코드로 푸는 세션이나 단계 2까지 가지 않은 세션은 만들지 않습니다.
+    학생의 난이도 구간을 key로 넘기므로, 세트를 다 풀기 전에 구간이 바뀌면 미리 만든 세트는 버리고 다시 고름
+    """
+    name = f'prefetch_stage{stage}'
+    if name not in st.session_state:
+        st.session_state[name] = Prefetcher(stage1_set if stage == 1 else stage2_set,
+                                            key=lambda: adaptive_level(stage))
+    return st.session_state[name]
+
+def show_block(block, stage, problem):
+    """문제별 설명 블록 출력 (문자열은 프로세스 전체 렌더링 캐시에서 가져옴)"""
+    st.markdown(render_block(block, stage, *problem.operands), unsafe_allow_html=True)
+
+@timed('ui_problem')
+def show_problem(stage, problem):
+    show_block('problem', stage, problem)
+
+@timed('ui_hint')
+def show_hint(stage, problem):
+    """힌트 표시 (풀이 과정은 숨김)"""
+    with st.expander("💡 힌트 보기"):
+        show_block('hint', stage, problem)
+
+@timed('ui_feedback')
+def show_feedback(stage, feedback):
+    """답 제출 콜백이 남긴 결과를 보여줍니다.
+    맞혔으면 방금 푼 문제의 풀이를, 두 번째 오답부터는 풀이와 정답을 함께 보여줍니다.
+    """
+    result, problem = feedback
+    if result == 'correct':
+        st.success("🎉 정답입니다!")
+        if stage == 1:
+            with st.expander("📖 풀이 과정 보기"):
+                show_block('solution', 1, problem)
         else:
-            numerator2 = random.choice([1,3,5,7,9])
-        
-        if denominator1 % 2 == 0:
-            candidates = [2,4,6,8]
+            st.write("### 📖 풀이과정")
+            show_block('solution', 2, problem)
+    elif st.session_state[f'stage{stage}_attempts'] == 1:
+        st.error("❌ 틀렸어요. 힌트를 확인하고 다시 시도해보세요!")
+    else:
+        st.error("❌ 또 틀렸어요. 아래에 정답을 참고하세요.")
+        if stage == 1:
+            with st.expander("📖 풀이 과정 보기"):
+                show_block('solution', 1, problem)
+            st.write(f"**정답: {problem['result_num']}/{problem['result_den']}**")
         else:
-            candidates = [1,3,5,7,9]
-        
-        # 정수 결과를 만드는 numerator1 찾기
-        for numerator1 in candidates:
-            # 각 분수를 기약분수로 만들기
-            gcd1 = gcd(numerator1, denominator1)
-            n1 = numerator1 // gcd1
-            d1 = denominator1 // gcd1
-            
-            gcd2 = gcd(numerator2, denominator2)
-            n2 = numerator2 // gcd2
-            d2 = denominator2 // gcd2
-            
-            # 분자와 분모가 같으면 스킵 (1/1, 2/2 방지)
-            if n1 == d1 or n2 == d2:
-                continue
-            
-            # 나눗셈 결과가 정수인지 확인
-            result = Fraction(n1, d1) / Fraction(n2, d2)
-            if result.denominator == 1:
-                # 두 분수의 분모가 다른지 확인
-                if d1 != d2:
-                    # 정수 결과를 찾았으면 반환
-                    return {
-                        'numerator1': n1,
-                        'denominator1': d1,
-                        'numerator2': n2,
-                        'denominator2': d2,
-                        'result': result,
-                        'result_num': result.numerator,
-                        'result_den': result.denominator
-                    }
+            st.write(f"정답: {problem['result_num']}/{problem['result_den']}")
+
+@timed('ui_concept')
+def show_stage1_concept():
+    """단계 1 첫 문제 위의 통분 개념 설명"""
+    st.write("""
+    ### 📚 개념 설명: 통분
+    """)
     
-    # 최후의 수단: 간단한 예시 (4/6 ÷ 2/3 = 1)
-    numerator1 = 4
-    denominator1 = 6
-    numerator2 = 2
-    denominator2 = 3
-    result = Fraction(numerator1, denominator1) / Fraction(numerator2, denominator2)
+    st.markdown("""
+    <div class='em-box em-blue'>
+        <p class='em-lead'>
+            <strong><span class='em-badge em-b-blue'>통분이란?</span></strong> 
+            분모가 다른 분수들을 분모가 같은 분수로 만드는 것이에요!
+        </p>
+        <p><strong>예를 들어:</strong></p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    return {
-        'numerator1': numerator1,
-        'denominator1': denominator1,
-        'numerator2': numerator2,
-        'denominator2': denominator2,
-        'result': result,
-        'result_num': result.numerator,
-        'result_den': result.denominator
-    }
-
-def generate_non_divisible_problem():
-    """나누어지지 않는 분수 문제 생성 (단계 2)
-    역수로 곱셈할 때 약분이 가능하도록 생성합니다.
-    예: 3/4 ÷ 2/6 = 3/4 × 6/2 → 3과 6이 약분, 4와 2가 약분
-    """
-    # 약분 가능한 문제를 만들기 위한 전략:
-    # numerator1과 denominator2가 공약수를 가지거나
-    # denominator1과 numerator2가 공약수를 가지도록 생성
+    st.write("""
+    - $\\frac{1}{2}$와 $\\frac{1}{3}$을 통분하면 → $\\frac{3}{6}$와 $\\frac{2}{6}$
+    """)
     
-    attempts = 0
-    while attempts < 100:
-        attempts += 1
-        
-        # 공약수를 만들기 위한 기본 수 선택
-        common_factor1 = random.randint(2, 6)  # 첫 번째 공약수
-        common_factor2 = random.randint(2, 6)  # 두 번째 공약수
-        
-        # numerator1과 denominator2가 common_factor1을 공약수로 가지도록
-        numerator1 = common_factor1 * random.randint(1, 3)
-        denominator2_temp = common_factor1 * random.randint(1, 3)
-        
-        # denominator1과 numerator2가 common_factor2를 공약수로 가지도록
-        denominator1 = common_factor2 * random.randint(1, 4)
-        numerator2 = common_factor2 * random.randint(1, 3)
-        
-        # denominator2는 위에서 만든 값 사용
-        denominator2 = denominator2_temp
-        
-        # 값 범위 확인 (1~12 사이)
-        if not (1 <= numerator1 <= 12 and 2 <= denominator1 <= 12 and 
-                1 <= numerator2 <= 12 and 2 <= denominator2 <= 12):
-            continue
-        
-        # 나누어 떨어지지 않는 경우인지 확인
-        if numerator1 * denominator2 % (denominator1 * numerator2) == 0:
-            continue
-        
-        # 기약분수로 만들기 (문제 자체는 기약분수여야 깔끔함)
-        gcd1 = gcd(numerator1, denominator1)
-        numerator1 //= gcd1
-        denominator1 //= gcd1
-        
-        gcd2 = gcd(numerator2, denominator2)
-        numerator2 //= gcd2
-        denominator2 //= gcd2
-        
-        # 분자와 분모가 같으면 스킵 (1/1, 2/2 방지)
-        if numerator1 == denominator1 or numerator2 == denominator2:
-            continue
-        
-        # 두 분수의 분모가 서로 달라야 함 (기약분수 후에 확인)
-        if denominator1 == denominator2:
-            continue
-        
-        # 역수로 곱셈할 때 약분이 가능한지 확인
-        # numerator1과 numerator2(역수의 분모)의 최대공약수
-        gcd_cross1 = gcd(numerator1, numerator2)
-        # denominator1과 denominator2(역수의 분자)의 최대공약수
-        gcd_cross2 = gcd(denominator1, denominator2)
-        
-        # 최소한 하나는 약분 가능해야 함
-        if gcd_cross1 > 1 or gcd_cross2 > 1:
-            result = Fraction(numerator1, denominator1) / Fraction(numerator2, denominator2)
-            return {
-                'numerator1': numerator1,
-                'denominator1': denominator1,
-                'numerator2': numerator2,
-                'denominator2': denominator2,
-                'result': result,
-                'result_num': result.numerator,
-                'result_den': result.denominator
-            }
+    st.markdown("""
+    <div class='em-box em-blue'>
+        <p class='em-center'>공통 분모는 2와 3의 <span class='em-hl em-h-blue'>최소공배수</span>인 6이에요!</p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    # 100번 시도해도 실패하면 기본 방식으로 생성 (약분 가능 보장 안됨)
-    for _ in range(100):
-        numerator1 = random.randint(2, 9)
-        denominator1 = random.randint(2, 12)
-        numerator2 = random.randint(2, 9)
-        denominator2 = random.randint(2, 12)
-        
-        # 기약분수로 만들기
-        gcd1 = gcd(numerator1, denominator1)
-        numerator1 //= gcd1
-        denominator1 //= gcd1
-        
-        gcd2 = gcd(numerator2, denominator2)
-        numerator2 //= gcd2
-        denominator2 //= gcd2
-        
-        # 분자와 분모가 같으면 스킵
-        if numerator1 == denominator1 or numerator2 == denominator2:
-            continue
-        
-        # 나누어 떨어지지 않는 경우인지 확인
-        if numerator1 * denominator2 % (denominator1 * numerator2) == 0:
-            continue
-        
-        # 두 분수의 분모가 다른지 확인
-        if denominator1 == denominator2:
-            continue
-        
-        result = Fraction(numerator1, denominator1) / Fraction(numerator2, denominator2)
-        return {
-            'numerator1': numerator1,
-            'denominator1': denominator1,
-            'numerator2': numerator2,
-            'denominator2': denominator2,
-            'result': result,
-            'result_num': result.numerator,
-            'result_den': result.denominator
-        }
+    st.markdown("""
+    <div class='em-box em-indigo'>
+        <p class='em-lead'>
+            <strong><span class='em-badge em-b-violet'>분수의 나눗셈과 통분</span></strong>
+        </p>
+        <p class='em-center'>
+            <span class='em-hl em-h-lavender'>분모를 같게 만든 후에는 분자끼리만 나누면 돼요!</span>
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
     
-    # 최후의 수단: 간단한 기약분수 반환
-    result = Fraction(2, 3) / Fraction(3, 5)
+    st.write("""
+    예: $\\frac{3}{4} \\div \\frac{1}{4} = 3 \\div 1 = 3$ (분모가 같으면 분자끼리만 나눔)
+    """)
     
-    return {
-        'numerator1': numerator1,
-        'denominator1': denominator1,
-        'numerator2': numerator2,
-        'denominator2': denominator2,
-        'result': result,
-        'result_num': result.numerator,
-        'result_den': result.denominator
-    }
-
-
-def make_practice_problems(example_problem, n=3):
-    """예시 문제와 중복되지 않고 서로 다른 연습문제 n개 생성.
-    다양성을 위해 결과값이 서로 다르도록 노력합니다.
-    """
-    problems = []
-    seen = set()
-    result_values = set()
+    st.write("---")
+
+@timed('ui_concept')
+def show_stage2_concept(example):
+    """단계 2 연습 문제 전에 보여주는 역수 개념 설명과 예시 풀이"""
+    show_block('example', 2, example)
     
-    # 예시 문제를 seen에 추가
-    ex_key = (example_problem['numerator1'], example_problem['denominator1'], 
-              example_problem['numerator2'], example_problem['denominator2'])
-    seen.add(ex_key)
-    result_values.add((example_problem['result_num'], example_problem['result_den']))
+    st.markdown("""
+    <div class='em-note em-yellow'>
+        <strong>하지만 <span class='em-hl em-h-yellow'>역수</span>를 이용하면 쉽게 풀 수 있어요! 🎯</strong>
+    </div>
+    """, unsafe_allow_html=True)
     
-    attempts = 0
-    max_attempts = 5000
+    st.write("---")
     
-    while len(problems) < n and attempts < max_attempts:
-        p = generate_non_divisible_problem()
-        key = (p['numerator1'], p['denominator1'], p['numerator2'], p['denominator2'])
-        result_key = (p['result_num'], p['result_den'])
-        attempts += 1
-        
-        # 이미 본 문제면 스킵
-        if key in seen:
-            continue
-        
-        # 결과가 너무 비슷한 문제는 70% 확률로 스킵 (다양성 추구)
-        if result_key in result_values and random.random() < 0.7:
-            continue
-            
-        # 새로운 문제 추가
-        seen.add(key)
-        result_values.add(result_key)
-        problems.append(p)
+    st.write("""
+    ### 🔑 핵심 개념: 역수
+    """)
     
-    return problems
+    st.markdown("""
+    <div class='em-box em-orange'>
+        <p class='em-lead'>
+            <strong><span class='em-badge em-b-orange'>역수란?</span></strong> 
+            분자와 분모를 뒤집은 분수예요.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.write("""
+    - $\\frac{3}{4}$의 역수 → $\\frac{4}{3}$
+    - $\\frac{2}{5}$의 역수 → $\\frac{5}{2}$
+    """)
+    
+    st.markdown("""
+    <div class='em-box em-green'>
+        <p class='em-lead em-center'>
+            <strong><span class='em-badge em-b-lime'>분수의 나눗셈 = 역수의 곱셈</span></strong> ✨
+        </p>
+        <p class='em-center'>
+            분수를 나누는 것은 역수를 곱하는 것과 같아요!
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.write("---")
+    
+    show_block('example_solution', 2, example)
+    
+    st.write("---")
+    
+    st.markdown("""
+    <div class='em-box em-summary em-purple'>
+        <h4>✨ 정리 ✨</h4>
+        <p class='em-lead em-center'>
+            <span class='em-hl em-bold em-h-pink'>
+                분수의 나눗셈 = 두 번째 분수를 뒤집어서 곱하기!
+            </span>
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.write("""
+    $$\\frac{a}{b} \\div \\frac{c}{d} = \\frac{a}{b} \\times \\frac{d}{c}$$
+    """)
+
+# ---------- 버튼 콜백 ----------
+# 버튼을 누르면 콜백이 먼저 상태를 바꾸고, 바로 이어지는 한 번의 실행에서 결과를 그립니다.
+# 그래서 문제 하나를 풀 때 "다음 문제" 같은 추가 버튼과 st.rerun()이 필요 없습니다.
+
+def submit_answer(stage):
+    """답 제출: 채점, 기록, 다음 문제로 이동, 피드백 저장"""
+    state = st.session_state
+    index = state[f'stage{stage}_index']
+    problem = state[f'stage{stage}_problems'][index]
+    user_denominator = state[answer_key(stage, 'den', index)]
+    user_numerator = state[answer_key(stage, 'num', index)]
+    correct = check_answer(user_numerator, user_denominator, problem['result_num'], problem['result_den'])
+    state.problem_history.record(stage, problem, correct)
+    shown = state.get(f'stage{stage}_shown_at')
+    seconds = time.monotonic() - shown[1] if shown and shown[0] == problem else None
+    state.student_stats.record(stage, problem, correct, seconds)
+    count('answers_correct' if correct else 'answers_wrong')
+    if correct:
+        state.correct_count += 1
+        state[f'stage{stage}_index'] = index + 1
+        state[f'stage{stage}_attempts'] = 0
+        state[f'stage{stage}_feedback'] = ('correct', problem)
+    else:
+        # 오답 처리: 첫 번째 오답일 때는 정답을 숨기고, 두 번째 오답부터 정답을 보여줌
+        state[f'stage{stage}_attempts'] += 1
+        state[f'stage{stage}_feedback'] = ('wrong', problem)
+    end_transition()  # 맞혔으면 지난 문제의 답 입력칸도 지움
+
+def go_to_stage2():
+    st.session_state.stage = 2
+    end_transition()  # 단계 1 문제와 위젯 키는 더 쓰지 않음
+
+def understand_concept():
+    st.session_state.stage2_concept_understood = True
+    end_transition()
 
-def check_answer(user_num, user_den, correct_num, correct_den):
-    """사용자 답 검증"""
-    # 기약분수로 변환하여 비교
-    user_fraction = Fraction(user_num, user_den)
-    correct_fraction = Fraction(correct_num, correct_den)
-    return user_fraction == correct_fraction
+def restart_all():
+    """처음부터 다시 시작: 기록과 단계별 상태를 모두 지움"""
+    st.session_state.stage = 1
+    st.session_state.correct_count = 0
+    st.session_state.problem_history = new_problem_history()
+    clear_stages(st.session_state)
 
+def class_code():
+    """사이드바에 넣은 반 코드 (없으면 빈 문자열)"""
+    return normalize_code(st.session_state.get('class_code', ''))
 
-def safe_rerun():
-    """Streamlit 버전 차이로 인해 `experimental_rerun`이 없을 때를 대비한 안전한 재실행 함수.
-    가능한 경우 `st.experimental_rerun()` 또는 `st.rerun()`을 호출하고, 둘 다 없으면
-    세션 상태 플래그를 토글하고 `st.stop()`으로 현재 실행을 중단합니다.
+def new_stage1_set():
+    """단계 1 세 문제: 반 코드가 있으면 반 전체가 같은 세트, 없으면 미리 만들어 둔 세트
+    (단계 1 문제를 푼 기록이 있으면, 즉 처음부터 다시 하면 학생의 지금 난이도 구간에서 고른 세트)
     """
-    try:
-        if hasattr(st, "experimental_rerun"):
-            st.experimental_rerun()
-            return
-    except Exception:
-        pass
-    try:
-        if hasattr(st, "rerun"):
-            st.rerun()
-            return
-    except Exception:
-        pass
-    # 최후의 수단: 세션 플래그 토글 후 실행 중단 — UI의 다음 상호작용 때 스크립트가 재실행됩니다.
-    st.session_state["_rerun_flag"] = not st.session_state.get("_rerun_flag", False)
-    st.stop()
+    if class_code():
+        return class_stage1_set(class_code())
+    return prefetcher(1).take()
+
+def new_stage2_set():
+    """예시 문제와 연습 문제 세트로 바꿈 (단계 2 시작, 추가 연습하기)
+    반 코드가 있으면 '추가 연습하기'를 누른 횟수마다 반 전체가 같은 세트를 받습니다.
+    """
+    if class_code():
+        round_number = st.session_state.get('stage2_round', 0)
+        example, problems = class_stage2_set(class_code(), round_number)
+        st.session_state.stage2_round = round_number + 1
+    else:
+        # 단계 2 문제를 푼 기록이 있으면(추가 연습) 연습 문제는 학생의 지금 난이도 구간에서 고른 세트
+        example, problems = prefetcher(2).take()
+    st.session_state.stage2_example = example
+    st.session_state.stage2_problems = problems
+    st.session_state.stage2_index = 0
+    st.session_state.stage2_attempts = 0
+    end_transition()  # 지난 세트의 답 입력칸을 지움
+
+# ---------- 문제 풀이 영역 ----------
+# 숫자를 입력하거나 답을 제출하면 페이지 전체가 아니라 아래 fragment만 다시 실행됩니다.
+# 정답을 맞혀 다음 문제로 넘어갈 때 바뀌는 것(맞힌 수, 문제 번호, 방금 푼 문제의 풀이)도 fragment 안에서
+# 그리므로 한 번의 실행으로 끝나고, 단계 2의 긴 개념 설명은 다시 그리지 않고 그대로 둡니다.
+
+def pop_correct_feedback(stage):
+    """방금 맞힌 문제의 피드백을 꺼냄 (오답 피드백은 풀이 영역에서 꺼냄)"""
+    feedback = st.session_state.get(f'stage{stage}_feedback')
+    if feedback and feedback[0] == 'correct':
+        return st.session_state.pop(f'stage{stage}_feedback')
+    return None
+
+def progress_text(stage):
+    """맞힌 문제 수 표시"""
+    if stage == 1:
+        return f"✅ 맞춘 문제: {st.session_state.correct_count}/3"
+    return f"✅ 총 맞춘 문제: {st.session_state.correct_count}개"
+
+@st.fragment
+def answer_area(stage):
+    """진행 상황, 방금 맞힌 문제의 풀이, (단계 1 첫 문제의) 개념 설명, 문제, 힌트, 답 입력, 오답 피드백"""
+    state = st.session_state
+    # 답 입력 영역만 다시 실행될 때도 실행 횟수에 넣음 (전체 실행 안에서는 위에서 이미 셌음)
+    state.problem_history.note_run(fragment=True)
+    problem_index = state[f'stage{stage}_index']
+    problems = state[f'stage{stage}_problems']
+    if problem_index >= len(problems):
+        # 세트의 마지막 문제를 맞히면 완료 화면으로 바뀌므로 전체를 다시 실행 (세트마다 한 번)
+        st.rerun(scope="app")
+    problem = problems[problem_index]
+    if state.get(f'stage{stage}_shown_at', (None,))[0] != problem:
+        # 풀이 시간을 재기 위해 문제를 처음 보여준 시각을 기록
+        state[f'stage{stage}_shown_at'] = (problem, time.monotonic())
+
+    # 방금 맞힌 문제의 풀이는 다음 문제 위에 보여줌
+    feedback = state.pop(f'stage{stage}_feedback', None)
+    if feedback and feedback[0] == 'correct':
+        show_feedback(stage, feedback)
+        st.write(f"다음 문제로 넘어갑니다: {problem_index + 1}번 문제")
+        st.write("---")
+        feedback = None
 
-# ========== 단계 1: 기초 단계 (나누어지는 분수) ==========
-if st.session_state.stage == 1:
-    st.subheader("📚 단계 1: 나누어지는 분수로 배우기")
-    
     col1, col2 = st.columns(2)
     with col1:
-        st.info(f"✅ 맞춘 문제: {st.session_state.correct_count}/3")
+        st.info(progress_text(stage))
     with col2:
-        if st.session_state.correct_count >= 3:
-            st.success("🎉 다음 단계로 갈 준비가 됐어요!")
+        st.info(f"문제 {problem_index + 1} / 3")
+
+    # 첫 번째 문제일 때만 통분 개념 설명
+    if stage == 1 and problem_index == 0:
+        show_stage1_concept()
+
+    # 문제 출제
+    show_problem(stage, problem)
+    show_hint(stage, problem)
+
+    # 답 입력
+    st.write("### 답을 입력하세요")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.number_input("분모", min_value=1, value=1, key=answer_key(stage, 'den', problem_index))
+    with col2:
+        st.number_input("분자", min_value=1, value=1, key=answer_key(stage, 'num', problem_index))
+
+    # 답 제출
+    st.button("✓ 답 제출", key=stage_key(stage, 'submit'), on_click=submit_answer, args=(stage,))
+    if feedback:
+        show_feedback(stage, feedback)
+
+# 반 모드: 같은 반 코드를 넣은 학생은 모두 같은 문제를 풂 (코드를 바꾸면 처음부터 다시 시작)
+st.sidebar.text_input("반 코드", key='class_code', on_change=restart_all,
+                      help="선생님이 알려 준 반 코드를 넣으면 반 친구들과 같은 문제를 풀어요.")
+
+# 스크립트 실행 횟수 (문제 하나를 맞힐 때까지 몇 번 실행되는지 기록)
+st.session_state.problem_history.note_run()
+count('page_runs')
+
+# ========== 단계 1: 기초 단계 (나누어지는 분수) ==========
+if st.session_state.stage == 1:
+    st.subheader("📚 단계 1: 나누어지는 분수로 배우기")
     
     st.write("""
     **분수의 나눗셈 - 기초 단계**
@@ -350,287 +413,35 @@ if st.session_state.stage == 1:
     
     # 1단계에서는 연속 3문제를 풀도록 구성
     if 'stage1_problems' not in st.session_state or len(st.session_state.get('stage1_problems', [])) < 3:
-        # 3개의 서로 다른 문제를 생성 (중복 없이)
-        stage1_problems = []
-        seen_problems = set()
-        attempts = 0
-        max_attempts = 1000
-        
-        while len(stage1_problems) < 3 and attempts < max_attempts:
-            p = generate_divisible_problem()
-            problem_key = (p['numerator1'], p['denominator1'], p['numerator2'], p['denominator2'])
-            attempts += 1
-            
-            # 이미 생성된 문제면 스킵
-            if problem_key in seen_problems:
-                continue
-            
-            # 너무 단순한 패턴 추가 체크: 결과가 1이 아닌 다양한 답이 나오도록
-            # 한 문제 정도는 결과가 1이 아닌 것으로
-            if len(stage1_problems) == 0 or len(stage1_problems) == 2:
-                # 첫 번째, 세 번째 문제는 결과가 다양하도록
-                if p['result_num'] == 1 and random.random() < 0.3:  # 30% 확률로 스킵 (결과=1인 경우)
-                    continue
-            elif len(stage1_problems) == 1:
-                # 두 번째 문제는 결과가 1이 아닌 것으로
-                if p['result_num'] == 1 and random.random() < 0.7:  # 70% 확률로 스킵
-                    continue
-            
-            seen_problems.add(problem_key)
-            stage1_problems.append(p)
-        
-        st.session_state.stage1_problems = stage1_problems
+        # 3개의 서로 다른 문제를 미리 만들어 둔 목록에서 고르기 (중복 없이, 백그라운드에서 미리 골라 둠)
+        st.session_state.stage1_problems = new_stage1_set()
         st.session_state.stage1_index = 0
         st.session_state.stage1_attempts = 0
+        end_transition()
 
     # 문제 인덱스가 3(모두 풀음) 이상이면 바로 완료 UI를 보여주고
     # 문제 리스트에 접근하지 않도록 처리합니다 (IndexError 방지).
     if st.session_state.stage1_index >= 3:
+        feedback = pop_correct_feedback(1)
+        if feedback:
+            show_feedback(1, feedback)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(progress_text(1))
+        with col2:
+            st.success("🎉 다음 단계로 갈 준비가 됐어요!")
         st.info("🚀 3문제를 모두 맞췄어요! 다음 단계로 진행해보세요.")
-        if st.button("다음 단계로 이동 →"):
-            st.session_state.stage = 2
-            st.session_state.current_problem = None
-            st.rerun()
+        st.button("다음 단계로 이동 →", on_click=go_to_stage2)
         # 이후 코드가 문제에 접근하지 않도록 return으로 종료
         # (한 번에 하나의 Streamlit 스크립트 실행 흐름이므로 안전하게 종료)
         st.stop()
 
-    problem_index = st.session_state.stage1_index
-    problem = st.session_state.stage1_problems[problem_index]
-
-    st.info(f"문제 {problem_index + 1} / 3")
-    
-    # 첫 번째 문제일 때만 통분 개념 설명
-    if problem_index == 0:
-        st.write("""
-        ### 📚 개념 설명: 통분
-        """)
-        
-        st.markdown("""
-        <div style='background-color: #bbdefb; padding: 20px; border-radius: 10px; border: 3px solid #2196f3;'>
-            <p style='font-size: 1.1em; margin-bottom: 15px;'>
-                <strong><span style='background-color: #42a5f5; color: white; padding: 3px 10px; border-radius: 5px;'>통분이란?</span></strong> 
-                분모가 다른 분수들을 분모가 같은 분수로 만드는 것이에요!
-            </p>
-            <p style='font-size: 1.05em; margin-bottom: 10px;'><strong>예를 들어:</strong></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write("""
-        - $\\frac{1}{2}$와 $\\frac{1}{3}$을 통분하면 → $\\frac{3}{6}$와 $\\frac{2}{6}$
-        """)
-        
-        st.markdown("""
-        <div style='background-color: #bbdefb; padding: 15px 20px; border-radius: 10px; border: 3px solid #2196f3; margin-top: -10px;'>
-            <p style='font-size: 1.05em; margin: 0;'>공통 분모는 2와 3의 <span style='background-color: #90caf9; padding: 2px 6px; border-radius: 3px;'>최소공배수</span>인 6이에요!</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div style='background-color: #c5cae9; padding: 20px; border-radius: 10px; border: 3px solid #673ab7; margin-top: 15px;'>
-            <p style='font-size: 1.15em; margin-bottom: 10px;'>
-                <strong><span style='background-color: #7e57c2; color: white; padding: 5px 12px; border-radius: 5px;'>분수의 나눗셈과 통분</span></strong>
-            </p>
-            <p style='font-size: 1.05em; text-align: center; margin: 0;'>
-                <span style='background-color: #b39ddb; padding: 3px 10px; border-radius: 5px;'>분모를 같게 만든 후에는 분자끼리만 나누면 돼요!</span>
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write("""
-        예: $\\frac{3}{4} \\div \\frac{1}{4} = 3 \\div 1 = 3$ (분모가 같으면 분자끼리만 나눔)
-        """)
-        
-        st.write("---")
-    
-    # 문제 출제
-    st.write(f"""
-    ### 문제
-    
-    다음 분수의 나눗셈을 계산하세요:
-    
-    $$\\frac{{{problem['numerator1']}}}{{{problem['denominator1']}}} \\div \\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}}$$
-    """)
-    
-    # 힌트 표시 (풀이 과정은 숨김)
-    with st.expander("💡 힌트 보기"):
-        # 통분을 위한 최소공배수 계산
-        from math import lcm
-        common_denom = lcm(problem['denominator1'], problem['denominator2'])
-        mult1 = common_denom // problem['denominator1']
-        mult2 = common_denom // problem['denominator2']
-        
-        new_num1 = problem['numerator1'] * mult1
-        new_num2 = problem['numerator2'] * mult2
-        
-        st.markdown(f"""
-        <div style='background-color: #e1f5fe; padding: 15px; border-radius: 8px; border-left: 5px solid #0288d1;'>
-            <p><strong><span style='background-color: #4fc3f7; padding: 2px 8px; border-radius: 3px;'>통분</span>을 이용해서 풀어보세요!</strong></p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write(f"""
-        **분모를 같게 만들어요 (<span style='background-color: #81d4fa; padding: 2px 6px; border-radius: 3px;'>통분</span>):**
-        
-        $\\frac{{{problem['numerator1']}}}{{{problem['denominator1']}}}$ → $\\frac{{{new_num1}}}{{{common_denom}}}$
-        
-        $\\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}}$ → $\\frac{{{new_num2}}}{{{common_denom}}}$
-        
-        """)
-        
-        st.markdown(f"""
-        <p><strong>이제 분모가 같으니 <span style='background-color: #b39ddb; padding: 2px 8px; border-radius: 3px;'>분자끼리만 나누면</span> 돼요:</strong></p>
-        """, unsafe_allow_html=True)
-        
-        st.write(f"""
-        $\\frac{{{new_num1}}}{{{common_denom}}} \\div \\frac{{{new_num2}}}{{{common_denom}}} = {new_num1} \\div {new_num2}$
-        
-        정답을 맞춘 후에 풀이 과정을 배워볼 수 있어요! 🎯
-        """)
-    
-    # 답 입력
-    st.write("### 답을 입력하세요")
-    col1, col2 = st.columns(2)
-    with col1:
-        user_denominator = st.number_input("분모", min_value=1, value=1, key=f"den_stage1_{problem_index}")
-    with col2:
-        user_numerator = st.number_input("분자", min_value=1, value=1, key=f"num_stage1_{problem_index}")
-    
-    # 답 제출
-    if st.button("✓ 답 제출", key="submit_stage1"):
-        # 정답 검사
-        if check_answer(user_numerator, user_denominator, 
-                       problem['result_num'], problem['result_den']):
-            st.success("🎉 정답입니다!")
-            
-            # 통분을 이용한 풀이 과정 표시
-            from math import lcm
-            common_denom = lcm(problem['denominator1'], problem['denominator2'])
-            mult1 = common_denom // problem['denominator1']
-            mult2 = common_denom // problem['denominator2']
-            
-            new_num1 = problem['numerator1'] * mult1
-            new_num2 = problem['numerator2'] * mult2
-            
-            with st.expander("📖 풀이 과정 보기"):
-                st.markdown(f"""
-                <p style='font-size: 1.1em; margin-bottom: 15px;'>
-                    <strong><span style='background-color: #4fc3f7; padding: 3px 10px; border-radius: 5px;'>통분</span>을 이용한 풀이:</strong>
-                </p>
-                """, unsafe_allow_html=True)
-                
-                st.markdown(f"""
-                <p><strong>1단계: <span style='background-color: #81d4fa; padding: 2px 8px; border-radius: 3px;'>통분하기</span></strong></p>
-                """, unsafe_allow_html=True)
-                
-                st.write(f"""
-                분모 {problem['denominator1']}과 {problem['denominator2']}의 <span style='background-color: #b39ddb; padding: 2px 6px; border-radius: 3px;'>최소공배수</span>는 {common_denom}이에요.
-                
-                $\\frac{{{problem['numerator1']}}}{{{problem['denominator1']}}} \\times \\frac{{{mult1}}}{{{mult1}}} = \\frac{{{new_num1}}}{{{common_denom}}}$
-                
-                $\\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}} \\times \\frac{{{mult2}}}{{{mult2}}} = \\frac{{{new_num2}}}{{{common_denom}}}$
-                
-                """)
-                
-                st.markdown(f"""
-                <p><strong>2단계: 분모가 같으니 <span style='background-color: #ce93d8; padding: 2px 8px; border-radius: 3px;'>분자끼리 나누기</span></strong></p>
-                """, unsafe_allow_html=True)
-                
-                st.write(f"""
-                $\\frac{{{new_num1}}}{{{common_denom}}} \\div \\frac{{{new_num2}}}{{{common_denom}}} = {new_num1} \\div {new_num2} = {problem['result_num']}/{problem['result_den']}$
-                """)
-            
-            st.session_state.correct_count += 1
-            st.session_state.problem_history.append({
-                'stage': 1,
-                'problem': problem,
-                'correct': True
-            })
-
-            # 다음 문제로 이동
-            st.session_state.stage1_index += 1
-            st.session_state.stage1_attempts = 0
-
-            if st.session_state.stage1_index >= 3:
-                st.info("🚀 3문제를 모두 맞췄어요! 다음 단계로 진행해보세요.")
-                if st.button("다음 단계로 이동 →"):
-                    st.session_state.stage = 2
-                    # 정리
-                    st.session_state.current_problem = None
-                    st.rerun()
-            else:
-                st.write(f"다음 문제로 넘어갑니다: {st.session_state.stage1_index + 1}번 문제")
-                if st.button("다음 문제", key="next_stage1"):
-                    st.rerun()
-        else:
-            # 오답 처리: 첫 번째 오답일 때는 정답을 숨기고, 두 번째 오답부터 정답을 보여줌
-            st.session_state.stage1_attempts += 1
-            attempts = st.session_state.stage1_attempts
-            if attempts == 1:
-                st.error("❌ 틀렸어요. 힌트를 확인하고 다시 시도해보세요!")
-                if st.button("다시 풀기", key="retry_stage1_a"):
-                    st.rerun()
-            else:
-                st.error("❌ 또 틀렸어요. 아래에 정답을 참고하세요.")
-                
-                # 통분을 이용한 풀이 과정 표시
-                from math import lcm
-                common_denom = lcm(problem['denominator1'], problem['denominator2'])
-                mult1 = common_denom // problem['denominator1']
-                mult2 = common_denom // problem['denominator2']
-                
-                new_num1 = problem['numerator1'] * mult1
-                new_num2 = problem['numerator2'] * mult2
-                
-                with st.expander("📖 풀이 과정 보기"):
-                    st.markdown(f"""
-                    <p style='font-size: 1.1em; margin-bottom: 15px;'>
-                        <strong><span style='background-color: #4fc3f7; padding: 3px 10px; border-radius: 5px;'>통분</span>을 이용한 풀이:</strong>
-                    </p>
-                    """, unsafe_allow_html=True)
-                    
-                    st.markdown(f"""
-                    <p><strong>1단계: <span style='background-color: #81d4fa; padding: 2px 8px; border-radius: 3px;'>통분하기</span></strong></p>
-                    """, unsafe_allow_html=True)
-                    
-                    st.write(f"""
-                    분모 {problem['denominator1']}과 {problem['denominator2']}의 <span style='background-color: #b39ddb; padding: 2px 6px; border-radius: 3px;'>최소공배수</span>는 {common_denom}이에요.
-                    
-                    $\\frac{{{problem['numerator1']}}}{{{problem['denominator1']}}} \\times \\frac{{{mult1}}}{{{mult1}}} = \\frac{{{new_num1}}}{{{common_denom}}}$
-                    
-                    $\\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}} \\times \\frac{{{mult2}}}{{{mult2}}} = \\frac{{{new_num2}}}{{{common_denom}}}$
-                    
-                    """)
-                    
-                    st.markdown(f"""
-                    <p><strong>2단계: 분모가 같으니 <span style='background-color: #ce93d8; padding: 2px 8px; border-radius: 3px;'>분자끼리 나누기</span></strong></p>
-                    """, unsafe_allow_html=True)
-                    
-                    st.write(f"""
-                    $\\frac{{{new_num1}}}{{{common_denom}}} \\div \\frac{{{new_num2}}}{{{common_denom}}} = {new_num1} \\div {new_num2} = {problem['result_num']}/{problem['result_den']}$
-                    """)
-                
-                st.write(f"**정답: {problem['result_num']}/{problem['result_den']}**")
-                if st.button("다시 풀기", key="retry_stage1_b"):
-                    st.rerun()
+    answer_area(1)
 
 # ========== 단계 2: 심화 단계 (나누어지지 않는 분수) ==========
 elif st.session_state.stage == 2:
     st.subheader("🚀 단계 2: 더 어려운 분수로 배우기")
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.info(f"✅ 총 맞춘 문제: {st.session_state.correct_count}개")
-    with col2:
-        if st.button("🔄 처음부터 다시 시작", key="stage2_restart"):
-            st.session_state.stage = 1
-            st.session_state.correct_count = 0
-            st.session_state.current_problem = None
-            st.session_state.problem_history = []
-            for k in list(st.session_state.keys()):
-                if k.startswith('stage2_'):
-                    del st.session_state[k]
-            st.rerun()
+    st.button("🔄 처음부터 다시 시작", key="stage2_restart", on_click=restart_all)
     
     # 개념 이해 여부 확인
     if 'stage2_concept_understood' not in st.session_state:
@@ -644,113 +455,15 @@ elif st.session_state.stage == 2:
         이제는 **분모끼리 나누어 떨어지지 않는** 분수의 나눗셈을 배워볼 거예요!
         """)
         
-        # 예시 문제 생성 (한 번만)
+        # 예시 문제와 연습 문제 세트 준비 (한 번만)
         if 'stage2_example' not in st.session_state:
-            st.session_state.stage2_example = generate_non_divisible_problem()
+            new_stage2_set()
         
         example = st.session_state.stage2_example
-        
-        st.write(f"""
-        ### 📚 개념 설명: 역수를 이용한 분수의 나눗셈
-        
-        **예시 문제를 함께 풀어볼게요!**
-        
-        $$\\frac{{{example['numerator1']}}}{{{example['denominator1']}}} \\div \\frac{{{example['numerator2']}}}{{{example['denominator2']}}}$$
-        
-        분모끼리 나누어떨어지지 않아서 단계 1 방법으로는 풀기 어려워요.
-        """)
-        
-        st.markdown("""
-        <div style='background-color: #fff59d; padding: 15px; border-radius: 10px; border-left: 5px solid #fbc02d;'>
-            <strong style='font-size: 1.1em;'>하지만 <span style='background-color: #ffeb3b; padding: 2px 8px; border-radius: 3px;'>역수</span>를 이용하면 쉽게 풀 수 있어요! 🎯</strong>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write("---")
-        
-        st.write("""
-        ### 🔑 핵심 개념: 역수
-        """)
-        
-        st.markdown("""
-        <div style='background-color: #ffccbc; padding: 20px; border-radius: 10px; border: 3px solid #ff5722;'>
-            <p style='font-size: 1.1em; margin-bottom: 10px;'>
-                <strong><span style='background-color: #ff9800; color: white; padding: 3px 10px; border-radius: 5px;'>역수란?</span></strong> 
-                분자와 분모를 뒤집은 분수예요.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write("""
-        - $\\frac{3}{4}$의 역수 → $\\frac{4}{3}$
-        - $\\frac{2}{5}$의 역수 → $\\frac{5}{2}$
-        """)
-        
-        st.markdown("""
-        <div style='background-color: #c8e6c9; padding: 20px; border-radius: 10px; border: 3px solid #4caf50; margin-top: 15px;'>
-            <p style='font-size: 1.2em; text-align: center; margin: 0;'>
-                <strong><span style='background-color: #8bc34a; color: white; padding: 5px 15px; border-radius: 5px; font-size: 1.1em;'>분수의 나눗셈 = 역수의 곱셈</span></strong> ✨
-            </p>
-            <p style='text-align: center; margin-top: 10px; font-size: 1.05em;'>
-                분수를 나누는 것은 역수를 곱하는 것과 같아요!
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write("---")
-        
-        st.write(f"""
-        ### 📖 풀이 과정
-        
-        $$\\frac{{{example['numerator1']}}}{{{example['denominator1']}}} \\div \\frac{{{example['numerator2']}}}{{{example['denominator2']}}}$$
-        """)
-        
-        st.markdown(f"""
-        <p><strong>Step 1:</strong> 두 번째 분수의 <span style='background-color: #ffeb3b; padding: 2px 8px; border-radius: 3px; font-weight: bold;'>역수</span>를 구해요</p>
-        """, unsafe_allow_html=True)
-        
-        st.write(f"""
-        $$\\frac{{{example['numerator2']}}}{{{example['denominator2']}}} \\text{{의 역수}} = \\frac{{{example['denominator2']}}}{{{example['numerator2']}}}$$
-        """)
-        
-        st.markdown(f"""
-        <p><strong>Step 2:</strong> 나눗셈을 <span style='background-color: #a5d6a7; padding: 2px 8px; border-radius: 3px; font-weight: bold;'>역수의 곱셈</span>으로 바꿔요</p>
-        """, unsafe_allow_html=True)
-        
-        st.write(f"""
-        
-        $$\\frac{{{example['numerator1']}}}{{{example['denominator1']}}} \\div \\frac{{{example['numerator2']}}}{{{example['denominator2']}}} = \\frac{{{example['numerator1']}}}{{{example['denominator1']}}} \\times \\frac{{{example['denominator2']}}}{{{example['numerator2']}}}$$
-        
-        **Step 3:** 분자끼리, 분모끼리 곱해요
-        
-        $$= \\frac{{{example['numerator1']} \\times {example['denominator2']}}}{{{example['denominator1']} \\times {example['numerator2']}}} = \\frac{{{example['numerator1'] * example['denominator2']}}}{{{example['denominator1'] * example['numerator2']}}}$$
-        
-        **Step 4:** 약분하면 최종 답!
-        
-        $$= \\frac{{{example['result_num']}}}{{{example['result_den']}}}$$
-        """)
-        
-        st.write("---")
-        
-        st.markdown("""
-        <div style='background-color: #e1bee7; padding: 25px; border-radius: 15px; border: 4px solid #9c27b0;'>
-            <h4 style='text-align: center; color: #6a1b9a; margin-bottom: 15px;'>✨ 정리 ✨</h4>
-            <p style='text-align: center; font-size: 1.2em; margin: 0;'>
-                <span style='background-color: #ce93d8; padding: 5px 15px; border-radius: 8px; font-weight: bold; font-size: 1.1em;'>
-                    분수의 나눗셈 = 두 번째 분수를 뒤집어서 곱하기!
-                </span>
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write("""
-        $$\\frac{a}{b} \\div \\frac{c}{d} = \\frac{a}{b} \\times \\frac{d}{c}$$
-        """)
+        show_stage2_concept(example)
         
         st.write("")
-        if st.button("✅ 이해했어요! 연습문제 풀러 가기 →", key="understand_concept"):
-            st.session_state.stage2_concept_understood = True
-            st.rerun()
+        st.button("✅ 이해했어요! 연습문제 풀러 가기 →", key="stage2_understand", on_click=understand_concept)
         
         st.stop()
     
@@ -760,8 +473,8 @@ elif st.session_state.stage == 2:
     """)
     
     st.markdown("""
-    <div style='background-color: #b2dfdb; padding: 12px; border-radius: 8px; border-left: 5px solid #00897b; margin-bottom: 15px;'>
-        <strong style='font-size: 1.05em;'><span style='background-color: #4db6ac; color: white; padding: 2px 8px; border-radius: 3px;'>역수</span>를 이용하면 어떤 분수든 나눌 수 있어요! 💪</strong><br>
+    <div class='em-note em-teal'>
+        <strong><span class='em-badge em-b-teal'>역수</span>를 이용하면 어떤 분수든 나눌 수 있어요! 💪</strong><br>
         이제 3문제를 풀어보세요!
     </div>
     """, unsafe_allow_html=True)
@@ -773,9 +486,14 @@ elif st.session_state.stage == 2:
         st.session_state.stage2_problems = make_practice_problems(example, 3)
         st.session_state.stage2_index = 0
         st.session_state.stage2_attempts = 0
+        end_transition()
     
     # 3문제를 모두 풀었는지 확인
     if st.session_state.stage2_index >= 3:
+        feedback = pop_correct_feedback(2)
+        if feedback:
+            show_feedback(2, feedback)
+            st.write("---")
         st.balloons()
         st.success("🎉🎉🎉 축하합니다! 분수의 나눗셈 학습을 완료했어요!")
         st.write(f"""
@@ -793,124 +511,9 @@ elif st.session_state.stage == 2:
         
         col_a, col_b = st.columns(2)
         with col_a:
-            if st.button("🔄 처음부터 다시 하기", key="stage2_restart_all"):
-                st.session_state.stage = 1
-                st.session_state.correct_count = 0
-                st.session_state.current_problem = None
-                st.session_state.problem_history = []
-                for k in list(st.session_state.keys()):
-                    if k.startswith('stage1_') or k.startswith('stage2_'):
-                        del st.session_state[k]
-                st.rerun()
+            st.button("🔄 처음부터 다시 하기", key="stage2_restart_all", on_click=restart_all)
         with col_b:
-            if st.button("➕ 추가 연습하기", key="stage2_more_practice"):
-                # 새로운 문제 세트 생성
-                example = generate_non_divisible_problem()
-                st.session_state.stage2_example = example
-                st.session_state.stage2_problems = make_practice_problems(example, 3)
-                st.session_state.stage2_index = 0
-                st.session_state.stage2_attempts = 0
-                st.rerun()
+            st.button("➕ 추가 연습하기", key="stage2_more_practice", on_click=new_stage2_set)
         st.stop()
     
-    problem_index = st.session_state.stage2_index
-    problem = st.session_state.stage2_problems[problem_index]
-    
-    st.info(f"문제 {problem_index + 1} / 3")
-    
-    # 문제 출제
-    st.write(f"""
-    ### 문제
-    
-    다음 분수의 나눗셈을 계산하세요:
-    
-    $$\\frac{{{problem['numerator1']}}}{{{problem['denominator1']}}} \\div \\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}}$$
-    """)
-    
-    # 힌트 표시
-    with st.expander("💡 힌트 보기"):
-        st.markdown(f"""
-        <div style='background-color: #fff9c4; padding: 15px; border-radius: 8px; border-left: 5px solid #f57f17;'>
-            <p><strong>분수의 나눗셈은 <span style='background-color: #ffeb3b; padding: 2px 8px; border-radius: 3px; font-weight: bold;'>역수</span>를 이용해요!</strong></p>
-            <ol>
-                <li>두 번째 분수를 뒤집어요 (<span style='background-color: #ffeb3b; padding: 2px 6px; border-radius: 3px;'>역수</span>)</li>
-                <li>나눗셈을 <span style='background-color: #a5d6a7; padding: 2px 6px; border-radius: 3px;'>곱셈</span>으로 바꿔요</li>
-                <li>분자끼리, 분모끼리 곱해요</li>
-                <li>약분해요</li>
-            </ol>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.write(f"""
-        두 번째 분수: $\\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}}$ → 역수: $\\frac{{{problem['denominator2']}}}{{{problem['numerator2']}}}$
-        """)
-    
-    # 답 입력
-    st.write("### 답을 입력하세요")
-    col1, col2 = st.columns(2)
-    with col1:
-        user_denominator = st.number_input("분모", min_value=1, value=1, key=f"den_stage2_{problem_index}")
-    with col2:
-        user_numerator = st.number_input("분자", min_value=1, value=1, key=f"num_stage2_{problem_index}")
-    
-    # 답 제출
-    if st.button("✓ 답 제출", key="submit_stage2"):
-        if check_answer(user_numerator, user_denominator, 
-                       problem['result_num'], problem['result_den']):
-            st.success("🎉 정답입니다!")
-            st.session_state.correct_count += 1
-            st.session_state.problem_history.append({
-                'stage': 2,
-                'problem': problem,
-                'correct': True
-            })
-            
-            # 풀이과정 표시
-            st.write("### 📖 풀이과정")
-            
-            st.markdown(f"""
-            <p><strong>Step 1:</strong> 두 번째 분수의 분자와 분모를 뒤집어요 (<span style='background-color: #ffeb3b; padding: 2px 8px; border-radius: 3px; font-weight: bold;'>역수</span>)</p>
-            """, unsafe_allow_html=True)
-            
-            st.write(f"""
-            $$\\frac{{{problem['numerator2']}}}{{{problem['denominator2']}}} \\rightarrow \\frac{{{problem['denominator2']}}}{{{problem['numerator2']}}}$$
-            """)
-            
-            st.markdown("""
-            <p><strong>Step 2:</strong> 나눗셈을 <span style='background-color: #a5d6a7; padding: 2px 8px; border-radius: 3px; font-weight: bold;'>곱셈</span>으로 바꿔 계산해요</p>
-            """, unsafe_allow_html=True)
-            
-            st.write(f"""
-            
-            $$\\frac{{{problem['numerator1']}}}{{{problem['denominator1']}}} \\times \\frac{{{problem['denominator2']}}}{{{problem['numerator2']}}} = \\frac{{{problem['numerator1'] * problem['denominator2']}}}{{{problem['denominator1'] * problem['numerator2']}}}$$
-            
-            **Step 3:** 약분하면
-            
-            $$= \\frac{{{problem['result_num']}}}{{{problem['result_den']}}}$$
-            """)
-            
-            # 다음 문제로 이동
-            st.session_state.stage2_index += 1
-            st.session_state.stage2_attempts = 0
-            
-            if st.session_state.stage2_index >= 3:
-                st.success("🎉 3문제를 모두 완료했어요!")
-                if st.button("완료", key="stage2_complete"):
-                    st.rerun()
-            else:
-                st.write(f"다음 문제로 넘어갑니다: {st.session_state.stage2_index + 1}번 문제")
-                if st.button("다음 문제", key="next_stage2"):
-                    st.rerun()
-        else:
-            # 오답 처리
-            st.session_state.stage2_attempts += 1
-            attempts = st.session_state.stage2_attempts
-            if attempts == 1:
-                st.error("❌ 틀렸어요. 힌트를 확인하고 다시 시도해보세요!")
-                if st.button("다시 풀기", key="retry_stage2_a"):
-                    st.rerun()
-            else:
-                st.error("❌ 또 틀렸어요. 아래에 정답을 참고하세요.")
-                st.write(f"정답: {problem['result_num']}/{problem['result_den']}")
-                if st.button("다시 풀기", key="retry_stage2_b"):
-                    st.rerun()
+    answer_area(2)